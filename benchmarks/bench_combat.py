@@ -0,0 +1,80 @@
+"""
+Benchmark de combate: combates indexados por par e turnos resolvidos em lote
+(CombatSystem) x lista de combates com um timer por combate e busca linear
+do par em start_combat.
+
+Cria N combates entre entidades com vida alta (para que durem a simulação
+toda), iniciando-os e depois simulando alguns segundos de jogo a 60 fps.
+
+Uso:
+    python benchmarks/bench_combat.py [--combats 100 1000 5000] [--seconds 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.entities.entity import Entity
+from src.systems.combat_system import Combat, CombatSystem
+
+class LinearCombatSystem:
+    """Versão anterior: lista de combates, cada um com o seu turn_timer."""
+    def __init__(self):
+        self.active_combats = []
+
+    def start_combat(self, attacker, defender):
+        for combat in self.active_combats:
+            if (combat.attacker == attacker and combat.defender == defender) or \
+               (combat.attacker == defender and combat.defender == attacker):
+                return combat
+        combat = Combat(attacker, defender)
+        self.active_combats.append(combat)
+        return combat
+
+    def update(self, delta_time: float):
+        self.active_combats = [combat for combat in self.active_combats
+                               if not combat.is_finished()]
+        for combat in self.active_combats:
+            combat.update(delta_time)
+
+def make_pairs(count: int):
+    pairs = []
+    for _ in range(count):
+        pair = (Entity(0, 0, 32, 32), Entity(0, 0, 32, 32))
+        for entity in pair:
+            entity.health = 10 ** 9
+        pairs.append(pair)
+    return pairs
+
+def run(system, pairs, seconds: float) -> tuple:
+    start = time.perf_counter()
+    for attacker, defender in pairs:
+        system.start_combat(attacker, defender)
+    start_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(int(seconds * 60)):
+        system.update(1 / 60)
+    update_ms = (time.perf_counter() - start) * 1000
+    return start_ms, update_ms
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--combats', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'combates':>8} {'lista: iniciar (ms)':>20} {'lista: update (ms)':>19} "
+          f"{'lote: iniciar (ms)':>19} {'lote: update (ms)':>18}")
+    for count in args.combats:
+        linear = run(LinearCombatSystem(), make_pairs(count), args.seconds)
+        batched = run(CombatSystem(seed=1), make_pairs(count), args.seconds)
+        print(f"{count:>8} {linear[0]:>20.1f} {linear[1]:>19.1f} "
+              f"{batched[0]:>19.1f} {batched[1]:>18.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark de memória por instância: templates compartilhados (flyweight)
+x dados estáticos repetidos em cada objeto, como antes (campos copiados na
+instância do monstro; um template novo para cada poção).
+
+Mede com tracemalloc a memória alocada para N goblins e N poções.
+
+Uso:
+    python benchmarks/bench_flyweight.py [--count 10000]
+"""
+
+import os
+import sys
+import argparse
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.entities.monster import Monster, MonsterTemplate
+from src.items.consumable import Consumable
+
+GOBLIN = {
+    'name': 'Goblin',
+    'level': 1,
+    'health': 50,
+    'strength': 5,
+    'defense': 3,
+    'exp_reward': 10,
+    'gold_reward': 5
+}
+POTION_EFFECTS = [{'stat': 'health', 'value': 50}]
+
+def measure(factory, count: int) -> float:
+    """Bytes alocados por instância criada por factory(i)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+def shared_goblin(i: int) -> Monster:
+    return Monster(i % 100 * 32, i // 100 * 32, 32, 32, GOBLIN)
+
+def copied_goblin(i: int) -> Monster:
+    # Grava cada campo do template na instância, como o Monster fazia antes
+    monster = shared_goblin(i)
+    for field in MonsterTemplate.FIELDS:
+        setattr(monster, field, getattr(monster.template, field))
+    return monster
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=10000)
+    args = parser.parse_args()
+
+    potion = Consumable('health_potion', 'Health Potion', 'Restores 50 HP.', POTION_EFFECTS)
+    cases = [
+        ('goblin (template compartilhado)', shared_goblin),
+        ('goblin (campos copiados)', copied_goblin),
+        ('poção (template compartilhado)', lambda i: Consumable.from_template(potion.template)),
+        ('poção (template por instância)',
+         lambda i: Consumable('health_potion', 'Health Potion', 'Restores 50 HP.', POTION_EFFECTS))
+    ]
+
+    print(f"{'caso':<34} {'bytes/instância':>16} {'total':>10}")
+    for label, factory in cases:
+        per_instance = measure(factory, args.count)
+        print(f"{label:<34} {per_instance:>16.0f} {per_instance * args.count / 1024 / 1024:>8.2f}MB")
+
+if __name__ == '__main__':
+    main()
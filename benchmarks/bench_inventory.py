@@ -0,0 +1,103 @@
+"""
+Benchmark das operações do inventário: índices (id -> slots, totais por id,
+heap de slots livres) x varredura linear de todos os slots, como antes.
+
+Preenche metade dos slots com itens variados e mede o tempo médio de
+add_item, remove_item, get_item_count e has_space para cada tamanho.
+
+Uso:
+    python benchmarks/bench_inventory.py [--sizes 20 1000 10000] [--ops 2000]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.items.item import Item
+from src.systems.inventory_system import InventorySystem
+
+class LinearInventory(InventorySystem):
+    """Inventário com as buscas lineares originais, para comparação."""
+    def add_item(self, item: Item, amount: int = 1) -> bool:
+        remaining = amount
+        for slot in self.slots:
+            if not slot.is_empty() and slot.item.id == item.id:
+                remaining = slot.add(item, remaining)
+                if remaining == 0:
+                    return True
+        for slot in self.slots:
+            if slot.is_empty():
+                remaining = slot.add(item, remaining)
+                if remaining == 0:
+                    return True
+        return remaining == 0
+
+    def remove_item(self, item_id: str, amount: int = 1) -> int:
+        remaining = amount
+        for slot in self.slots:
+            if not slot.is_empty() and slot.item.id == item_id:
+                remaining -= slot.remove(remaining)
+                if remaining == 0:
+                    break
+        return amount - remaining
+
+    def get_item_count(self, item_id: str) -> int:
+        return sum(slot.quantity for slot in self.slots
+                   if not slot.is_empty() and slot.item.id == item_id)
+
+    def has_space(self) -> bool:
+        return any(slot.is_empty() for slot in self.slots)
+
+def make_items(count: int):
+    return [Item(f"item_{i}", f"Item {i}", "", max_stack=20, stackable=True)
+            for i in range(count)]
+
+def fill(inventory: InventorySystem, items):
+    # Metade dos slots ocupados, com o item procurado no fim da lista
+    for i in range(inventory.size // 2):
+        inventory.add_item(items[i % len(items)], 20)
+
+def timed(operation, ops: int) -> float:
+    """Tempo médio em microssegundos de operation(i)."""
+    start = time.perf_counter()
+    for i in range(ops):
+        operation(i)
+    return (time.perf_counter() - start) / ops * 1e6
+
+def run(cls, size: int, ops: int):
+    inventory = cls(size)
+    items = make_items(max(1, size // 2))
+    fill(inventory, items)
+    target = items[-1]
+    fresh = Item("fresh", "Fresh", "", max_stack=20, stackable=True)
+
+    def add_remove(i):
+        inventory.add_item(fresh, 5)
+        inventory.remove_item("fresh", 5)
+
+    return {
+        'add+remove': timed(add_remove, ops),
+        'get_item_count': timed(lambda i: inventory.get_item_count(target.id), ops),
+        'has_space': timed(lambda i: inventory.has_space(), ops)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 1000, 10000])
+    parser.add_argument('--ops', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'slots':>6} {'operação':<16} {'linear (us)':>12} {'indexado (us)':>14} {'ganho':>8}")
+    for size in args.sizes:
+        linear = run(LinearInventory, size, args.ops)
+        indexed = run(InventorySystem, size, args.ops)
+        for name in linear:
+            print(f"{size:>6} {name:<16} {linear[name]:>12.2f} {indexed[name]:>14.2f} "
+                  f"{linear[name] / indexed[name]:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark de rolagem de loot: tabelas de alias com sorteio em lote (numpy)
+x busca linear nos pesos acumulados, um sorteio por morte.
+
+Gera tabelas sintéticas com números diferentes de entradas e mede o tempo
+para rolar os drops de N mortes.
+
+Uso:
+    python benchmarks/bench_loot.py [--kills 10000] [--entries 10 100 1000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.systems.loot_system import LootSystem
+
+def make_table(entries: int) -> dict:
+    rng = random.Random(entries)
+    return {'entries': [{'item': f"item_{i}", 'weight': rng.randint(1, 100)}
+                        for i in range(entries)]}
+
+def linear_rolls(table: dict, kills: int) -> Counter:
+    """Sorteio por peso acumulado, percorrendo as entradas a cada morte."""
+    entries = table['entries']
+    total = sum(entry['weight'] for entry in entries)
+    drops = Counter()
+    for _ in range(kills):
+        target = random.random() * total
+        for entry in entries:
+            target -= entry['weight']
+            if target < 0:
+                drops[entry['item']] += 1
+                break
+    return drops
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--kills', type=int, default=10000)
+    parser.add_argument('--entries', type=int, nargs='+', default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    print(f"{'entradas':>8} {'linear (ms)':>12} {'alias, 1 por vez (ms)':>22} "
+          f"{'alias em lote (ms)':>19}")
+    for entries in args.entries:
+        table = make_table(entries)
+        loot = LootSystem({'bench': table}, seed=1)
+
+        start = time.perf_counter()
+        linear_rolls(table, args.kills)
+        linear = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.kills):
+            loot.roll('bench')
+        single = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        loot.roll('bench', args.kills)
+        batched = (time.perf_counter() - start) * 1000
+
+        print(f"{entries:>8} {linear:>12.1f} {single:>22.1f} {batched:>19.2f}")
+
+if __name__ == '__main__':
+    main()
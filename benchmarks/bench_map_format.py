@@ -0,0 +1,87 @@
+"""
+Benchmark de carregamento de mapas: JSON x formato binário (.rpgmap).
+
+Gera mapas sintéticos em um diretório temporário e mede, em um processo
+novo para cada medição, o tempo de Map.load_from_file e o aumento de RSS.
+
+Uso:
+    python benchmarks/bench_map_format.py [--sizes 30x20 500x500 4000x4000]
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.map.binary_map import compile_map
+
+MEASURE = r'''
+import os, sys, time, json
+sys.path.insert(0, {root!r})
+from src.systems.map_system import Map
+
+def rss_kb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+
+game_map = Map(1, 1)
+before = rss_kb()
+start = time.perf_counter()
+game_map.load_from_file({path!r})
+# Toca em todas as linhas da colisão para contar páginas realmente usadas
+solid = sum(1 for y in range(0, game_map.height, 64) if game_map.is_solid(0, y))
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'rss_kb': rss_kb() - before}}))
+'''
+
+def generate_map(path: str, width: int, height: int):
+    """Escreve um mapa JSON sintético com as três camadas usuais."""
+    rng = random.Random(width * height)
+    with open(path, 'w') as f:
+        layers = {
+            'ground': [[rng.randint(0, 3) for _ in range(width)] for _ in range(height)],
+            'objects': [[rng.choice((0, 0, 0, 4)) for _ in range(width)] for _ in range(height)],
+            'collision': [[rng.random() < 0.2 for _ in range(width)] for _ in range(height)]
+        }
+        json.dump({
+            'name': f'bench_{width}x{height}',
+            'width': width,
+            'height': height,
+            'tile_size': 32,
+            'layers': layers,
+            'spawn_points': {'entrance': {'x': 1, 'y': 1}}
+        }, f)
+
+def measure(path: str) -> dict:
+    """Carrega o mapa em um processo novo e retorna tempo e RSS."""
+    output = subprocess.run([sys.executable, '-c', MEASURE.format(root=ROOT, path=path)],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', nargs='+', default=['30x20', '500x500', '4000x4000'])
+    args = parser.parse_args()
+
+    print(f"{'tamanho':>10} {'formato':>8} {'arquivo':>10} {'carga':>10} {'RSS':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            width, height = (int(v) for v in size.split('x'))
+            json_path = os.path.join(tmp, f'{size}.json')
+            generate_map(json_path, width, height)
+            binary_path = compile_map(json_path)
+
+            for label, path in (('json', json_path), ('rpgmap', binary_path)):
+                result = measure(path)
+                file_mb = os.path.getsize(path) / 1024 / 1024
+                print(f"{size:>10} {label:>8} {file_mb:>8.2f}MB "
+                      f"{result['seconds'] * 1000:>8.2f}ms {result['rss_kb'] / 1024:>8.2f}MB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark de disponibilidade de quests: conjunto mantido pelo QuestGraph
+x Quest.can_start percorrendo os pré-requisitos a cada consulta.
+
+Gera um grafo aleatório (cada quest depende de até 3 quests anteriores),
+completa parte delas e mede o tempo de consultar a disponibilidade de todas
+as quests (como faria o quest log ou os ícones dos NPCs a cada frame).
+
+Uso:
+    python benchmarks/bench_quest_graph.py [--quests 100 1000 10000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.quests.quest import Quest
+from src.quests.quest_data import compile_quest_graph
+
+class Player:
+    level = 10
+
+def make_quests(count: int):
+    rng = random.Random(count)
+    quests = {}
+    for i in range(count):
+        quest = Quest(f"q{i}", f"Quest {i}", "", rng.randint(1, 15))
+        for required in rng.sample(range(i), min(i, rng.randint(0, 3))):
+            quest.prerequisites.append(quests[f"q{required}"])
+        quests[quest.id] = quest
+    return quests
+
+def walk_queries(quests, player) -> int:
+    return sum(1 for quest in quests.values()
+               if not quest.completed and quest.can_start(player))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--quests', type=int, nargs='+', default=[100, 1000, 10000])
+    args = parser.parse_args()
+
+    print(f"{'quests':>7} {'compilar (ms)':>14} {'can_start (ms)':>15} {'grafo (ms)':>11}")
+    for count in args.quests:
+        quests = make_quests(count)
+        for quest in list(quests.values())[:count // 2]:
+            quest.completed = True
+        player = Player()
+
+        start = time.perf_counter()
+        graph = compile_quest_graph(quests, player.level)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        # can_start sem o grafo: percorre os pré-requisitos de cada quest
+        for quest in quests.values():
+            quest.graph = None
+        start = time.perf_counter()
+        walked = walk_queries(quests, player)
+        walk_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        indexed = sum(1 for quest_id in quests if graph.is_available(quest_id))
+        graph_ms = (time.perf_counter() - start) * 1000
+
+        assert walked == indexed, (walked, indexed)
+        print(f"{count:>7} {compile_ms:>14.2f} {walk_ms:>15.2f} {graph_ms:>11.2f}")
+
+if __name__ == '__main__':
+    main()
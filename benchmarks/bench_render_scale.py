@@ -0,0 +1,69 @@
+"""
+Benchmark de renderização em diferentes resoluções internas.
+
+Mede o tempo médio de frame (update + render) do Game com o mundo
+renderizado em escalas internas diferentes e ampliado para a janela.
+
+Uso:
+    python benchmarks/bench_render_scale.py [--frames 300] [--particles 3000]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+from src.main import Game
+from src.map.game_map import GameMap
+
+SCALES = [1.0, 0.75, 0.5, 0.25]
+
+def run_scale(scale: float, frames: int, particles: int, upscale_filter: str) -> float:
+    """Executa o jogo em uma escala e retorna o tempo médio de frame em ms."""
+    game = Game(render_scale=scale, upscale_filter=upscale_filter)
+    game.game_map = GameMap(200, 200)
+
+    frame_times = []
+    for _ in range(frames):
+        # Mantém a cena cheia de partículas para forçar o custo de preenchimento
+        missing = particles - len(game.particle_system.particles)
+        if missing > 0:
+            game.particle_system.create_explosion(
+                game.world_surface.get_width() // 2,
+                game.world_surface.get_height() // 2,
+                missing)
+
+        start = time.perf_counter()
+        game.update()
+        game.render()
+        frame_times.append(time.perf_counter() - start)
+        game.clock.tick()
+
+    pygame.quit()
+    return sum(frame_times) / len(frame_times) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--particles', type=int, default=3000)
+    parser.add_argument('--filter', choices=['scale', 'scale2x'], default='scale')
+    args = parser.parse_args()
+
+    print(f"{'escala':>8} {'resolução':>10} {'ms/frame':>10} {'relativo':>9}")
+    baseline = None
+    for scale in SCALES:
+        frame_ms = run_scale(scale, args.frames, args.particles, args.filter)
+        baseline = baseline or frame_ms
+        resolution = f"{int(800 * scale)}x{int(600 * scale)}"
+        print(f"{scale:>8.2f} {resolution:>10} {frame_ms:>10.2f} {frame_ms / baseline:>8.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+import os
+from typing import Callable, Dict, List, Optional
+from src.data.registry import DATA_FILES, DataDiff, DataRegistry
+from src.systems.file_watcher import FileWatcher
+
+class HotReloader:
+    """Aplica ao jogo em execução as edições feitas nos dados e mapas.
+
+    A cada poll() os arquivos alterados são relidos individualmente: os
+    arquivos de dados passam pelo DataRegistry.reload (que devolve a
+    diferença por id e atualiza os itens vivos) e os ouvintes da tabela
+    recebem o DataDiff para corrigir seus objetos; os mapas registrados
+    com watch_map recompõem só os chunks alterados.
+    """
+    def __init__(self, registry: DataRegistry, watcher: Optional[FileWatcher] = None):
+        self.registry = registry
+        self.watcher = watcher or FileWatcher()
+        self.watcher.add_directory(registry.data_dir)
+        self.data_files = {
+            os.path.abspath(os.path.join(registry.data_dir, f"{name}.json")): name
+            for name in DATA_FILES
+        }
+        self.listeners: Dict[str, List[Callable[[DataDiff], None]]] = {name: [] for name in DATA_FILES}
+        self.maps: Dict[str, List] = {}
+        self.map_listeners: List[Callable] = []
+
+    def listen(self, table: str, callback: Callable[[DataDiff], None]):
+        """Chama callback(diff) sempre que a tabela for recarregada com mudanças."""
+        self.listeners[table].append(callback)
+
+    def watch_map(self, filename: str, game_map):
+        """Recarrega game_map quando o arquivo do mapa mudar."""
+        path = os.path.abspath(filename)
+        self.watcher.add_directory(os.path.dirname(path))
+        maps = self.maps.setdefault(path, [])
+        if game_map not in maps:
+            maps.append(game_map)
+
+    def listen_maps(self, callback: Callable):
+        """Chama callback(game_map, chunks_alterados) depois de recarregar um mapa."""
+        self.map_listeners.append(callback)
+
+    def poll(self):
+        for path in self.watcher.poll():
+            if path in self.data_files:
+                self.reload_data(self.data_files[path])
+            elif path in self.maps:
+                self.reload_map(path)
+
+    def reload_data(self, table: str) -> DataDiff:
+        diff = self.registry.reload(table)
+        if diff:
+            print(f"Recarregado {table}.json: {len(diff.added)} novos, "
+                  f"{len(diff.changed)} alterados, {len(diff.removed)} removidos")
+            for callback in self.listeners[table]:
+                callback(diff)
+        return diff
+
+    def reload_map(self, path: str):
+        for game_map in self.maps[path]:
+            try:
+                dirty = game_map.reload_from_file(path)
+            except Exception as e:
+                print(f"Erro ao recarregar o mapa {path}: {e}")
+                continue
+            print(f"Recarregado {os.path.basename(path)}: {len(dirty)} chunks alterados")
+            for callback in self.map_listeners:
+                callback(game_map, dirty)
+
+    def close(self):
+        self.watcher.close()
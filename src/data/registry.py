@@ -0,0 +1,443 @@
+"""
+Registro central dos dados do jogo (items.json, quests.json, dialogs.json,
+loot_tables.json).
+
+Os arquivos são validados uma única vez na carga e viram tabelas de
+protótipos indexadas por id, imutáveis (MappingProxyType/tuplas) e com as
+strings internadas. As fábricas create_item/create_quest/create_dialog
+instanciam objetos do jogo a partir dos protótipos sob demanda.
+
+Os dados validados ficam em um snapshot (.cache/data_registry.pickle); se
+os arquivos de origem não mudaram (tamanho e mtime), a próxima
+inicialização carrega o snapshot e pula o parse e a validação.
+"""
+
+import os
+import sys
+import json
+import pickle
+import weakref
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Set
+from src.items.item import Item, ItemTemplate
+from src.items.equipment import Equipment, Weapon, Armor, Accessory
+from src.items.consumable import Consumable
+from src.systems.quest_system import Quest, quest_from_data
+from src.systems.event_bus import EVENT_TYPES
+from src.systems.dialog_graph import compile_dialog
+
+SNAPSHOT_VERSION = 3
+DATA_FILES = ('items', 'quests', 'dialogs', 'loot_tables')
+
+# Classe criada para cada valor de "type" em items.json
+ITEM_CLASSES = {
+    'weapon': Weapon,
+    'armor': Armor,
+    'accessory': Accessory,
+    'consumable': Consumable
+}
+
+def freeze(value: Any) -> Any:
+    """Converte dicts/listas em estruturas imutáveis e interna as strings."""
+    if isinstance(value, dict):
+        return MappingProxyType({sys.intern(key): freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+def thaw(value: Any) -> Any:
+    """Cópia mutável de um protótipo congelado."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+def _check(errors: List[str], where: str, data: Any, field: str, types) -> bool:
+    """Confere se data[field] existe e tem o tipo esperado."""
+    if not isinstance(data, dict) or field not in data:
+        errors.append(f"{where}: campo '{field}' ausente")
+        return False
+    if not isinstance(data[field], types):
+        errors.append(f"{where}: campo '{field}' deveria ser {types}")
+        return False
+    return True
+
+def validate_items(data: Dict, errors: List[str],
+                   rejected: Optional[Set[str]] = None) -> Dict[str, Dict]:
+    """Valida items.json (agrupado por categoria) e retorna a tabela plana por id.
+
+    Os ids das entradas descartadas por erro vão para rejected, se informado.
+    """
+    rejected = set() if rejected is None else rejected
+    items = {}
+    for category, entries in data.items():
+        if not isinstance(entries, dict):
+            errors.append(f"items.{category}: categoria deveria ser um objeto")
+            continue
+        for item_id, entry in entries.items():
+            where = f"items.{category}.{item_id}"
+            valid = all([
+                _check(errors, where, entry, 'name', str),
+                _check(errors, where, entry, 'description', str),
+                _check(errors, where, entry, 'type', str)
+            ])
+            if valid and entry['type'] not in ITEM_CLASSES:
+                errors.append(f"{where}: tipo desconhecido '{entry['type']}'")
+                valid = False
+            if valid and entry['type'] == 'consumable':
+                valid = (_check(errors, where, entry, 'effects', list) and
+                         all(_check(errors, f"{where}.effects[{i}]", effect, 'stat', str) and
+                             _check(errors, f"{where}.effects[{i}]", effect, 'value', (int, float))
+                             for i, effect in enumerate(entry['effects'])))
+            elif valid:
+                valid = (_check(errors, where, entry, 'slot', str) and
+                         _check(errors, where, entry, 'stats', dict))
+            if not valid:
+                rejected.add(item_id)
+                continue
+            if item_id in items:
+                errors.append(f"{where}: id duplicado")
+                continue
+            items[item_id] = dict(entry, category=category)
+    # Um id duplicado inválido não apaga a entrada válida com o mesmo id
+    rejected.difference_update(items)
+    return items
+
+def validate_quests(data: Dict, errors: List[str],
+                    rejected: Optional[Set[str]] = None) -> Dict[str, Dict]:
+    quests = {}
+    for quest_id, entry in data.items():
+        where = f"quests.{quest_id}"
+        valid = all([
+            _check(errors, where, entry, 'title', str),
+            _check(errors, where, entry, 'description', str)
+        ])
+        objectives = entry.get('objectives', {}) if isinstance(entry, dict) else {}
+        if not isinstance(objectives, dict):
+            errors.append(f"{where}: 'objectives' deveria ser um objeto")
+            valid = False
+        else:
+            for obj_id, objective in objectives.items():
+                obj_where = f"{where}.objectives.{obj_id}"
+                valid &= _check(errors, obj_where, objective, 'description', str)
+                if isinstance(objective, dict) and 'event' in objective:
+                    if objective['event'] not in EVENT_TYPES:
+                        errors.append(f"{obj_where}: evento desconhecido '{objective['event']}'")
+                        valid = False
+                    if not isinstance(objective.get('target', ''), str):
+                        errors.append(f"{obj_where}: campo 'target' deveria ser {str}")
+                        valid = False
+        prerequisites = entry.get('prerequisites', []) if isinstance(entry, dict) else []
+        if not (isinstance(prerequisites, list) and all(isinstance(p, str) for p in prerequisites)):
+            errors.append(f"{where}: 'prerequisites' deveria ser uma lista de ids")
+            valid = False
+        if isinstance(entry, dict) and not isinstance(entry.get('level_requirement', 1), int):
+            errors.append(f"{where}: campo 'level_requirement' deveria ser {int}")
+            valid = False
+        if valid:
+            quests[quest_id] = entry
+        elif rejected is not None:
+            rejected.add(quest_id)
+    return quests
+
+def validate_dialogs(data: Dict, errors: List[str],
+                     rejected: Optional[Set[str]] = None) -> Dict[str, Dict]:
+    """Compila cada diálogo para rejeitar referências "next" quebradas e ações desconhecidas."""
+    dialogs = {}
+    for dialog_id, entry in data.items():
+        if compile_dialog(dialog_id, entry, errors) is not None:
+            dialogs[dialog_id] = entry
+        elif rejected is not None:
+            rejected.add(dialog_id)
+    return dialogs
+
+def _valid_count(errors: List[str], where: str, entry: Dict, field: str = 'count') -> bool:
+    """Quantidade opcional: inteiro ou intervalo [min, max]."""
+    count = entry.get(field, 1)
+    if isinstance(count, int) and count >= 0:
+        return True
+    if (isinstance(count, list) and len(count) == 2 and
+            all(isinstance(value, int) for value in count) and 0 <= count[0] <= count[1]):
+        return True
+    errors.append(f"{where}: '{field}' deveria ser um inteiro ou [min, max]")
+    return False
+
+def validate_loot_tables(data: Dict, errors: List[str],
+                         rejected: Optional[Set[str]] = None) -> Dict[str, Dict]:
+    """Valida a estrutura das tabelas; itens e tabelas referenciados são conferidos pelo LootSystem."""
+    rejected = set() if rejected is None else rejected
+    tables = {}
+    for table_id, entry in data.items():
+        where = f"loot_tables.{table_id}"
+        if not isinstance(entry, dict):
+            errors.append(f"{where}: tabela deveria ser um objeto")
+            rejected.add(table_id)
+            continue
+        valid = _valid_count(errors, where, entry, 'rolls')
+        for field in ('guaranteed', 'chances', 'entries'):
+            if not isinstance(entry.get(field, []), list):
+                errors.append(f"{where}: '{field}' deveria ser uma lista")
+                valid = False
+        if not valid:
+            rejected.add(table_id)
+            continue
+        for i, drop in enumerate(entry.get('guaranteed', [])):
+            drop_where = f"{where}.guaranteed[{i}]"
+            valid &= _check(errors, drop_where, drop, 'item', str) and _valid_count(errors, drop_where, drop)
+        for i, drop in enumerate(entry.get('chances', [])):
+            drop_where = f"{where}.chances[{i}]"
+            valid &= (_check(errors, drop_where, drop, 'item', str) and
+                      _check(errors, drop_where, drop, 'chance', (int, float)) and
+                      _valid_count(errors, drop_where, drop))
+        for i, drop in enumerate(entry.get('entries', [])):
+            drop_where = f"{where}.entries[{i}]"
+            if not _check(errors, drop_where, drop, 'weight', (int, float)):
+                valid = False
+                continue
+            if drop['weight'] <= 0:
+                errors.append(f"{drop_where}: 'weight' deveria ser positivo")
+                valid = False
+            if sum(key in drop for key in ('item', 'table', 'nothing')) != 1:
+                errors.append(f"{drop_where}: use exatamente um de 'item', 'table' ou 'nothing'")
+                valid = False
+            elif 'item' in drop or 'table' in drop:
+                valid &= (_check(errors, drop_where, drop, 'item' if 'item' in drop else 'table', str) and
+                          _valid_count(errors, drop_where, drop))
+        if valid:
+            tables[table_id] = entry
+        else:
+            rejected.add(table_id)
+    return tables
+
+VALIDATORS = {
+    'items': validate_items,
+    'quests': validate_quests,
+    'dialogs': validate_dialogs,
+    'loot_tables': validate_loot_tables
+}
+
+class DataDiff:
+    """Ids adicionados, removidos e alterados em uma tabela após um reload."""
+    def __init__(self, table: str, added, removed, changed):
+        self.table = table
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+def diff_tables(table: str, old: Dict, new: Dict) -> DataDiff:
+    """Compara duas tabelas por id; só as entradas comuns são comparadas por valor."""
+    added = [key for key in new if key not in old]
+    removed = [key for key in old if key not in new]
+    changed = [key for key in new if key in old and new[key] != old[key]]
+    return DataDiff(table, added, removed, changed)
+
+def build_item(item_id: str, proto: Mapping) -> Item:
+    """Cria um item novo (com template próprio) a partir de um protótipo."""
+    item_class = ITEM_CLASSES[proto['type']]
+    if item_class is Consumable:
+        item = Consumable(item_id, proto['name'], proto['description'],
+                          thaw(proto['effects']), proto.get('sprite'))
+    else:
+        item = item_class(item_id, proto['name'], proto['description'],
+                          proto['slot'], thaw(proto['stats']), proto.get('sprite'))
+    item.template = item.template.replace(value=proto.get('value', 0))
+    return item
+
+def patch_item(item: Item, template: ItemTemplate):
+    """Aponta um item vivo para o template recarregado."""
+    if isinstance(item, Equipment) and item.equipped:
+        # Os stats já somados ao personagem seriam removidos com os valores novos
+        print(f"{item.name} está equipado; stats atualizados ao desequipar")
+        item.pending_template = template
+    else:
+        item.template = template
+
+class DataRegistry:
+    def __init__(self, data_dir: Optional[str] = None, cache_dir: Optional[str] = '.cache'):
+        self.data_dir = data_dir or os.path.join('assets', 'data')
+        self.cache_path = os.path.join(cache_dir, 'data_registry.pickle') if cache_dir else None
+        self.errors: List[str] = []
+        self.from_snapshot = False
+        self.items: Mapping[str, Mapping] = MappingProxyType({})
+        self.quests: Mapping[str, Mapping] = MappingProxyType({})
+        self.dialogs: Mapping[str, Mapping] = MappingProxyType({})
+        self.loot_tables: Mapping[str, Mapping] = MappingProxyType({})
+        self.tables: Dict[str, Dict] = {}
+        self.item_templates: Dict[str, ItemTemplate] = {}
+        self.live_items: Dict[str, weakref.WeakSet] = {}
+        self.load()
+
+    def _source_stats(self) -> Dict[str, tuple]:
+        stats = {}
+        for name in DATA_FILES:
+            try:
+                stat = os.stat(os.path.join(self.data_dir, f"{name}.json"))
+                stats[name] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                stats[name] = None
+        return stats
+
+    def load(self):
+        """Carrega os dados do snapshot ou, se desatualizado, dos arquivos JSON."""
+        sources = self._source_stats()
+        tables = self._load_snapshot(sources)
+        self.from_snapshot = tables is not None
+        if tables is None:
+            tables = self._load_sources()
+            self._save_snapshot(sources, tables)
+
+        self.sources = sources
+        self.tables = tables
+        for name in DATA_FILES:
+            setattr(self, name, freeze(tables[name]))
+
+    def reload(self, name: str) -> DataDiff:
+        """Relê um único arquivo de dados e aplica a diferença à tabela viva.
+
+        Entradas inválidas no arquivo novo mantêm o protótipo anterior; os
+        itens vivos criados por create_item são atualizados no lugar.
+        """
+        path = os.path.join(self.data_dir, f"{name}.json")
+        stat = self._source_stats()[name]
+        errors: List[str] = []
+        rejected: Set[str] = set()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Erro ao recarregar {path}: {e}")
+            return DataDiff(name, [], [], [])
+        new_table = VALIDATORS[name](data, errors, rejected)
+        for error in errors:
+            print(f"Erro nos dados do jogo: {error}")
+
+        old_table = self.tables[name]
+        diff = diff_tables(name, old_table, new_table)
+        # Entrada com erro não é remoção: continua valendo o protótipo anterior
+        diff.removed = [key for key in diff.removed if key not in rejected]
+        if not diff:
+            return diff
+
+        table = dict(old_table)
+        for key in diff.removed:
+            del table[key]
+        for key in diff.added + diff.changed:
+            table[key] = new_table[key]
+        self.tables[name] = table
+
+        # Só as entradas novas ou alteradas são congeladas de novo
+        frozen = dict(getattr(self, name))
+        for key in diff.removed:
+            del frozen[key]
+        for key in diff.added + diff.changed:
+            frozen[key] = freeze(table[key])
+        setattr(self, name, MappingProxyType(frozen))
+
+        if name == 'items':
+            for item_id in diff.removed + diff.changed:
+                self.item_templates.pop(item_id, None)
+            for item_id in diff.changed:
+                live = list(self.live_items.get(item_id, ()))
+                if live:
+                    template = build_item(item_id, self.items[item_id]).template
+                    self.item_templates[item_id] = template
+                    for item in live:
+                        patch_item(item, template)
+
+        # O snapshot só é válido para os arquivos que as tabelas refletem: a
+        # assinatura muda apenas para o arquivo relido, e com erros pendentes
+        # o snapshot não é salvo, para que a próxima carga os releia e reporte
+        self.sources = dict(self.sources, **{name: stat})
+        if not errors and not self.errors:
+            self._save_snapshot(self.sources, self.tables)
+        return diff
+
+    def _load_sources(self) -> Dict[str, Dict]:
+        self.errors = []
+        tables = {}
+        for name in DATA_FILES:
+            path = os.path.join(self.data_dir, f"{name}.json")
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                self.errors.append(f"{path}: {e}")
+                data = {}
+            tables[name] = VALIDATORS[name](data, self.errors)
+
+        for error in self.errors:
+            print(f"Erro nos dados do jogo: {error}")
+        return tables
+
+    def _load_snapshot(self, sources: Dict) -> Optional[Dict]:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            print(f"Snapshot de dados inválido, recarregando: {e}")
+            return None
+        if (snapshot.get('version') != SNAPSHOT_VERSION or
+                snapshot.get('data_dir') != os.path.abspath(self.data_dir) or
+                snapshot.get('sources') != sources):
+            return None
+        self.errors = snapshot['errors']
+        return snapshot['tables']
+
+    def _save_snapshot(self, sources: Dict, tables: Dict):
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, 'wb') as f:
+                pickle.dump({
+                    'version': SNAPSHOT_VERSION,
+                    'data_dir': os.path.abspath(self.data_dir),
+                    'sources': sources,
+                    'errors': self.errors,
+                    'tables': tables
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"Erro ao salvar snapshot de dados: {e}")
+
+    def get_item(self, item_id: str) -> Optional[Mapping]:
+        return self.items.get(item_id)
+
+    def get_quest(self, quest_id: str) -> Optional[Mapping]:
+        return self.quests.get(quest_id)
+
+    def get_dialog(self, dialog_id: str) -> Optional[Mapping]:
+        return self.dialogs.get(dialog_id)
+
+    def create_item(self, item_id: str) -> Optional[Item]:
+        """Instancia um item (Weapon, Armor, Accessory ou Consumable) pelo id."""
+        proto = self.items.get(item_id)
+        if proto is None:
+            return None
+        # Todas as instâncias de um id compartilham o mesmo template
+        template = self.item_templates.get(item_id)
+        if template is None:
+            item = build_item(item_id, proto)
+            self.item_templates[item_id] = item.template
+        else:
+            item = ITEM_CLASSES[proto['type']].from_template(template)
+        self.live_items.setdefault(item_id, weakref.WeakSet()).add(item)
+        return item
+
+    def create_quest(self, quest_id: str) -> Optional[Quest]:
+        proto = self.quests.get(quest_id)
+        if proto is None:
+            return None
+        return quest_from_data(quest_id, thaw(proto))
+
+    def create_dialog(self, dialog_id: str) -> Optional[Dict]:
+        """Cópia mutável do grafo de um diálogo."""
+        proto = self.dialogs.get(dialog_id)
+        return thaw(proto) if proto is not None else None
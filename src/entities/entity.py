@@ -1,8 +1,29 @@
 import pygame
 from typing import Dict, List, Optional, Tuple
 import math
+from src.systems.asset_system import load_shared_sprite
+from src.entities.stats import Modifier, StatModifiers, Stat
 
 class Entity:
+    # Stats básicos. O valor base fica na classe e só vira atributo da
+    # instância quando alterado, então entidades iguais não repetem os
+    # valores; equipamentos, efeitos e bônus de nível entram como
+    # modificadores (ver add_modifier)
+    movement_speed = Stat(5)  # Velocidade base de movimento
+    level = 1
+    max_health = Stat(100)
+    max_mana = Stat(50)
+    strength = Stat(10)
+    defense = Stat(5)
+    magic = Stat(5)
+    speed = Stat(5)  # Atributo de velocidade (diferente da velocidade de movimento)
+    
+    # EventBus onde as entidades publicam mortes, conversas etc. (definido pelo jogo)
+    event_bus = None
+    
+    # Chamado com a entidade depois de cada movimento (definido pelo StreamingWorld)
+    on_moved = None
+    
     def __init__(self, x: float, y: float, width: int, height: int, sprite_path: Optional[str] = None):
         self.x = x
         self.y = y
@@ -11,21 +32,13 @@ class Entity:
         self.sprite = None
         self.direction = "down"  # down, up, left, right
         self.moving = False
-        self.movement_speed = 5  # Velocidade base de movimento
         
-        # Stats básicos
-        self.level = 1
-        self.max_health = 100
+        # Estado mutável dos stats
         self.health = self.max_health
-        self.max_mana = 50
         self.mana = self.max_mana
-        self.strength = 10
-        self.defense = 5
-        self.magic = 5
-        self.speed = 5  # Atributo de velocidade (diferente da velocidade de movimento)
         
-        # Efeitos ativos
-        self.active_effects: List[Dict] = []
+        # Efeitos temporários ativos (cópias dos Effect aplicados)
+        self.active_effects: List = []
         
         # Retângulo de colisão
         self.collision_rect = pygame.Rect(x, y, width, height)
@@ -36,7 +49,7 @@ class Entity:
     def load_sprite(self, sprite_path: str):
         """Carrega o sprite da entidade."""
         try:
-            self.sprite = pygame.image.load(sprite_path).convert_alpha()
+            self.sprite = load_shared_sprite(sprite_path)
         except Exception as e:
             print(f"Erro ao carregar sprite: {e}")
             # Cria um retângulo colorido como sprite padrão
@@ -87,6 +100,9 @@ class Entity:
         self.collision_rect.x = self.x
         self.collision_rect.y = self.y
         
+        if moved and Entity.on_moved:
+            Entity.on_moved(self)
+        
         return moved
         
     def check_collision(self, x: float, y: float, entities: List['Entity']) -> bool:
@@ -148,12 +164,59 @@ class Entity:
         self.mana = min(self.max_mana, self.mana + amount)
         return self.mana - old_mana
         
+    def add_modifier(self, modifier: Modifier):
+        """Adiciona um modificador à pilha do stat."""
+        modifiers = self.__dict__.get('modifiers')
+        if modifiers is None:
+            # Criado só quando necessário: entidades sem modificadores não pagam nada
+            modifiers = self.modifiers = StatModifiers()
+        modifiers.add(modifier)
+        self.on_stats_changed((modifier.stat,))
+        
+    def remove_modifiers(self, source):
+        """Remove todos os modificadores vindos de source."""
+        modifiers = self.__dict__.get('modifiers')
+        if modifiers is not None:
+            changed = modifiers.remove_source(source)
+            if changed:
+                self.on_stats_changed(changed)
+                
+    def set_modifiers(self, source, new_modifiers: List[Modifier]):
+        """Troca os modificadores de source pelos novos."""
+        self.remove_modifiers(source)
+        for modifier in new_modifiers:
+            self.add_modifier(modifier)
+            
+    def get_base(self, stat: str):
+        """Valor base do stat, sem modificadores."""
+        return getattr(type(self), stat).base(self)
+        
+    def add_base(self, stat: str, amount):
+        """Altera permanentemente o valor base do stat."""
+        setattr(self, stat, self.get_base(stat) + amount)
+        self.on_stats_changed((stat,))
+        
+    def on_stats_changed(self, stats):
+        """Mantém vida e mana dentro dos máximos quando eles diminuem."""
+        if 'max_health' in stats and self.health > self.max_health:
+            self.health = self.max_health
+        if 'max_mana' in stats and self.mana > self.max_mana:
+            self.mana = self.max_mana
+            
+    def apply_effect(self, effect):
+        """Aplica um efeito. Os temporários ficam ativos até expirar."""
+        if effect.duration > 0:
+            # Cada aplicação tem seu próprio tempo restante
+            effect = effect.copy()
+            self.active_effects.append(effect)
+        effect.apply(self)
+        
     def update(self, delta_time: float):
         """Atualiza a entidade."""
         # Atualiza efeitos ativos
         for effect in self.active_effects[:]:  # Copia a lista para permitir remoção
-            effect['duration'] -= delta_time
-            if effect['duration'] <= 0:
+            if not effect.update(self, delta_time):
+                effect.remove(self)
                 self.active_effects.remove(effect)
                 
     def draw(self, screen: pygame.Surface, camera_x: int = 0, camera_y: int = 0):
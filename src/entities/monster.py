@@ -1,33 +1,151 @@
 from typing import Optional, Dict, List
 import random
 from .entity import Entity
+from .stats import Stat
+from src.systems.event_bus import MonsterKilled
+
+def monster_data_from_map(entry: Dict) -> Dict:
+    """Converte a definição de monstro dos mapas (hp/attack/xp_reward) para monster_data."""
+    data = dict(entry)
+    if 'id' in data:
+        data.setdefault('loot_table', data['id'])
+    for map_key, data_key in (('hp', 'health'), ('attack', 'strength'), ('xp_reward', 'exp_reward')):
+        if map_key in data:
+            data.setdefault(data_key, data.pop(map_key))
+    return data
+
+class MonsterTemplate:
+    """Dados estáticos de um tipo de monstro, compartilhados por todas as instâncias."""
+    # Campo do template -> (chave em monster_data, valor padrão)
+    FIELDS = {
+        'monster_id': ('id', None),
+        'name': ('name', 'Unknown Monster'),
+        'level': ('level', 1),
+        'max_health': ('health', 50),
+        'strength': ('strength', 5),
+        'defense': ('defense', 3),
+        'magic': ('magic', 2),
+        'speed': ('speed', 3),
+        'exp_reward': ('exp_reward', 10),
+        'gold_reward': ('gold_reward', 5),
+        'aggro_range': ('aggro_range', 200),
+        'attack_range': ('attack_range', 50),
+        'attack_cooldown': ('attack_cooldown', 1.0),
+        'loot_table': ('loot_table', None)
+    }
+    __slots__ = tuple(FIELDS)
+    
+    _cache: Dict[tuple, 'MonsterTemplate'] = {}
+    
+    def __init__(self, values: Dict):
+        for field in self.FIELDS:
+            object.__setattr__(self, field, values[field])
+            
+    def __setattr__(self, name, value):
+        raise AttributeError("MonsterTemplate é imutável")
+        
+    @classmethod
+    def from_data(cls, monster_data: Dict) -> 'MonsterTemplate':
+        """Retorna o template para monster_data, reaproveitando um igual já criado."""
+        values = {field: monster_data.get(key, default)
+                  for field, (key, default) in cls.FIELDS.items()}
+        key = tuple(values.values())
+        try:
+            template = cls._cache.get(key)
+        except TypeError:  # Valores não hasheáveis: template exclusivo
+            return cls(values)
+        if template is None:
+            template = cls._cache[key] = cls(values)
+        return template
+
+class TemplateAttribute:
+    """Atributo lido do template até ser alterado na instância."""
+    def __set_name__(self, owner, name):
+        self.name = name
+        
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            return getattr(instance.template, self.name)
+            
+    def __set__(self, instance, value):
+        instance.__dict__[self.name] = value
+
+class TemplateStat(Stat):
+    """Stat cujo valor base vem do template até ser alterado na instância."""
+    def base(self, instance):
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            return getattr(instance.template, self.name)
 
 class Monster(Entity):
+    # LootSystem que recebe os drops quando um monstro morre (definido pelo jogo)
+    loot_system = None
+    
+    # Dados estáticos vêm do template compartilhado; os stats aceitam
+    # modificadores como os do Entity
+    monster_id = TemplateAttribute()
+    name = TemplateAttribute()
+    level = TemplateAttribute()
+    max_health = TemplateStat()
+    strength = TemplateStat()
+    defense = TemplateStat()
+    magic = TemplateStat()
+    speed = TemplateStat()
+    exp_reward = TemplateAttribute()
+    gold_reward = TemplateAttribute()
+    aggro_range = TemplateAttribute()
+    attack_range = TemplateAttribute()
+    attack_cooldown = TemplateAttribute()
+    loot_table = TemplateAttribute()
+    
     def __init__(self, x: float, y: float, width: int, height: int, 
-                 monster_data: Dict, sprite_path: Optional[str] = None):
+                 monster_data, sprite_path: Optional[str] = None):
+        # monster_data pode ser um dict ou um MonsterTemplate já pronto
+        if isinstance(monster_data, MonsterTemplate):
+            self.template = monster_data
+        else:
+            self.template = MonsterTemplate.from_data(monster_data)
         super().__init__(x, y, width, height, sprite_path)
         
-        # Carrega os dados do monstro
-        self.name = monster_data.get('name', 'Unknown Monster')
-        self.level = monster_data.get('level', 1)
-        self.max_health = monster_data.get('health', 50)
-        self.health = self.max_health
-        self.strength = monster_data.get('strength', 5)
-        self.defense = monster_data.get('defense', 3)
-        self.magic = monster_data.get('magic', 2)
-        self.speed = monster_data.get('speed', 3)
-        self.exp_reward = monster_data.get('exp_reward', 10)
-        self.gold_reward = monster_data.get('gold_reward', 5)
+        # Estado de comportamento
+        self.current_cooldown = 0
+        self.target = None
+        # Fase aleatória: com intervalo de IA os monstros não pensam todos no mesmo frame
+        self.ai_timer = random.random()
         
-        # Comportamento
-        self.aggro_range = monster_data.get('aggro_range', 200)
-        self.attack_range = monster_data.get('attack_range', 50)
-        self.attack_cooldown = monster_data.get('attack_cooldown', 1.0)
+    def reset(self, x: float, y: float):
+        """Revive o monstro em outra posição (reaproveitamento pelo MonsterPool)."""
+        self.x = x
+        self.y = y
+        self.collision_rect.x = x
+        self.collision_rect.y = y
+        self.direction = "down"
+        self.moving = False
+        # Descarta efeitos, modificadores e stats alterados na vida anterior
+        self.active_effects.clear()
+        for name in [name for name in self.__dict__
+                     if isinstance(getattr(Monster, name, None), (Stat, TemplateAttribute))]:
+            del self.__dict__[name]
+        self.__dict__.pop('modifiers', None)
+        self.health = self.max_health
+        self.mana = self.max_mana
         self.current_cooldown = 0
         self.target = None
+        # Fase aleatória: com intervalo de IA os monstros não pensam todos no mesmo frame
+        self.ai_timer = random.random()
+        
+    def update(self, delta_time: float, entities: List[Entity], visibility=None,
+               ai_interval: float = 0.0):
+        """Atualiza o comportamento do monstro.
         
-    def update(self, delta_time: float, entities: List[Entity]):
-        """Atualiza o comportamento do monstro."""
+        visibility: FieldOfView opcional do jogador, usado como linha de visão.
+        ai_interval: segundos entre decisões de IA (0 = todo frame).
+        """
         super().update(delta_time)
         
         if not self.is_alive():
@@ -37,13 +155,15 @@ class Monster(Entity):
         if self.current_cooldown > 0:
             self.current_cooldown = max(0, self.current_cooldown - delta_time)
             
-        # Procura por um jogador na lista de entidades
-        player = None
-        for entity in entities:
-            if isinstance(entity, Entity) and hasattr(entity, 'is_player') and entity.is_player:
-                player = entity
-                break
-                
+        # A busca de alvo roda no ritmo da IA; perseguir e atacar o alvo
+        # atual continua acontecendo a cada frame
+        self.ai_timer += delta_time
+        if self.ai_timer >= ai_interval:
+            # Mantém a fase de cada monstro em vez de zerar o timer
+            self.ai_timer %= ai_interval or 1.0
+            self.think(entities, visibility)
+            
+        player = self.target
         if not player:
             return
             
@@ -52,8 +172,6 @@ class Monster(Entity):
         
         # Se o jogador estiver no alcance de aggro
         if distance_to_player <= self.aggro_range:
-            self.target = player
-            
             # Se estiver no alcance de ataque
             if distance_to_player <= self.attack_range:
                 if self.current_cooldown <= 0:
@@ -70,6 +188,27 @@ class Monster(Entity):
         else:
             self.target = None
             
+    def think(self, entities: List[Entity], visibility=None):
+        """Procura o jogador e decide se ele deve ser o alvo."""
+        # Procura por um jogador na lista de entidades
+        player = None
+        for entity in entities:
+            if isinstance(entity, Entity) and hasattr(entity, 'is_player') and entity.is_player:
+                player = entity
+                break
+                
+        if (player and self.get_distance_to(player) <= self.aggro_range and
+                self.can_see(visibility)):
+            self.target = player
+        else:
+            self.target = None
+            
+    def can_see(self, visibility=None) -> bool:
+        """Verifica a linha de visão reaproveitando o campo de visão do jogador."""
+        if visibility is None:
+            return True
+        return visibility.is_visible_at(self.x + self.width / 2, self.y + self.height / 2)
+        
     def attack(self, target: Entity):
         """Ataca o alvo."""
         damage = random.randint(
@@ -84,5 +223,8 @@ class Monster(Entity):
         
     def die(self):
         """Chamado quando o monstro morre."""
-        # Pode ser expandido para dropar itens, tocar sons, etc.
-        pass
+        # O drop é rolado em lote com as outras mortes do frame (LootSystem.flush)
+        if self.loot_system and self.loot_table:
+            self.loot_system.queue(self.loot_table)
+        if self.event_bus:
+            self.event_bus.emit(MonsterKilled(self.monster_id or self.name, source=self))
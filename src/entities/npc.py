@@ -1,6 +1,8 @@
 from typing import Optional, Dict, List
 import pygame
 from .entity import Entity
+from src.systems.asset_system import load_shared_font
+from src.systems.event_bus import NpcTalked
 
 class NPC(Entity):
     def __init__(self, x: float, y: float, width: int, height: int, 
@@ -9,6 +11,7 @@ class NPC(Entity):
         
         # Dados básicos do NPC
         self.name = npc_data.get('name', 'Unknown NPC')
+        self.id = npc_data.get('id', self.name)
         self.role = npc_data.get('role', 'villager')  # merchant, quest_giver, etc
         self.dialog_id = npc_data.get('dialog_id', None)
         self.shop_items = npc_data.get('shop_items', [])
@@ -32,6 +35,9 @@ class NPC(Entity):
         if not self.can_interact(player):
             return False
             
+        if self.event_bus:
+            self.event_bus.emit(NpcTalked(self.id, source=self))
+            
         # Se for um comerciante, abre a loja
         if self.role == 'merchant' and self.shop_items:
             return self.open_shop(player)
@@ -84,7 +90,7 @@ class NPC(Entity):
         
         # Desenha o nome do NPC
         if hasattr(pygame.font, 'Font'):
-            font = pygame.font.Font(None, 24)
+            font = load_shared_font(None, 24)
             text = font.render(self.name, True, (255, 255, 255))
             text_rect = text.get_rect()
             text_rect.centerx = self.x - camera_x + self.width // 2
@@ -1,11 +1,16 @@
 from typing import Optional
 import pygame
 from .entity import Entity
+from src.systems.event_bus import ObstacleBroken
 
 class Obstacle(Entity):
+    # LootSystem que recebe os drops de obstáculos quebrados (definido pelo jogo)
+    loot_system = None
+    
     def __init__(self, x: float, y: float, width: int, height: int, 
                  obstacle_type: str, sprite_path: Optional[str] = None,
-                 breakable: bool = False, health: int = 1):
+                 breakable: bool = False, health: int = 1,
+                 loot_table: Optional[str] = None):
         super().__init__(x, y, width, height, sprite_path)
         
         self.type = obstacle_type  # tree, rock, fence, etc.
@@ -13,6 +18,7 @@ class Obstacle(Entity):
         self.max_health = health
         self.health = health
         self.broken = False
+        self.loot_table = loot_table or obstacle_type
         
     def take_damage(self, amount: int, attacker: Optional[Entity] = None) -> int:
         """Recebe dano se for quebrável."""
@@ -29,7 +35,10 @@ class Obstacle(Entity):
     def break_obstacle(self):
         """Quebra o obstáculo."""
         self.broken = True
-        # Aqui poderia spawnar itens, tocar sons, etc.
+        if self.loot_system:
+            self.loot_system.queue(self.loot_table)
+        if self.event_bus:
+            self.event_bus.emit(ObstacleBroken(self.type, source=self))
         
     def draw(self, screen: pygame.Surface, camera_x: int = 0, camera_y: int = 0):
         """Desenha o obstáculo."""
@@ -1,8 +1,21 @@
 from typing import Optional, Dict, List
 import pygame
 from .entity import Entity
+from .stats import Modifier, ORDER_LEVEL
+from src.systems.asset_system import load_shared_font
+from src.systems.event_bus import PlayerLeveledUp
 
 class Player(Entity):
+    # Bônus de stats ganho a cada nível acima do primeiro
+    LEVEL_BONUS = {
+        'max_health': 20,
+        'max_mana': 10,
+        'strength': 2,
+        'defense': 2,
+        'magic': 2,
+        'speed': 1
+    }
+    
     def __init__(self, x: float, y: float, width: int, height: int, 
                  sprite_path: Optional[str] = None):
         super().__init__(x, y, width, height, sprite_path)
@@ -44,15 +57,15 @@ class Player(Entity):
         self.exp -= self.next_level_exp
         self.next_level_exp = int(self.next_level_exp * 1.5)
         
-        # Aumenta os stats base
-        self.max_health += 20
+        # O bônus de nível é uma pilha própria: os valores base e os
+        # modificadores de equipamentos e efeitos não são tocados
+        levels = self.level - 1
+        self.set_modifiers('level', [Modifier(stat, bonus * levels, 'level', ORDER_LEVEL)
+                                     for stat, bonus in self.LEVEL_BONUS.items()])
         self.health = self.max_health
-        self.max_mana += 10
         self.mana = self.max_mana
-        self.strength += 2
-        self.defense += 2
-        self.magic += 2
-        self.speed += 1
+        if self.event_bus:
+            self.event_bus.emit(PlayerLeveledUp('player', source=self))
         
     def equip_item(self, slot: str, item) -> bool:
         """Equipa um item no slot especificado."""
@@ -85,7 +98,8 @@ class Player(Entity):
         
     def get_total_stats(self) -> Dict[str, int]:
         """Retorna os stats totais incluindo equipamentos."""
-        total_stats = {
+        # Os stats já são derivados (base + modificadores) e ficam em cache
+        return {
             'health': self.max_health,
             'mana': self.max_mana,
             'strength': self.strength,
@@ -94,15 +108,6 @@ class Player(Entity):
             'speed': self.speed
         }
         
-        # Adiciona os stats dos equipamentos
-        for item in self.equipment_slots.values():
-            if item:
-                for stat, value in item.stats.items():
-                    if stat in total_stats:
-                        total_stats[stat] += value
-                        
-        return total_stats
-        
     def handle_input(self, keys: Dict[int, bool], entities: List[Entity]):
         """Processa input do jogador."""
         dx = 0
@@ -129,14 +134,6 @@ class Player(Entity):
             # Tenta mover o jogador
             self.move(dx, dy, entities)
             
-    def update(self, delta_time: float):
-        """Atualiza o jogador."""
-        super().update(delta_time)
-        
-        # Atualiza quests ativas
-        for quest in self.active_quests:
-            quest.update(self)
-            
     def draw(self, screen: pygame.Surface, camera_x: int = 0, camera_y: int = 0):
         """Desenha o jogador na tela."""
         super().draw(screen, camera_x, camera_y)
@@ -186,7 +183,7 @@ class Player(Entity):
         
         # Texto de status
         if hasattr(pygame.font, 'Font'):
-            font = pygame.font.Font(None, 24)
+            font = load_shared_font(None, 24)
             
             # Nível
             level_text = f"Level {self.level}"
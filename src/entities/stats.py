@@ -0,0 +1,107 @@
+from typing import Dict, List
+
+# Ordem de aplicação das pilhas de modificadores (menor primeiro)
+ORDER_LEVEL = 0
+ORDER_EQUIPMENT = 10
+ORDER_EFFECT = 20
+
+class Modifier:
+    """Alteração de um stat vinda de uma fonte (item equipado, efeito, nível).
+
+    operation 'add' soma value ao stat; 'mul' multiplica o valor acumulado
+    até aquele ponto da pilha por value.
+    """
+    __slots__ = ('stat', 'value', 'source', 'order', 'operation')
+
+    def __init__(self, stat: str, value, source, order: int = ORDER_EQUIPMENT,
+                 operation: str = 'add'):
+        self.stat = stat
+        self.value = value
+        self.source = source
+        self.order = order
+        self.operation = operation
+
+    def __repr__(self):
+        return f"Modifier({self.stat!r}, {self.value!r}, order={self.order}, {self.operation})"
+
+class StatModifiers:
+    """Pilhas de modificadores de uma entidade e o cache dos valores derivados.
+
+    O valor derivado de um stat só é recalculado depois que a pilha ou o
+    valor base daquele stat mudam.
+    """
+    __slots__ = ('stacks', 'cache')
+
+    def __init__(self):
+        self.stacks: Dict[str, List[Modifier]] = {}
+        self.cache: Dict[str, float] = {}
+
+    def add(self, modifier: Modifier):
+        stack = self.stacks.setdefault(modifier.stat, [])
+        stack.append(modifier)
+        stack.sort(key=lambda entry: entry.order)  # Estável: mesma ordem mantém a inserção
+        self.cache.pop(modifier.stat, None)
+
+    def remove_source(self, source) -> List[str]:
+        """Remove os modificadores da fonte. Retorna os stats afetados."""
+        changed = []
+        for stat, stack in list(self.stacks.items()):
+            kept = [modifier for modifier in stack if modifier.source is not source]
+            if len(kept) == len(stack):
+                continue
+            if kept:
+                self.stacks[stat] = kept
+            else:
+                del self.stacks[stat]
+            self.cache.pop(stat, None)
+            changed.append(stat)
+        return changed
+
+    def compute(self, stat: str, base):
+        value = base
+        for modifier in self.stacks[stat]:
+            if modifier.operation == 'mul':
+                value *= modifier.value
+            else:
+                value += modifier.value
+        if isinstance(base, int):
+            value = int(round(value))
+        return value
+
+class Stat:
+    """Stat de entidade com valor base e valor derivado em cache.
+
+    Ler o atributo devolve o valor derivado (base + modificadores);
+    atribuir altera o valor base. O base fica no __dict__ da instância só
+    depois de alterado, antes disso vem do padrão da classe.
+    """
+    def __init__(self, default=0):
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def base(self, instance):
+        return instance.__dict__.get(self.name, self.default)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        modifiers = instance.__dict__.get('modifiers')
+        if modifiers is None or self.name not in modifiers.stacks:
+            return self.base(instance)
+        try:
+            return modifiers.cache[self.name]
+        except KeyError:
+            value = modifiers.cache[self.name] = modifiers.compute(self.name, self.base(instance))
+            return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.name] = value
+        modifiers = instance.__dict__.get('modifiers')
+        if modifiers is not None:
+            modifiers.cache.pop(self.name, None)
+
+def is_stat(target, name: str) -> bool:
+    """Verifica se name é um Stat (com modificadores) da classe do alvo."""
+    return isinstance(getattr(type(target), name, None), Stat)
@@ -1,5 +1,6 @@
 from typing import Dict, Optional, List
 from .item import Item
+from src.entities.stats import Modifier, ORDER_EFFECT, is_stat
 
 class Effect:
     def __init__(self, stat: str, value: int, duration: float = 0):
@@ -8,17 +9,29 @@ class Effect:
         self.duration = duration  # Em segundos, 0 para efeito instantâneo
         self.remaining_time = duration
         
+    def copy(self) -> 'Effect':
+        """Nova instância do efeito, com o tempo restante cheio."""
+        return Effect(self.stat, self.value, self.duration)
+        
     def apply(self, target):
-        """Aplica o efeito ao alvo."""
-        if hasattr(target, self.stat):
+        """Aplica o efeito ao alvo.
+        
+        Efeitos temporários em stats viram um modificador removido em
+        remove(); os instantâneos alteram o valor base ou o estado (vida, mana).
+        """
+        if is_stat(target, self.stat):
+            if self.duration > 0:
+                target.add_modifier(Modifier(self.stat, self.value, self, ORDER_EFFECT))
+            else:
+                target.add_base(self.stat, self.value)
+        elif hasattr(target, self.stat):
             current_value = getattr(target, self.stat)
             setattr(target, self.stat, current_value + self.value)
             
     def remove(self, target):
         """Remove o efeito do alvo."""
-        if hasattr(target, self.stat):
-            current_value = getattr(target, self.stat)
-            setattr(target, self.stat, current_value - self.value)
+        if is_stat(target, self.stat):
+            target.remove_modifiers(self)
             
     def update(self, target, delta_time: float) -> bool:
         """Atualiza o efeito. Retorna True se o efeito ainda está ativo."""
@@ -30,33 +43,25 @@ class Effect:
 class Consumable(Item):
     def __init__(self, item_id: str, name: str, description: str, 
                  effects: List[Dict], sprite_path: Optional[str] = None):
-        super().__init__(item_id, name, description, sprite_path)
-        self.effects: List[Effect] = []
-        self.stackable = True
-        self.max_stack = 99
-        
-        # Cria os efeitos a partir dos dados
-        for effect_data in effects:
-            effect = Effect(
-                effect_data['stat'],
-                effect_data['value'],
-                effect_data.get('duration', 0)
-            )
-            self.effects.append(effect)
+        # Os efeitos ficam no template, compartilhados entre as instâncias
+        super().__init__(item_id, name, description, sprite_path,
+                         effects=[Effect(effect_data['stat'],
+                                         effect_data['value'],
+                                         effect_data.get('duration', 0))
+                                  for effect_data in effects],
+                         stackable=True, max_stack=99)
             
     def use(self, target) -> bool:
         """Usa o item no alvo, aplicando seus efeitos."""
         if not target:
             return False
             
-        # Aplica todos os efeitos
+        # Aplica todos os efeitos; os do template são compartilhados, então
+        # a entidade guarda uma cópia de cada efeito temporário
         for effect in self.effects:
-            if effect.duration > 0:
-                # Adiciona o efeito à lista de efeitos ativos do alvo
-                if hasattr(target, 'active_effects'):
-                    target.active_effects.append(effect)
-            else:
-                # Aplica o efeito instantaneamente
+            if hasattr(target, 'apply_effect'):
+                target.apply_effect(effect)
+            elif effect.duration <= 0:
                 effect.apply(target)
                 
         return True
@@ -1,22 +1,30 @@
 from typing import Dict, Optional
 from .item import Item
+from src.entities.stats import Modifier, ORDER_EQUIPMENT, is_stat
 
 class Equipment(Item):
+    # Stats de item que alteram outro stat do personagem: o dano da arma
+    # entra como força, que é o que o combate usa para rolar o ataque
+    STAT_TARGETS = {'damage': 'strength'}
+    
     def __init__(self, item_id: str, name: str, description: str, 
                  slot: str, stats: Dict[str, int], 
                  sprite_path: Optional[str] = None):
-        super().__init__(item_id, name, description, sprite_path)
-        self.slot = slot  # weapon, armor, accessory
-        self.stats = stats
+        # slot: weapon, armor, accessory
+        super().__init__(item_id, name, description, sprite_path, slot=slot, stats=stats)
+        
+    def init_state(self):
         self.equipped = False
+        self.pending_template = None  # Template recarregado enquanto o item estava equipado
         
     def equip(self, character) -> bool:
         """Equipa o item no personagem."""
         if not self.equipped:
-            # Aplica os stats ao personagem
+            # Os stats do item entram como modificadores do personagem
             for stat, value in self.stats.items():
-                if hasattr(character, stat):
-                    setattr(character, stat, getattr(character, stat) + value)
+                stat = self.STAT_TARGETS.get(stat, stat)
+                if is_stat(character, stat):
+                    character.add_modifier(Modifier(stat, value, self, ORDER_EQUIPMENT))
             self.equipped = True
             return True
         return False
@@ -24,11 +32,13 @@ class Equipment(Item):
     def unequip(self, character) -> bool:
         """Remove o equipamento do personagem."""
         if self.equipped:
-            # Remove os stats do personagem
-            for stat, value in self.stats.items():
-                if hasattr(character, stat):
-                    setattr(character, stat, getattr(character, stat) - value)
+            # Remove os modificadores deste item, independente dos stats atuais
+            if hasattr(character, 'remove_modifiers'):
+                character.remove_modifiers(self)
             self.equipped = False
+            if self.pending_template is not None:
+                self.template = self.pending_template
+                self.pending_template = None
             return True
         return False
         
@@ -50,13 +60,14 @@ class Equipment(Item):
         return tooltip
 
 class Weapon(Equipment):
+    damage_type = 'physical'  # physical, magical, true
+    range = 1
+    attack_speed = 1.0
+    
     def __init__(self, item_id: str, name: str, description: str, 
                  slot: str, stats: Dict[str, int], 
                  sprite_path: Optional[str] = None):
         super().__init__(item_id, name, description, slot, stats, sprite_path)
-        self.damage_type = 'physical'  # physical, magical, true
-        self.range = 1
-        self.attack_speed = 1.0
     
     def calculate_damage(self, attacker, target):
         base_damage = self.stats.get('damage', 0)
@@ -71,11 +82,12 @@ class Weapon(Equipment):
         return max(1, int(damage))
 
 class Armor(Equipment):
+    armor_type = 'light'  # light, medium, heavy
+    
     def __init__(self, item_id: str, name: str, description: str, 
                  slot: str, stats: Dict[str, int], 
                  sprite_path: Optional[str] = None):
         super().__init__(item_id, name, description, slot, stats, sprite_path)
-        self.armor_type = 'light'  # light, medium, heavy
     
     def calculate_defense(self, wearer):
         base_defense = self.stats.get('defense', 0)
@@ -91,6 +103,9 @@ class Accessory(Equipment):
                  slot: str, stats: Dict[str, int], 
                  sprite_path: Optional[str] = None):
         super().__init__(item_id, name, description, slot, stats, sprite_path)
+        
+    def init_state(self):
+        super().init_state()
         self.effects = []  # Special effects granted by the accessory
     
     def update(self, wearer, delta_time):
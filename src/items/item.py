@@ -1,22 +1,73 @@
 from typing import Dict, Optional
+from types import MappingProxyType
 import pygame
+from src.systems.asset_system import load_shared_sprite
 
-class Item:
-    def __init__(self, item_id: str, name: str, description: str, sprite_path: Optional[str] = None):
-        self.id = item_id
-        self.name = name
-        self.description = description
-        self.sprite = None
-        self.max_stack = 1
-        self.stackable = False
+class ItemTemplate:
+    """Dados estáticos de um item, compartilhados por todas as suas instâncias."""
+    __slots__ = ('id', 'name', 'description', 'sprite', 'max_stack', 'stackable',
+                 'value', 'slot', 'stats', 'effects')
+    
+    def __init__(self, item_id: str, name: str, description: str, sprite=None,
+                 max_stack: int = 1, stackable: bool = False, value: int = 0,
+                 slot: Optional[str] = None, stats: Optional[Dict] = None, effects=()):
+        set_field = object.__setattr__
+        set_field(self, 'id', item_id)
+        set_field(self, 'name', name)
+        set_field(self, 'description', description)
+        set_field(self, 'sprite', sprite)
+        set_field(self, 'max_stack', max_stack)
+        set_field(self, 'stackable', stackable)
+        set_field(self, 'value', value)
+        set_field(self, 'slot', slot)
+        set_field(self, 'stats', MappingProxyType(dict(stats or {})))
+        set_field(self, 'effects', tuple(effects))
+        
+    def __setattr__(self, name, value):
+        raise AttributeError("ItemTemplate é imutável")
         
+    def replace(self, **changes) -> 'ItemTemplate':
+        """Cópia do template com alguns campos trocados."""
+        fields = {field: getattr(self, field) for field in self.__slots__}
+        fields.update(changes)
+        fields['item_id'] = fields.pop('id')
+        return ItemTemplate(**fields)
+
+class Item:
+    """Instância de item: guarda só o estado mutável e lê o resto do template."""
+    def __init__(self, item_id: str, name: str, description: str, sprite_path: Optional[str] = None,
+                 **template_fields):
+        sprite = None
         if sprite_path:
-            self.load_sprite(sprite_path)
-            
+            try:
+                sprite = load_shared_sprite(sprite_path)
+            except Exception as e:
+                print(f"Erro ao carregar sprite do item {name}: {e}")
+        self.template = ItemTemplate(item_id, name, description, sprite, **template_fields)
+        self.init_state()
+        
+    @classmethod
+    def from_template(cls, template: ItemTemplate) -> 'Item':
+        """Cria uma instância que compartilha um template existente."""
+        item = cls.__new__(cls)
+        item.template = template
+        item.init_state()
+        return item
+        
+    def init_state(self):
+        """Inicializa o estado mutável da instância. Sobrescrito pelas subclasses."""
+        pass
+        
+    def __getattr__(self, name):
+        # Só é chamado quando a instância não tem o atributo: usa o template
+        if name == 'template':
+            raise AttributeError(name)
+        return getattr(self.template, name)
+        
     def load_sprite(self, sprite_path: str):
         """Carrega o sprite do item."""
         try:
-            self.sprite = pygame.image.load(sprite_path).convert_alpha()
+            self.sprite = load_shared_sprite(sprite_path)
         except Exception as e:
             print(f"Erro ao carregar sprite do item {self.name}: {e}")
             
@@ -6,30 +6,65 @@ Email: contato@jcbytes.com.br
 """
 
 import os
-import json
 import pygame
-from src.systems.inventory_system import InventorySystem
+from typing import Optional
+from src.systems.inventory_system import InventorySystem, InventoryTransaction
 from src.systems.dialog_system import DialogSystem
 from src.systems.quest_system import QuestSystem
 from src.systems.combat_system import CombatSystem
 from src.systems.animation_system import AnimationSystem
 from src.systems.particle_system import ParticleSystem
 from src.systems.camera import Camera
-from src.map.game_map import GameMap
+from src.systems.sound_system import SoundSystem
+from src.systems.startup_tracer import StartupTracer
+from src.systems.asset_system import AssetSystem
+from src.systems.lighting_system import LightingSystem
+from src.systems.fov_system import FieldOfView
+from src.systems.quality_governor import QualityGovernor, QualityLevel
+from src.systems.loot_system import LootSystem
+from src.systems.spawn_system import MonsterSpawner
+from src.systems.map_system import MapSystem, load_tileset
+from src.systems.zone_system import MapPrefetcher, ZoneGraph
+from src.systems.event_bus import EventBus, ItemCollected
+from src.data.registry import DataRegistry
+from src.data.hot_reload import HotReloader
+from src.map.streaming_world import StreamingWorld
+from src.entities.entity import Entity
 from src.entities.player import Player
 from src.entities.npc import NPC
 from src.entities.monster import Monster
-from src.entities.obstacle import Tree, Rock, Fence, Wall
+from src.entities.obstacle import Obstacle, Tree, Rock, Fence, Wall
 
 class Game:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, render_scale: float = 1.0, ui_native: bool = True,
+                 upscale_filter: str = 'scale', adaptive_quality: bool = False,
+                 quality_log_path: Optional[str] = None,
+                 start_zone: str = 'forest',
+                 preload_scene: Optional[str] = 'forest', trace_startup: bool = False,
+                 hot_reload: bool = False, world_dir: Optional[str] = None):
+        self.startup_tracer = StartupTracer(trace_startup)
+        trace = self.startup_tracer.phase
+        
+        # Só os módulos necessários no primeiro frame; o mixer é iniciado
+        # pelo SoundSystem quando o som for usado pela primeira vez
+        with trace("pygame"):
+            pygame.display.init()
+            pygame.font.init()
         
         # Configurações da janela
-        self.screen_width = 800
-        self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
-        pygame.display.set_caption("RPG Game")
+        with trace("janela"):
+            self.screen_width = 800
+            self.screen_height = 600
+            self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+            pygame.display.set_caption("RPG Game")
+        
+            # Resolução interna do mundo (render_scale < 1 renderiza em baixa
+            # resolução e amplia uma vez por frame). A UI pode continuar nativa.
+            self.ui_native = ui_native
+            self.upscale_filter = upscale_filter  # 'scale' ou 'scale2x'
+            self.camera = None
+            self.base_render_scale = render_scale
+            self.set_render_scale(render_scale)
         
         # Clock para controle de FPS
         self.clock = pygame.time.Clock()
@@ -37,73 +72,363 @@ class Game:
         self.running = True
         self.paused = False
         
-        # Carrega dados do jogo
-        self.load_game_data()
+        # Assets da cena inicial (a zona em que o jogo começa) são decodificados
+        # antes do primeiro frame
+        with trace("assets"):
+            self.asset_system = AssetSystem()
+            # Sprites e fontes pedidos pelas entidades e pela UI vêm deste cache
+            AssetSystem.shared = self.asset_system
+            if preload_scene:
+                self.show_loading_screen(preload_scene)
         
-        # Cria o mapa
-        self.game_map = GameMap(50, 50)  # Mapa 50x50 tiles
+        # Carrega dados do jogo (cada arquivo é lido uma única vez e
+        # compartilhado com os sistemas)
+        with trace("dados do jogo"):
+            self.load_game_data()
+            self.hot_reloader = None
+            if hot_reload:
+                self.enable_hot_reload()
+        
+        # Cria o mapa: o jogo acontece nas zonas de zones.json; as vizinhas são
+        # preparadas em segundo plano quando o jogador chega perto de uma saída
+        with trace("mapa"):
+            zone_graph = ZoneGraph(os.path.join('assets', 'data', 'zones.json'))
+            tileset = load_tileset(os.path.join('assets', 'data', 'tileset.json'))
+            self.map_system = MapSystem(self.asset_system,
+                                        prefetcher=MapPrefetcher(zone_graph, tileset=tileset))
+            if not self.map_system.load_map(start_zone):
+                raise FileNotFoundError(f"Mapa da zona inicial '{start_zone}' não encontrado")
+            self.game_map = self.map_system.current_map
+            self.streaming_world = None  # Mundo em chunks opcional (world_dir)
         
         # Lista de entidades
         self.entities = []
         
-        # Cria o jogador no centro do mapa
-        player_x = (self.game_map.width * self.game_map.tile_size) // 2
-        player_y = (self.game_map.height * self.game_map.tile_size) // 2
-        self.player = Player(player_x, player_y, 32, 32)
-        self.entities.append(self.player)
+        # Cria o jogador no ponto de partida da zona
+        with trace("jogador"):
+            self.player = Player(0, 0, 32, 32)
+            self.place_player(self.start_point(self.game_map))
+            self.entities.append(self.player)
+        
+            # Cria a câmera com o tamanho da superfície interna do mundo
+            self.camera = Camera(*self.world_surface.get_size())
         
-        # Cria a câmera
-        self.camera = Camera(self.screen_width, self.screen_height)
+        # Sistemas do jogo. Inventário, quest log e som não são usados no
+        # primeiro frame e são criados no primeiro acesso (ver propriedades)
+        with trace("sistemas"):
+            self._inventory_system = None
+            self._quest_system = None
+            self._sound_system = None
+            self.text_antialias = True
+            # Mortes, coletas e conversas viram eventos consumidos pelas quests
+            self.event_bus = EventBus()
+            Entity.event_bus = self.event_bus
+            self.dialog_system = DialogSystem(dialogs=self.dialogs_data)
+            self.combat_system = CombatSystem()
+            self.loot_system = LootSystem(self.data_registry.loot_tables, self.data_registry.items)
+            self.loot_system.listen(self.on_loot)
+            Monster.loot_system = self.loot_system
+            Obstacle.loot_system = self.loot_system
+            # Monstros vêm das áreas de spawn do mapa; os mortos voltam para um pool.
+            # As posições são checadas contra o mapa que o jogo desenha
+            self.spawner = MonsterSpawner(self.event_bus, self.entities.extend,
+                                          self.remove_entities, blocked=self.is_blocked_at)
+            self.animation_system = AnimationSystem()
+            self.particle_system = ParticleSystem()
+            self.lighting_system = None
+            self.lighting_map = None
+            self.player_light = None
+            self.field_of_view = None
         
-        # Sistemas do jogo
-        self.inventory_system = InventorySystem()
-        self.dialog_system = DialogSystem(os.path.join("assets", "data", "dialogs.json"))
-        self.quest_system = QuestSystem(os.path.join("assets", "data", "quests.json"))
-        self.combat_system = CombatSystem()
-        self.animation_system = AnimationSystem()
-        self.particle_system = ParticleSystem()
+            # Governador de qualidade: reduz custos quando os frames estouram
+            self.quality_governor = QualityGovernor(self.fps, self.apply_quality_level,
+                                                    log_path=quality_log_path)
+            self.quality_governor.enabled = adaptive_quality
+            # Intervalo entre decisões de IA dos monstros no nível atual
+            self.ai_interval = self.quality_governor.level.ai_interval
         
         # Estado do jogo
         self.keys = {}
         self.delta_time = 0
         
-        # Adiciona NPCs
-        self.add_npcs()
+        with trace("entidades"):
+            # Adiciona NPCs
+            self.add_npcs()
+            
+            # Adiciona obstáculos
+            self.add_obstacles()
+            
+            if world_dir:
+                # O mundo em chunks substitui as zonas e traz as próprias entidades
+                self.enable_streaming_world(world_dir)
+                self.place_player(self.start_point(self.streaming_world))
+            else:
+                # Adiciona monstros
+                self.add_monsters()
+                self.apply_zone_settings()
+            
+            # A zona atual passa a referenciar os seus assets (e o MapSystem os
+            # libera ao trocar de zona); a cena da tela de carregamento, se for
+            # outra, não referencia mais nada
+            if preload_scene and preload_scene != self.map_system.current_map_name:
+                self.asset_system.release(preload_scene)
+        
+    @property
+    def inventory_system(self) -> InventorySystem:
+        """Inventário, criado na primeira vez que é usado."""
+        if self._inventory_system is None:
+            self._inventory_system = InventorySystem()
+            self._inventory_system.panel.set_antialias(self.text_antialias)
+            self._inventory_system.listen(self.on_inventory_changed)
+        return self._inventory_system
+        
+    @property
+    def quest_system(self) -> QuestSystem:
+        """Sistema de quests, criado na primeira vez que é usado."""
+        if self._quest_system is None:
+            self._quest_system = QuestSystem(quest_data=self.quests_data, event_bus=self.event_bus)
+            self._quest_system.log_panel.set_antialias(self.text_antialias)
+            self._quest_system.set_player_level(self.player.level)
+        return self._quest_system
+        
+    @property
+    def sound_system(self) -> SoundSystem:
+        """Sistema de som; inicia o mixer na primeira vez que é usado."""
+        if self._sound_system is None:
+            self._sound_system = SoundSystem()
+        return self._sound_system
+        
+    def set_render_scale(self, scale: float):
+        """Define a escala da resolução interna de renderização do mundo."""
+        self.render_scale = max(0.25, min(1.0, scale))
+        if self.render_scale == 1.0:
+            self.world_surface = self.screen
+        else:
+            size = (int(self.screen_width * self.render_scale),
+                    int(self.screen_height * self.render_scale))
+            self.world_surface = pygame.Surface(size).convert(self.screen)
+            
+        if self.camera:
+            self.camera.width, self.camera.height = self.world_surface.get_size()
+            
+    def enable_lighting(self, light_map, ambient=(40, 40, 55)):
+        """Ativa a iluminação usando as luzes do mapa e uma tocha no jogador."""
+        self.lighting_system = LightingSystem(light_map, ambient)
+        self.lighting_map = light_map
+        self.player_light = self.lighting_system.add_light(
+            self.player.x, self.player.y, 4 * light_map.tile_size, (255, 220, 170))
+            
+    def disable_lighting(self):
+        """Desativa a iluminação."""
+        self.lighting_system = None
+        self.lighting_map = None
+        self.player_light = None
+        
+    def enable_streaming_world(self, world_dir: str, **options):
+        """Troca o mapa fixo por um mundo em chunks carregados sob demanda."""
+        self.streaming_world = StreamingWorld(
+            world_dir,
+            on_entities_loaded=self.entities.extend,
+            on_entities_unloaded=self.remove_entities,
+            **options)
+        self.streaming_world.update(self.camera.x, self.camera.y,
+                                    self.camera.width, self.camera.height)
+        self.streaming_world.wait_for_chunks()
         
-        # Adiciona obstáculos
-        self.add_obstacles()
+    def is_blocked_at(self, x: float, y: float) -> bool:
+        """Verifica se a posição (em pixels) está fora do mapa ou sobre um tile sólido."""
+        world = self.streaming_world or self.game_map
+        tile_size = world.tile_size
+        return bool(world.is_solid(int(x // tile_size), int(y // tile_size)))
         
-        # Adiciona monstros
+    @staticmethod
+    def start_point(game_map):
+        """Spawn point onde o jogador começa na zona (ou o centro do mapa)."""
+        for name in ('player', 'entrance'):
+            point = game_map.spawn_points.get(name)
+            if point:
+                return point
+        return {'x': game_map.width // 2, 'y': game_map.height // 2}
+        
+    def place_player(self, point):
+        """Coloca o jogador sobre o tile de um spawn point."""
+        tile_size = (self.streaming_world or self.game_map).tile_size
+        self.player.x = point['x'] * tile_size + (tile_size - self.player.width) / 2
+        self.player.y = point['y'] * tile_size + (tile_size - self.player.height) / 2
+        self.player.collision_rect.topleft = (self.player.x, self.player.y)
+        # O tile de chegada pode ser uma saída: só atravessa depois de sair dele
+        self.player_tile = (point['x'], point['y'])
+        
+    def travel(self, exit_name: str) -> bool:
+        """Atravessa uma saída da zona atual, trocando o mapa e os monstros."""
+        previous = self.map_system.current_map_name
+        arrival = self.map_system.travel(exit_name)
+        if self.map_system.current_map_name == previous:
+            return False
+        self.game_map = self.map_system.current_map
+        self.place_player(arrival or self.start_point(self.game_map))
         self.add_monsters()
+        self.apply_zone_settings()
+        return True
         
-    def load_game_data(self):
-        """Carrega dados do jogo dos arquivos JSON."""
+    def apply_zone_settings(self):
+        """Liga os efeitos que o mapa da zona atual pede (luzes, névoa de guerra)."""
+        if self.game_map.lights:
+            self.enable_lighting(self.game_map)
+        else:
+            self.disable_lighting()
+        fog = self.game_map.metadata.get('fog_of_war')
+        if fog:
+            self.enable_fog_of_war(self.game_map, fog.get('radius', 8) if isinstance(fog, dict) else 8)
+        else:
+            self.disable_fog_of_war()
+        
+    def check_zone_exit(self):
+        """Atravessa a saída em que o jogador acabou de entrar, se houver."""
+        tile_size = self.game_map.tile_size
+        tile = (int((self.player.x + self.player.width / 2) // tile_size),
+                int((self.player.y + self.player.height / 2) // tile_size))
+        if tile == self.player_tile:
+            return
+        self.player_tile = tile
+        exit_name = self.map_system.exit_at(*tile)
+        if exit_name:
+            self.travel(exit_name)
+        
+    def remove_entities(self, entities):
+        """Remove entidades do jogo (ex.: ao descarregar um chunk)."""
+        removed = set(map(id, entities))
+        self.entities[:] = [entity for entity in self.entities if id(entity) not in removed]
+        
+    def enable_fog_of_war(self, fov_map, radius: int = 8):
+        """Ativa a névoa de guerra com o campo de visão do jogador."""
+        self.field_of_view = FieldOfView(fov_map, radius)
+        
+    def disable_fog_of_war(self):
+        """Desativa a névoa de guerra."""
+        self.field_of_view = None
+        
+    def apply_quality_level(self, level: QualityLevel):
+        """Aplica as configurações de um nível de qualidade aos sistemas."""
+        self.particle_system.max_particles = level.particle_cap
+        self.ai_interval = level.ai_interval
+        self.set_render_scale(self.base_render_scale * level.render_scale)
+        self.text_antialias = level.text_antialias
+        panels = [self.dialog_system.panel]
+        if self._inventory_system:
+            panels.append(self._inventory_system.panel)
+        if self._quest_system:
+            panels.append(self._quest_system.log_panel)
+        for panel in panels:
+            panel.set_antialias(level.text_antialias)
+            
+    def present_world(self):
+        """Amplia a superfície interna do mundo para a janela."""
+        if self.world_surface is self.screen:
+            return
+            
+        world_size = self.world_surface.get_size()
+        if (self.upscale_filter == 'scale2x' and
+                (world_size[0] * 2, world_size[1] * 2) == self.screen.get_size()):
+            pygame.transform.scale2x(self.world_surface, self.screen)
+        else:
+            pygame.transform.scale(self.world_surface, self.screen.get_size(), self.screen)
+            
+    def show_loading_screen(self, scene: str):
+        """Pré-carrega os assets de uma cena exibindo uma barra de progresso."""
         try:
-            # Carrega dados dos itens
-            items_path = os.path.join("assets", "data", "items.json")
-            with open(items_path, 'r', encoding='utf-8') as f:
-                self.items_data = json.load(f)
-                
-            # Carrega dados dos diálogos
-            dialogs_path = os.path.join("assets", "data", "dialogs.json")
-            with open(dialogs_path, 'r', encoding='utf-8') as f:
-                self.dialogs_data = json.load(f)
-                
-            # Carrega dados das quests
-            quests_path = os.path.join("assets", "data", "quests.json")
-            with open(quests_path, 'r', encoding='utf-8') as f:
-                self.quests_data = json.load(f)
-                
+            preloader = self.asset_system.preload(scene)
         except Exception as e:
-            print(f"Erro ao carregar dados do jogo: {e}")
-            self.items_data = {}
-            self.dialogs_data = {}
-            self.quests_data = {}
+            print(f"Erro ao carregar manifesto de assets: {e}")
+            return
+            
+        bar_width, bar_height = 400, 24
+        bar_x = (self.screen_width - bar_width) // 2
+        bar_y = (self.screen_height - bar_height) // 2
+        while not preloader.done:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+                    
+            # Finaliza um lote por frame, deixando tempo para desenhar a tela
+            preloader.step(budget_ms=8.0)
+            
+            self.screen.fill((0, 0, 0))
+            pygame.draw.rect(self.screen, (60, 60, 60), (bar_x, bar_y, bar_width, bar_height))
+            pygame.draw.rect(self.screen, (200, 170, 60),
+                             (bar_x, bar_y, int(bar_width * preloader.progress()), bar_height))
+            pygame.display.flip()
+            self.clock.tick(self.fps)
+            
+    def load_game_data(self):
+        """Carrega dados do jogo pelo registro central (validados e indexados por id)."""
+        self.data_registry = DataRegistry(os.path.join("assets", "data"))
+        self.items_data = self.data_registry.items
+        self.dialogs_data = self.data_registry.dialogs
+        self.quests_data = self.data_registry.quests
         
+    def enable_hot_reload(self):
+        """Observa os arquivos de dados e aplica as edições sem reiniciar o jogo."""
+        self.hot_reloader = HotReloader(self.data_registry)
+        self.hot_reloader.listen('items', self.on_items_reloaded)
+        self.hot_reloader.listen('quests', self.on_quests_reloaded)
+        self.hot_reloader.listen('dialogs', self.on_dialogs_reloaded)
+        self.hot_reloader.listen('loot_tables', self.on_loot_tables_reloaded)
+        self.hot_reloader.listen_maps(self.on_map_reloaded)
+        
+    def on_items_reloaded(self, diff):
+        # Os itens vivos já foram atualizados pelo registro
+        self.items_data = self.data_registry.items
+        if self._inventory_system:
+            self._inventory_system.panel.invalidate()
+            
+    def on_quests_reloaded(self, diff):
+        self.quests_data = self.data_registry.quests
+        if self._quest_system:
+            self._quest_system.apply_quest_data(self.quests_data, diff.changed,
+                                                diff.added, diff.removed)
+            
+    def on_dialogs_reloaded(self, diff):
+        self.dialogs_data = self.data_registry.dialogs
+        self.dialog_system.apply_dialog_data(self.dialogs_data, diff.changed, diff.removed)
+        
+    def on_loot_tables_reloaded(self, diff):
+        self.loot_system.load(self.data_registry.loot_tables, self.data_registry.items)
+        
+    def on_loot(self, drops):
+        """Entrega ao inventário os drops rolados no frame, numa única transação."""
+        transaction = InventoryTransaction()
+        for item_id, amount in drops.items():
+            item = self.data_registry.create_item(item_id)
+            if item:
+                transaction.add(item, amount)
+        if not self.inventory_system.commit(transaction):
+            # Não coube tudo: guarda o que couber, item a item
+            for item, amount in transaction.adds:
+                if not self.inventory_system.add_item(item, amount):
+                    print(f"Inventário cheio: {item.name} perdido")
+                    
+    def on_inventory_changed(self, change):
+        """Publica os itens que entraram no inventário como coletas."""
+        for item_id, amount in change.added.items():
+            self.event_bus.emit(ItemCollected(item_id, amount))
+            
+    def on_map_reloaded(self, game_map, dirty_chunks):
+        """Atualiza os sistemas que dependem de um mapa recarregado."""
+        if self.lighting_system and self.lighting_map is game_map:
+            self.enable_lighting(game_map, self.lighting_system.ambient)
+        if self.field_of_view and self.field_of_view.map is game_map:
+            self.field_of_view.origin = None  # A colisão pode ter mudado
+        if game_map is self.map_system.current_map:
+            # Spawn points, áreas e monstros podem ter mudado: repovoa a zona
+            zone = self.map_system.map_reloaded(game_map)
+            self.spawner.load_map(game_map, self.map_system.get_monster_prototypes(zone))
+            
     def add_npcs(self):
         """Adiciona NPCs ao jogo."""
         # Comerciante
         merchant_data = {
+            'id': 'merchant_john',
             'name': 'Merchant John',
             'role': 'merchant',
             'dialog_id': 'merchant_dialog',
@@ -114,6 +439,7 @@ class Game:
         
         # Quest Giver
         quest_giver_data = {
+            'id': 'elder_sarah',
             'name': 'Elder Sarah',
             'role': 'quest_giver',
             'dialog_id': 'forest_entrance',
@@ -146,23 +472,14 @@ class Game:
             self.entities.append(fence)
             
     def add_monsters(self):
-        """Adiciona monstros ao jogo."""
-        monster_data = {
-            'name': 'Goblin',
-            'level': 1,
-            'health': 50,
-            'strength': 5,
-            'defense': 3,
-            'exp_reward': 10,
-            'gold_reward': 5
-        }
-        
-        # Adiciona alguns goblins
-        for i in range(5):
-            x = 200 + i * 100
-            y = 500
-            monster = Monster(x, y, 32, 32, monster_data)
-            self.entities.append(monster)
+        """Povoa as áreas de spawn definidas no mapa da zona atual (spawn points e lista de monstros)."""
+        zone = self.map_system.current_map_name
+        self.spawner.load_map(self.map_system.current_map,
+                              self.map_system.get_monster_prototypes(zone))
+        # Edições no arquivo da zona voltam como on_map_reloaded
+        if self.hot_reloader:
+            self.hot_reloader.watch_map(self.map_system.map_path(zone),
+                                        self.map_system.current_map)
         
     def handle_events(self):
         """Processa eventos do pygame."""
@@ -179,7 +496,7 @@ class Game:
                 elif event.key == pygame.K_e:
                     self.inventory_system.toggle()
                 elif event.key == pygame.K_TAB:
-                    self.quest_system.toggle()
+                    self.quest_system.toggle_quest_log()
                 elif event.key == pygame.K_SPACE:
                     # Tenta interagir com NPCs próximos
                     self.try_interact_with_npc()
@@ -191,6 +508,8 @@ class Game:
         """Tenta interagir com NPCs próximos ao jogador."""
         for entity in self.entities:
             if isinstance(entity, NPC) and entity.can_interact(self.player):
+                # Ações do diálogo (iniciar/completar quests) precisam do quest system
+                self.dialog_system.quest_system = self.quest_system
                 entity.interact(self.player, self.dialog_system)
                 break
                 
@@ -202,9 +521,19 @@ class Game:
         # Calcula delta_time em segundos
         self.delta_time = self.clock.get_time() / 1000.0
         
+        # Aplica edições nos arquivos de dados/mapas (só com hot reload ativo)
+        if self.hot_reloader:
+            self.hot_reloader.poll()
+        
         # Atualiza o jogador com input
         self.player.handle_input(self.keys, self.entities)
         
+        # O campo de visão só é recalculado quando o jogador troca de tile,
+        # e é reaproveitado como linha de visão pelos monstros
+        if self.field_of_view:
+            self.field_of_view.update(self.player.x + self.player.width / 2,
+                                      self.player.y + self.player.height / 2)
+        
         # Atualiza todas as entidades
         for entity in self.entities:
             if isinstance(entity, Player):
@@ -212,55 +541,119 @@ class Game:
             elif isinstance(entity, NPC):
                 entity.update(self.delta_time, self.entities)
             elif isinstance(entity, Monster):
-                entity.update(self.delta_time, self.entities)
+                entity.update(self.delta_time, self.entities, self.field_of_view,
+                              self.ai_interval)
                 
         # Atualiza a câmera para seguir o jogador
         self.camera.move_to(self.player.x, self.player.y)
         
+        # Atravessa saídas de zona; prepara as zonas vizinhas quando o jogador
+        # se aproxima de uma saída e finaliza aos poucos os assets da zona atual
+        if not self.streaming_world:
+            self.check_zone_exit()
+            self.map_system.update_prefetch(self.player.x + self.player.width / 2,
+                                            self.player.y + self.player.height / 2)
+        self.map_system.update()
+        
+        # Pede/descarta os chunks ao redor da câmera
+        if self.streaming_world:
+            self.streaming_world.update(self.camera.x, self.camera.y,
+                                        self.camera.width, self.camera.height)
+        
+        # A tocha do jogador acompanha o centro do sprite
+        if self.player_light:
+            self.player_light.x = self.player.x + self.player.width / 2
+            self.player_light.y = self.player.y + self.player.height / 2
+        
         # Atualiza todos os sistemas
-        self.inventory_system.update(self.delta_time)
+        if self._inventory_system:
+            self._inventory_system.update(self.delta_time)
         self.dialog_system.update(self.delta_time)
-        self.quest_system.update(self.delta_time)
+        if self._quest_system:
+            self._quest_system.update(self.delta_time)
         self.combat_system.update(self.delta_time)
+        self.loot_system.flush()
+        self.spawner.update(self.delta_time)
         self.animation_system.update(self.delta_time)
         self.particle_system.update(self.delta_time)
         
     def render(self):
         """Renderiza o jogo."""
+        world = self.world_surface
+        
         # Limpa a tela
-        self.screen.fill((0, 0, 0))
+        world.fill((0, 0, 0))
         
         # Renderiza o mapa
-        self.game_map.draw(self.screen, int(self.camera.x), int(self.camera.y))
+        if self.streaming_world:
+            self.streaming_world.draw(world, int(self.camera.x), int(self.camera.y))
+        else:
+            self.game_map.draw(world, int(self.camera.x), int(self.camera.y))
         
         # Renderiza todas as entidades
         # Ordena as entidades por posição Y para correto layering
         sorted_entities = sorted(self.entities, key=lambda e: e.y)
         for entity in sorted_entities:
             screen_pos = self.camera.apply(entity.x, entity.y)
-            entity.draw(self.screen, int(screen_pos[0]), int(screen_pos[1]))
+            entity.draw(world, int(screen_pos[0]), int(screen_pos[1]))
+        
+        # Renderiza os sistemas do mundo
+        self.combat_system.draw(world)
+        self.animation_system.draw(world)
+        self.particle_system.draw(world)
         
-        # Renderiza todos os sistemas
-        self.inventory_system.draw(self.screen)
-        self.dialog_system.draw(self.screen)
-        self.quest_system.draw(self.screen)
-        self.combat_system.draw(self.screen)
-        self.animation_system.draw(self.screen)
-        self.particle_system.draw(self.screen)
+        # Aplica a iluminação sobre o mundo, antes da UI
+        if self.lighting_system:
+            self.lighting_system.draw(world, int(self.camera.x), int(self.camera.y))
+        if self.field_of_view:
+            self.field_of_view.draw(world, int(self.camera.x), int(self.camera.y))
+        
+        # A UI é desenhada na resolução nativa, depois da ampliação do mundo,
+        # ou na superfície interna junto com o mundo
+        if self.ui_native:
+            self.present_world()
+            self.render_ui(self.screen)
+        else:
+            self.render_ui(world)
+            self.present_world()
         
         # Atualiza a tela
         pygame.display.flip()
         
+    def render_ui(self, surface: pygame.Surface):
+        """Renderiza as interfaces do jogo."""
+        if self._inventory_system:
+            self._inventory_system.draw(surface)
+        self.dialog_system.draw(surface)
+        if self._quest_system:
+            self._quest_system.draw(surface)
+        
     def run(self):
         """Loop principal do jogo."""
         while self.running:
             self.handle_events()
             self.update()
             self.render()
+            self.startup_tracer.mark_first_frame()
             self.clock.tick(self.fps)
             
+            # get_rawtime() exclui a espera do tick: é o custo real do frame
+            self.quality_governor.record_frame(self.clock.get_rawtime() / 1000.0)
+            
+        if self.streaming_world:
+            self.streaming_world.close()
+        if self.hot_reloader:
+            self.hot_reloader.close()
+        self.map_system.close()
         pygame.quit()
 
 if __name__ == "__main__":
-    game = Game()
+    # RPG_TRACE_STARTUP=1 imprime o tempo de cada fase até o primeiro frame
+    # RPG_HOT_RELOAD=1 aplica edições nos dados e mapas sem reiniciar
+    # RPG_ADAPTIVE_QUALITY=1 reduz a qualidade quando os frames estouram
+    # RPG_WORLD_DIR=worlds/forest joga num mundo em chunks (ver streaming_world.py)
+    game = Game(trace_startup=bool(os.environ.get("RPG_TRACE_STARTUP")),
+                hot_reload=bool(os.environ.get("RPG_HOT_RELOAD")),
+                adaptive_quality=bool(os.environ.get("RPG_ADAPTIVE_QUALITY")),
+                world_dir=os.environ.get("RPG_WORLD_DIR"))
     game.run()
@@ -0,0 +1,169 @@
+"""
+Formato binário compilado de mapas (.rpgmap).
+
+Layout do arquivo (little-endian):
+    cabeçalho    magic 'RPGM', versão, nº de camadas, nº de spawn points,
+                 largura, altura, tamanho do tile, tamanho do bloco de metadados
+    camadas      nº de camadas x (nome[16], dtype[4], offset u64)
+    spawn points nº de spawn points x (nome[32], x i32, y i32)
+    metadados    JSON utf-8 com o restante dos dados do mapa (npcs, monstros...)
+    dados        arrays das camadas, linha por linha, alinhados em 64 bytes
+
+O carregamento mapeia o arquivo em memória e expõe cada camada como uma
+view NumPy (altura x largura) sem cópia. O mapeamento é copy-on-write, então
+set_tile continua funcionando sem alterar o arquivo.
+
+Uso:
+    python -m src.map.binary_map assets/maps/*.json
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+from typing import Dict, Tuple
+import numpy as np
+
+MAGIC = b'RPGM'
+VERSION = 1
+MAP_EXTENSION = '.rpgmap'
+ALIGNMENT = 64
+
+HEADER = struct.Struct('<4sHHIIIII')
+LAYER_ENTRY = struct.Struct('<16s4sQ')
+SPAWN_ENTRY = struct.Struct('<32sii')
+
+# Chaves guardadas em binário; o resto do JSON vai para o bloco de metadados
+BINARY_KEYS = ('width', 'height', 'tile_size', 'layers', 'spawn_points')
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def _layer_dtype(name: str, array: np.ndarray) -> np.dtype:
+    """Escolhe o menor tipo que comporta os valores da camada."""
+    if name == 'collision' or array.dtype == np.bool_:
+        return np.dtype('u1')
+    if array.size == 0:
+        return np.dtype('u1')
+    low, high = int(array.min()), int(array.max())
+    if low < 0:
+        return np.dtype('<i4')
+    if high < 1 << 8:
+        return np.dtype('u1')
+    if high < 1 << 16:
+        return np.dtype('<u2')
+    return np.dtype('<u4')
+
+def pad_layer(name: str, values, width: int, height: int) -> np.ndarray:
+    """Camada como array altura x largura; linhas e colunas que faltam viram 0.
+
+    Os mapas do jogo podem ter camadas com menos linhas (ou linhas mais
+    curtas) que o tamanho declarado; o resto do mapa é tile vazio.
+    """
+    if isinstance(values, np.ndarray) and values.shape == (height, width):
+        return values
+    if len(values) > height or any(len(row) > width for row in values):
+        raise ValueError(f"Camada '{name}' é maior que o mapa ({width}x{height})")
+    array = np.zeros((height, width), dtype=np.int64)
+    for y, row in enumerate(values):
+        array[y, :len(row)] = row
+    return array
+
+def write_binary_map(data: Dict, filename: str):
+    """Grava os dados de um mapa (mesmo formato do JSON) em formato binário."""
+    width = data['width']
+    height = data['height']
+    layers = {}
+    for name, values in data['layers'].items():
+        array = pad_layer(name, values, width, height)
+        layers[name] = array.astype(_layer_dtype(name, array))
+
+    spawn_points = data.get('spawn_points', {})
+    metadata = json.dumps({key: value for key, value in data.items()
+                           if key not in BINARY_KEYS}).encode('utf-8')
+
+    offset = (HEADER.size + LAYER_ENTRY.size * len(layers) +
+              SPAWN_ENTRY.size * len(spawn_points) + len(metadata))
+    layer_table = []
+    for name, array in layers.items():
+        offset = _align(offset)
+        layer_table.append((name, array, offset))
+        offset += array.nbytes
+
+    with open(filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(layers), len(spawn_points),
+                            width, height, data.get('tile_size', 32), len(metadata)))
+        for name, array, layer_offset in layer_table:
+            if len(name.encode('utf-8')) > 16:
+                raise ValueError(f"Nome de camada muito longo: '{name}'")
+            f.write(LAYER_ENTRY.pack(name.encode('utf-8'), array.dtype.str.encode('ascii'),
+                                     layer_offset))
+        for name, point in spawn_points.items():
+            if len(name.encode('utf-8')) > 32:
+                raise ValueError(f"Nome de spawn point muito longo: '{name}'")
+            f.write(SPAWN_ENTRY.pack(name.encode('utf-8'), point['x'], point['y']))
+        f.write(metadata)
+        for name, array, layer_offset in layer_table:
+            f.write(b'\0' * (layer_offset - f.tell()))
+            f.write(array.tobytes())
+
+def compile_map(json_path: str, out_path: str = None) -> str:
+    """Compila um mapa JSON para o formato binário. Retorna o caminho gerado."""
+    out_path = out_path or os.path.splitext(json_path)[0] + MAP_EXTENSION
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    write_binary_map(data, out_path)
+    return out_path
+
+def load_binary_map(filename: str) -> Tuple[Dict, Dict[str, np.ndarray], Dict]:
+    """Mapeia um arquivo .rpgmap em memória.
+
+    Retorna (cabeçalho, camadas, metadados); as camadas são views NumPy
+    sobre o arquivo mapeado, sem cópia dos dados.
+    """
+    with open(filename, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    magic, version, layer_count, spawn_count, width, height, tile_size, metadata_size = \
+        HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{filename} não é um mapa compilado")
+    if version != VERSION:
+        raise ValueError(f"Versão de mapa não suportada: {version}")
+
+    offset = HEADER.size
+    layers = {}
+    for _ in range(layer_count):
+        name, dtype, layer_offset = LAYER_ENTRY.unpack_from(mapped, offset)
+        offset += LAYER_ENTRY.size
+        name = name.rstrip(b'\0').decode('utf-8')
+        dtype = np.dtype(dtype.rstrip(b'\0').decode('ascii'))
+        layers[name] = np.frombuffer(mapped, dtype=dtype, count=width * height,
+                                     offset=layer_offset).reshape(height, width)
+
+    spawn_points = {}
+    for _ in range(spawn_count):
+        name, x, y = SPAWN_ENTRY.unpack_from(mapped, offset)
+        offset += SPAWN_ENTRY.size
+        spawn_points[name.rstrip(b'\0').decode('utf-8')] = {'x': x, 'y': y}
+
+    metadata = json.loads(bytes(mapped[offset:offset + metadata_size]).decode('utf-8'))
+    header = {
+        'width': width,
+        'height': height,
+        'tile_size': tile_size,
+        'spawn_points': spawn_points
+    }
+    return header, layers, metadata
+
+if __name__ == '__main__':
+    failed = 0
+    for path in sys.argv[1:]:
+        try:
+            print(f"{path} -> {compile_map(path)}")
+        except Exception as e:
+            # Um mapa com erro não impede a compilação dos demais
+            print(f"Erro ao compilar {path}: {e}")
+            failed += 1
+    sys.exit(1 if failed else 0)
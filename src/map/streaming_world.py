@@ -0,0 +1,424 @@
+"""
+Mundo em streaming dividido em chunks no disco.
+
+split_world() corta um mapa em chunks de tamanho fixo (cada um um .rpgmap)
+mais um manifesto world.json. StreamingWorld carrega em uma thread de fundo
+os chunks ao redor da câmera, descarta os distantes por LRU quando o
+orçamento de memória é excedido e serializa as entidades dos chunks
+descartados, restaurando-as quando o chunk volta.
+
+Uso:
+    python -m src.map.streaming_world assets/maps/forest.json worlds/forest 16
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import numpy as np
+import pygame
+from src.map.binary_map import load_binary_map, pad_layer, write_binary_map
+from src.entities.entity import Entity
+from src.entities.monster import Monster
+from src.entities.npc import NPC
+from src.entities.obstacle import Obstacle, Tree, Rock, Fence, Wall
+
+MANIFEST_NAME = 'world.json'
+ChunkKey = Tuple[int, int]
+
+def chunk_filename(cx: int, cy: int) -> str:
+    return f'chunk_{cx}_{cy}.rpgmap'
+
+def entities_filename(cx: int, cy: int) -> str:
+    return f'entities_{cx}_{cy}.json'
+
+def split_world(map_path: str, out_dir: str, chunk_size: int = 32) -> Dict:
+    """Divide um mapa JSON em chunks .rpgmap e grava o manifesto."""
+    with open(map_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    os.makedirs(out_dir, exist_ok=True)
+    width, height = data['width'], data['height']
+    tile_size = data.get('tile_size', 32)
+    # Camadas com linhas faltando são completadas com 0 antes do corte
+    layers = {name: pad_layer(name, values, width, height)
+              for name, values in data['layers'].items()}
+
+    # NPCs do mapa viram o estado inicial das entidades de cada chunk
+    npcs_by_chunk: Dict[ChunkKey, List[Dict]] = {}
+    for npc in data.get('npcs', []):
+        key = (npc['x'] // chunk_size, npc['y'] // chunk_size)
+        npcs_by_chunk.setdefault(key, []).append({
+            'type': 'NPC',
+            'x': npc['x'] * tile_size,
+            'y': npc['y'] * tile_size,
+            'data': {'name': npc.get('name'), 'dialog_id': npc.get('dialog')}
+        })
+
+    chunks_x = (width + chunk_size - 1) // chunk_size
+    chunks_y = (height + chunk_size - 1) // chunk_size
+    for cy in range(chunks_y):
+        for cx in range(chunks_x):
+            x0, y0 = cx * chunk_size, cy * chunk_size
+            x1, y1 = min(width, x0 + chunk_size), min(height, y0 + chunk_size)
+            write_binary_map({
+                'width': x1 - x0,
+                'height': y1 - y0,
+                'tile_size': tile_size,
+                'layers': {name: layer[y0:y1, x0:x1] for name, layer in layers.items()},
+                'spawn_points': {},
+                'entities': npcs_by_chunk.get((cx, cy), [])
+            }, os.path.join(out_dir, chunk_filename(cx, cy)))
+
+    manifest = {
+        'name': data.get('name', ''),
+        'width': width,
+        'height': height,
+        'tile_size': tile_size,
+        'chunk_size': chunk_size,
+        'spawn_points': data.get('spawn_points', {})
+    }
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+OBSTACLE_TYPES = {'tree': Tree, 'rock': Rock, 'fence': Fence, 'wall': Wall}
+
+def serialize_entity(entity: Entity) -> Dict:
+    """Converte uma entidade em um dicionário JSON com seu estado mutável."""
+    state = {'type': type(entity).__name__, 'x': entity.x, 'y': entity.y,
+             'width': entity.width, 'height': entity.height, 'health': entity.health}
+    if isinstance(entity, Monster):
+        state['type'] = 'Monster'
+        state['data'] = {
+            'name': entity.name, 'level': entity.level, 'health': entity.max_health,
+            'strength': entity.strength, 'defense': entity.defense, 'magic': entity.magic,
+            'speed': entity.speed, 'exp_reward': entity.exp_reward,
+            'gold_reward': entity.gold_reward, 'aggro_range': entity.aggro_range,
+            'attack_range': entity.attack_range, 'attack_cooldown': entity.attack_cooldown
+        }
+    elif isinstance(entity, NPC):
+        state['type'] = 'NPC'
+        state['data'] = {
+            'name': entity.name, 'role': entity.role, 'dialog_id': entity.dialog_id,
+            'shop_items': entity.shop_items, 'quests': entity.available_quests,
+            'movement_pattern': entity.movement_pattern, 'waypoints': entity.waypoints
+        }
+    elif isinstance(entity, Obstacle):
+        state['type'] = 'Obstacle'
+        state['obstacle_type'] = entity.type
+        state['broken'] = entity.broken
+    return state
+
+def create_entity(state: Dict) -> Optional[Entity]:
+    """Recria uma entidade a partir do estado gerado por serialize_entity."""
+    entity_type = state.get('type')
+    width = state.get('width', 32)
+    height = state.get('height', 32)
+    if entity_type == 'Monster':
+        entity = Monster(state['x'], state['y'], width, height, state.get('data', {}))
+    elif entity_type == 'NPC':
+        entity = NPC(state['x'], state['y'], width, height, state.get('data', {}))
+    elif entity_type == 'Obstacle' and state.get('obstacle_type') in OBSTACLE_TYPES:
+        entity = OBSTACLE_TYPES[state['obstacle_type']](state['x'], state['y'])
+        entity.broken = state.get('broken', False)
+    else:
+        print(f"Tipo de entidade desconhecido no chunk: {entity_type}")
+        return None
+
+    if 'health' in state:
+        entity.health = state['health']
+    return entity
+
+class Chunk:
+    def __init__(self, key: ChunkKey, layers: Dict[str, np.ndarray], initial_entities: List[Dict]):
+        self.key = key
+        self.layers = layers
+        self.initial_entities = initial_entities
+        self.entities: List[Entity] = []
+        self.nbytes = sum(layer.nbytes for layer in layers.values())
+
+class StreamingWorld:
+    """Mundo em chunks carregados sob demanda.
+
+    save_dir é onde ficam os snapshots das entidades dos chunks
+    descartados. Sem save_dir cada sessão usa um diretório temporário
+    próprio, apagado em close(); passe um diretório para manter o estado
+    do mundo entre sessões (ex.: o diretório do save do jogador).
+    """
+    def __init__(self, world_dir: str, save_dir: Optional[str] = None,
+                 memory_budget: int = 32 * 1024 * 1024, load_margin: int = 1,
+                 on_entities_loaded: Optional[Callable[[List[Entity]], None]] = None,
+                 on_entities_unloaded: Optional[Callable[[List[Entity]], None]] = None):
+        with open(os.path.join(world_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        self.world_dir = world_dir
+        self.temporary_save = save_dir is None
+        if self.temporary_save:
+            self.save_dir = tempfile.mkdtemp(prefix='rpg-world-')
+        else:
+            self.save_dir = save_dir
+            os.makedirs(self.save_dir, exist_ok=True)
+        self.name = manifest['name']
+        self.width = manifest['width']
+        self.height = manifest['height']
+        self.tile_size = manifest['tile_size']
+        self.chunk_size = manifest['chunk_size']
+        self.spawn_points = manifest['spawn_points']
+        self.chunks_x = (self.width + self.chunk_size - 1) // self.chunk_size
+        self.chunks_y = (self.height + self.chunk_size - 1) // self.chunk_size
+
+        self.memory_budget = memory_budget
+        self.load_margin = load_margin  # Chunks extras carregados além da área visível
+        self.on_entities_loaded = on_entities_loaded
+        self.on_entities_unloaded = on_entities_unloaded
+
+        # Chunks residentes em ordem LRU (mais antigo primeiro)
+        self.chunks: OrderedDict = OrderedDict()
+        self.resident_bytes = 0
+        # Chunk de cada entidade residente (por id) e as que cruzaram uma borda
+        self.entity_chunks: Dict[int, ChunkKey] = {}
+        self.crossed: Dict[int, Entity] = {}
+        Entity.on_moved = self.entity_moved
+        self.pending: Set[ChunkKey] = set()
+        self.wanted: Set[ChunkKey] = set()
+
+        self.tile_palette: Dict[int, pygame.Surface] = {}
+
+        self._requests: queue.Queue = queue.Queue()
+        self._ready: queue.Queue = queue.Queue()
+        self._running = True
+        self._worker = threading.Thread(target=self._load_worker, daemon=True)
+        self._worker.start()
+
+    def _load_worker(self):
+        """Thread de fundo: lê chunks do disco e os entrega ao thread principal."""
+        while self._running:
+            key = self._requests.get()
+            if key is None:
+                break
+            path = os.path.join(self.world_dir, chunk_filename(*key))
+            try:
+                _, layers, metadata = load_binary_map(path)
+                self._ready.put((key, layers, metadata.get('entities', []), None))
+            except Exception as e:
+                self._ready.put((key, None, None, e))
+
+    def close(self):
+        """Para a thread de carregamento e apaga os snapshots temporários da sessão."""
+        self._running = False
+        self._requests.put(None)
+        self._worker.join(timeout=1.0)
+        if Entity.on_moved == self.entity_moved:
+            Entity.on_moved = None
+        if self.temporary_save:
+            shutil.rmtree(self.save_dir, ignore_errors=True)
+
+    def chunk_key_at(self, world_x: float, world_y: float) -> ChunkKey:
+        chunk_px = self.chunk_size * self.tile_size
+        return int(world_x // chunk_px), int(world_y // chunk_px)
+
+    def update(self, camera_x: float, camera_y: float, view_width: int, view_height: int):
+        """Pede os chunks ao redor da câmera, integra os prontos e descarta os distantes."""
+        chunk_px = self.chunk_size * self.tile_size
+        start_x = int(camera_x // chunk_px) - self.load_margin
+        start_y = int(camera_y // chunk_px) - self.load_margin
+        end_x = int((camera_x + view_width) // chunk_px) + self.load_margin
+        end_y = int((camera_y + view_height) // chunk_px) + self.load_margin
+
+        self.wanted = {(cx, cy)
+                       for cy in range(max(0, start_y), min(self.chunks_y, end_y + 1))
+                       for cx in range(max(0, start_x), min(self.chunks_x, end_x + 1))}
+
+        for key in self.wanted:
+            if key in self.chunks:
+                self.chunks.move_to_end(key)
+            elif key not in self.pending:
+                self.pending.add(key)
+                self._requests.put(key)
+
+        self._integrate_ready_chunks()
+        self._rebucket_entities()
+        self._evict()
+
+    def _integrate_ready_chunks(self):
+        """Finaliza no thread principal os chunks já lidos pela thread de fundo."""
+        while True:
+            try:
+                self._finalize_chunk(*self._ready.get_nowait())
+            except queue.Empty:
+                return
+
+    def _finalize_chunk(self, key: ChunkKey, layers, initial_entities, error):
+        """Torna um chunk lido residente e recria suas entidades."""
+        self.pending.discard(key)
+        if error is not None:
+            print(f"Erro ao carregar chunk {key}: {error}")
+            return
+
+        chunk = Chunk(key, layers, initial_entities)
+        chunk.entities = self._restore_entities(chunk)
+        self.chunks[key] = chunk
+        for entity in chunk.entities:
+            self.entity_chunks[id(entity)] = key
+        self.resident_bytes += chunk.nbytes
+        if chunk.entities and self.on_entities_loaded:
+            self.on_entities_loaded(chunk.entities)
+
+    def _restore_entities(self, chunk: Chunk) -> List[Entity]:
+        """Recria as entidades do chunk a partir do snapshot salvo ou dos dados iniciais."""
+        states = chunk.initial_entities
+        snapshot_path = os.path.join(self.save_dir, entities_filename(*chunk.key))
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, 'r', encoding='utf-8') as f:
+                states = json.load(f)
+
+        entities = []
+        for state in states:
+            entity = create_entity(state)
+            if entity:
+                entities.append(entity)
+        return entities
+
+    def entity_moved(self, entity: Entity):
+        """Chamado por Entity.move: anota a entidade se ela mudou de chunk."""
+        key = self.entity_chunks.get(id(entity))
+        if key is not None and key != self.chunk_key_at(entity.x, entity.y):
+            self.crossed[id(entity)] = entity
+
+    def _rebucket_entities(self):
+        """Move para o chunk novo só as entidades que cruzaram a borda de um chunk.
+
+        Se o chunk de destino não está residente, a entidade sai do jogo e
+        vai para o snapshot desse chunk, voltando quando ele for carregado.
+        """
+        if not self.crossed:
+            return
+        departed: Dict[ChunkKey, List[Entity]] = {}
+        for entity in self.crossed.values():
+            old_key = self.entity_chunks.get(id(entity))
+            new_key = self.chunk_key_at(entity.x, entity.y)
+            if old_key is None or new_key == old_key:
+                continue
+            if not (0 <= new_key[0] < self.chunks_x and 0 <= new_key[1] < self.chunks_y):
+                continue  # Fora do mundo: continua no chunk de onde saiu
+            self.chunks[old_key].entities.remove(entity)
+            if new_key in self.chunks:
+                self.chunks[new_key].entities.append(entity)
+                self.entity_chunks[id(entity)] = new_key
+            else:
+                del self.entity_chunks[id(entity)]
+                departed.setdefault(new_key, []).append(entity)
+        self.crossed.clear()
+
+        for key, entities in departed.items():
+            self._append_to_snapshot(key, entities)
+            if self.on_entities_unloaded:
+                self.on_entities_unloaded(entities)
+
+    def _append_to_snapshot(self, key: ChunkKey, entities: List[Entity]):
+        """Acrescenta entidades ao snapshot de um chunk que não está na memória."""
+        snapshot_path = os.path.join(self.save_dir, entities_filename(*key))
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, 'r', encoding='utf-8') as f:
+                states = json.load(f)
+        else:
+            # Primeiro snapshot do chunk: parte das entidades iniciais dele
+            _, _, metadata = load_binary_map(os.path.join(self.world_dir, chunk_filename(*key)))
+            states = metadata.get('entities', [])
+        states.extend(serialize_entity(entity) for entity in entities)
+        with open(snapshot_path, 'w', encoding='utf-8') as f:
+            json.dump(states, f)
+
+    def _evict(self):
+        """Descarta chunks fora da área desejada, do menos usado, até caber no orçamento."""
+        for key in list(self.chunks.keys()):
+            if self.resident_bytes <= self.memory_budget:
+                break
+            if key not in self.wanted:
+                self.unload_chunk(key)
+
+    def unload_chunk(self, key: ChunkKey):
+        """Serializa as entidades do chunk e o remove da memória."""
+        chunk = self.chunks.pop(key)
+        self.resident_bytes -= chunk.nbytes
+        for entity in chunk.entities:
+            self.entity_chunks.pop(id(entity), None)
+            self.crossed.pop(id(entity), None)
+        snapshot_path = os.path.join(self.save_dir, entities_filename(*key))
+        with open(snapshot_path, 'w', encoding='utf-8') as f:
+            json.dump([serialize_entity(entity) for entity in chunk.entities], f)
+        if chunk.entities and self.on_entities_unloaded:
+            self.on_entities_unloaded(chunk.entities)
+
+    def wait_for_chunks(self, timeout: float = 5.0):
+        """Bloqueia até os chunks pedidos estarem carregados (tela de carregamento)."""
+        deadline = time.perf_counter() + timeout
+        while self.pending:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            try:
+                self._finalize_chunk(*self._ready.get(timeout=remaining))
+            except queue.Empty:
+                return
+
+    def _locate(self, x: int, y: int):
+        """Retorna o chunk residente e as coordenadas locais de um tile."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None, 0, 0
+        chunk = self.chunks.get((x // self.chunk_size, y // self.chunk_size))
+        return chunk, x % self.chunk_size, y % self.chunk_size
+
+    def is_solid(self, x: int, y: int) -> bool:
+        """Tiles fora do mapa ou em chunks não carregados contam como sólidos."""
+        chunk, local_x, local_y = self._locate(x, y)
+        if chunk is None:
+            return True
+        return bool(chunk.layers['collision'][local_y, local_x])
+
+    def get_tile_id(self, layer: str, x: int, y: int) -> Optional[int]:
+        chunk, local_x, local_y = self._locate(x, y)
+        if chunk is None:
+            return None
+        return int(chunk.layers[layer][local_y, local_x])
+
+    @property
+    def entities(self) -> List[Entity]:
+        """Entidades de todos os chunks residentes."""
+        return [entity for chunk in self.chunks.values() for entity in chunk.entities]
+
+    def _tile_surface(self, tile_id: int) -> pygame.Surface:
+        """Superfície de cor sólida para um id de tile (paleta de placeholder)."""
+        if tile_id not in self.tile_palette:
+            surface = pygame.Surface((self.tile_size, self.tile_size))
+            colors = {0: (34, 139, 34), 1: (128, 128, 128), 2: (139, 90, 43), 3: (30, 90, 200)}
+            surface.fill(colors.get(tile_id, (80, 80, 80)))
+            self.tile_palette[tile_id] = surface
+        return self.tile_palette[tile_id]
+
+    def draw(self, screen: pygame.Surface, camera_x: int, camera_y: int):
+        """Desenha a camada de chão dos chunks residentes visíveis."""
+        start_x = max(0, camera_x // self.tile_size)
+        start_y = max(0, camera_y // self.tile_size)
+        end_x = min(self.width, (camera_x + screen.get_width()) // self.tile_size + 1)
+        end_y = min(self.height, (camera_y + screen.get_height()) // self.tile_size + 1)
+
+        for y in range(start_y, end_y):
+            for x in range(start_x, end_x):
+                tile_id = self.get_tile_id('ground', x, y)
+                if tile_id is not None:
+                    screen.blit(self._tile_surface(tile_id),
+                                (x * self.tile_size - camera_x, y * self.tile_size - camera_y))
+
+if __name__ == '__main__':
+    size = int(sys.argv[3]) if len(sys.argv) > 3 else 32
+    manifest = split_world(sys.argv[1], sys.argv[2], size)
+    print(f"{sys.argv[1]} -> {sys.argv[2]} ({manifest['width']}x{manifest['height']}, chunks de {size})")
@@ -11,6 +11,7 @@ class Quest:
         self.active = False
         self.completed = False
         self.failed = False
+        self.graph = None  # QuestGraph compartilhado, quando as quests foram compiladas
     
     def add_objective(self, objective_id, description, required_amount, current_amount=0):
         self.objectives[objective_id] = {
@@ -43,14 +44,20 @@ class Quest:
     def can_start(self, player):
         if player.level < self.level_requirement:
             return False
+        if self.graph:
+            return self.graph.prerequisites_met(self.id)
         return all(quest.completed for quest in self.prerequisites)
     
     def start(self):
         self.active = True
+        if self.graph:
+            self.graph.start(self.id)
     
     def complete(self):
         self.active = False
         self.completed = True
+        if self.graph:
+            self.graph.complete(self.id)
     
     def fail(self):
         self.active = False
@@ -60,6 +67,8 @@ class Quest:
         self.active = False
         self.completed = False
         self.failed = False
+        if self.graph:
+            self.graph.reset(self.id)
         for objective in self.objectives.values():
             objective['current'] = 0
             objective['completed'] = False
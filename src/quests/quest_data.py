@@ -1,4 +1,5 @@
 from .quest import Quest
+from .quest_graph import QuestGraph
 
 def create_initial_quests():
     quests = {}
@@ -43,4 +44,15 @@ def create_initial_quests():
     dungeon.prerequisites.extend([rats, herbs])
     quests[dungeon.id] = dungeon
     
+    compile_quest_graph(quests)
     return quests
+
+def compile_quest_graph(quests, player_level=1):
+    graph = QuestGraph({quest.id: [required.id for required in quest.prerequisites]
+                        for quest in quests.values()},
+                       {quest.id: quest.level_requirement for quest in quests.values()},
+                       player_level,
+                       completed=[quest.id for quest in quests.values() if quest.completed])
+    for quest in quests.values():
+        quest.graph = graph
+    return graph
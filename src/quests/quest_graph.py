@@ -0,0 +1,154 @@
+import heapq
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+class QuestGraph:
+    """Grafo de pré-requisitos das quests, compilado uma vez na carga.
+
+    Calcula a ordem topológica, detecta ciclos e pré-requisitos
+    desconhecidos, e mantém o conjunto de quests disponíveis (pré-requisitos
+    completos, nível suficiente, ainda não iniciadas). O conjunto só muda
+    quando uma quest é iniciada/completada ou o nível do jogador muda, então
+    is_available() é O(1).
+    """
+    def __init__(self, prerequisites: Dict[str, Iterable[str]],
+                 level_requirements: Optional[Dict[str, int]] = None,
+                 player_level: int = 1, completed: Iterable[str] = (),
+                 started: Iterable[str] = ()):
+        self.prerequisites = {quest_id: tuple(required)
+                              for quest_id, required in prerequisites.items()}
+        self.level_requirements = dict(level_requirements or {})
+        self.player_level = player_level
+        self.errors: List[str] = []
+
+        # Arestas pré-requisito -> dependentes
+        self.dependents: Dict[str, List[str]] = {quest_id: [] for quest_id in self.prerequisites}
+        for quest_id, required in self.prerequisites.items():
+            for prerequisite in required:
+                if prerequisite in self.dependents:
+                    self.dependents[prerequisite].append(quest_id)
+                else:
+                    self.errors.append(f"{quest_id}: pré-requisito desconhecido '{prerequisite}'")
+
+        self.order = self._topological_order()
+        # Quests fora da ordem estão em um ciclo ou dependem de um: nunca ficam disponíveis
+        self.blocked: Set[str] = set(self.prerequisites) - set(self.order)
+        for quest_id in self._cycle_members():
+            self.errors.append(f"{quest_id}: pré-requisitos em ciclo")
+        for error in self.errors:
+            print(f"Erro no grafo de quests: {error}")
+
+        self.completed: Set[str] = set()
+        self.started: Set[str] = set(started)
+        self.available: Set[str] = set()
+        # Quests com pré-requisitos completos esperando o nível do jogador
+        self.waiting: Dict[int, Set[str]] = {}
+        self.waiting_levels: List[int] = []
+        # Quantos pré-requisitos de cada quest ainda faltam completar
+        self.missing: Dict[str, int] = {quest_id: len(required)
+                                        for quest_id, required in self.prerequisites.items()}
+
+        completed = set(completed)
+        for quest_id in self.order:
+            if quest_id in completed:
+                self.complete(quest_id)
+        for quest_id in self.order:
+            if self.missing[quest_id] == 0:
+                self._unlock(quest_id)
+
+    def _topological_order(self) -> List[str]:
+        """Algoritmo de Kahn; pré-requisitos desconhecidos nunca são satisfeitos."""
+        indegree = {quest_id: len(required) for quest_id, required in self.prerequisites.items()}
+        queue = deque(quest_id for quest_id, degree in indegree.items() if degree == 0)
+        order = []
+        while queue:
+            quest_id = queue.popleft()
+            order.append(quest_id)
+            for dependent in self.dependents[quest_id]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    queue.append(dependent)
+        return order
+
+    def _cycle_members(self) -> List[str]:
+        """Quests bloqueadas que fazem parte de um ciclo (não só dependem de um)."""
+        members = []
+        for quest_id in self.blocked:
+            # Busca se quest_id alcança a si mesma pelos dependentes bloqueados
+            stack = [dependent for dependent in self.dependents[quest_id] if dependent in self.blocked]
+            seen = set()
+            while stack:
+                current = stack.pop()
+                if current == quest_id:
+                    members.append(quest_id)
+                    break
+                if current in seen:
+                    continue
+                seen.add(current)
+                stack.extend(dependent for dependent in self.dependents[current]
+                             if dependent in self.blocked)
+        return sorted(members)
+
+    def _unlock(self, quest_id: str):
+        """Pré-requisitos completos: disponível agora ou quando o nível for suficiente."""
+        if quest_id in self.completed or quest_id in self.started or quest_id in self.blocked:
+            return
+        level = self.level_requirements.get(quest_id, 1)
+        if level <= self.player_level:
+            self.available.add(quest_id)
+        else:
+            if level not in self.waiting:
+                self.waiting[level] = set()
+                heapq.heappush(self.waiting_levels, level)
+            self.waiting[level].add(quest_id)
+
+    def is_available(self, quest_id: str) -> bool:
+        return quest_id in self.available
+
+    def prerequisites_met(self, quest_id: str) -> bool:
+        return self.missing.get(quest_id) == 0 and quest_id not in self.blocked
+
+    def start(self, quest_id: str):
+        self.available.discard(quest_id)
+        self.started.add(quest_id)
+
+    def complete(self, quest_id: str) -> List[str]:
+        """Marca a quest como completa. Retorna as quests que ficaram disponíveis."""
+        if quest_id in self.completed or quest_id not in self.prerequisites:
+            return []
+        self.completed.add(quest_id)
+        self.available.discard(quest_id)
+        self.started.discard(quest_id)
+        unlocked = []
+        for dependent in self.dependents[quest_id]:
+            self.missing[dependent] -= 1
+            if self.missing[dependent] == 0:
+                self._unlock(dependent)
+                if dependent in self.available:
+                    unlocked.append(dependent)
+        return unlocked
+
+    def reset(self, quest_id: str):
+        """Volta a quest para não iniciada, desfazendo o efeito nos dependentes."""
+        if quest_id in self.completed:
+            self.completed.discard(quest_id)
+            for dependent in self.dependents[quest_id]:
+                self.missing[dependent] += 1
+                self.available.discard(dependent)
+                waiting = self.waiting.get(self.level_requirements.get(dependent, 1))
+                if waiting:
+                    waiting.discard(dependent)
+        self.started.discard(quest_id)
+        if self.missing.get(quest_id) == 0:
+            self._unlock(quest_id)
+
+    def set_level(self, level: int) -> List[str]:
+        """Atualiza o nível do jogador. Retorna as quests que ficaram disponíveis."""
+        self.player_level = level
+        unlocked = []
+        while self.waiting_levels and self.waiting_levels[0] <= level:
+            for quest_id in self.waiting.pop(heapq.heappop(self.waiting_levels)):
+                if quest_id not in self.completed and quest_id not in self.started:
+                    self.available.add(quest_id)
+                    unlocked.append(quest_id)
+        return unlocked
@@ -0,0 +1,199 @@
+"""
+Pacote de assets pré-decodificados (.pack).
+
+Layout do arquivo (little-endian):
+    cabeçalho  magic 'RPGA', versão, tamanho do índice
+    índice     JSON utf-8: para cada asset, tipo, offset, tamanho, dimensões,
+               formato de pixel, tamanho/mtime do arquivo de origem e o hash
+               (sha1) do conteúdo de origem
+    dados      pixels já decodificados (pygame.image.tobytes) e bytes crus
+               das fontes, alinhados em 64 bytes
+
+As imagens são gravadas em 'BGRA', o mesmo layout de uma superfície após
+convert_alpha() na maioria das telas, então o carregamento só precisa
+mapear o arquivo e chamar pygame.image.frombuffer, sem decodificar nada.
+
+Uso:
+    python -m src.systems.asset_pack [assets] [saida.pack]
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+from typing import Dict, Optional
+import pygame
+
+MAGIC = b'RPGA'
+VERSION = 1
+PACK_FILENAME = 'assets.pack'
+PIXEL_FORMAT = 'BGRA'
+ALIGNMENT = 64
+
+HEADER = struct.Struct('<4sHHQ')
+
+# Pastas empacotadas e o tipo de asset de cada uma
+PACKED_DIRS = {
+    'images': ('image', ('.png', '.jpg', '.jpeg', '.bmp')),
+    'fonts': ('font', ('.ttf', '.otf'))
+}
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def _file_hash(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def _source_stat(path: str) -> Dict:
+    stat = os.stat(path)
+    return {'source_size': stat.st_size, 'source_mtime': stat.st_mtime_ns}
+
+def read_index(filename: str) -> Optional[Dict]:
+    """Lê apenas o índice de um pacote. Retorna None se o arquivo não é válido."""
+    try:
+        with open(filename, 'rb') as f:
+            magic, version, _, index_size = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                return None
+            return json.loads(f.read(index_size).decode('utf-8'))
+    except (OSError, ValueError, struct.error):
+        return None
+
+def build_pack(assets_dir: str, out_path: Optional[str] = None) -> str:
+    """Decodifica imagens e lê fontes de assets_dir e grava um pacote.
+
+    Entradas cujo hash de origem não mudou são copiadas do pacote anterior
+    sem decodificar a imagem de novo.
+    """
+    out_path = out_path or os.path.join(assets_dir, PACK_FILENAME)
+    previous_index = read_index(out_path) or {}
+    previous_data = {}
+    if previous_index:
+        with open(out_path, 'rb') as f:
+            for key, entry in previous_index.items():
+                f.seek(entry['offset'])
+                previous_data[key] = f.read(entry['size'])
+
+    entries = {}
+    blobs = {}
+    for folder, (kind, extensions) in PACKED_DIRS.items():
+        folder_path = os.path.join(assets_dir, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        for name in sorted(os.listdir(folder_path)):
+            if not name.lower().endswith(extensions):
+                continue
+            source = os.path.join(folder_path, name)
+            key = f"{kind}/{name}"
+            entry = {'kind': kind, 'name': name, 'source': f"{folder}/{name}",
+                     'hash': _file_hash(source)}
+            entry.update(_source_stat(source))
+
+            previous = previous_index.get(key)
+            if previous and previous['hash'] == entry['hash']:
+                for field in ('width', 'height', 'format'):
+                    if field in previous:
+                        entry[field] = previous[field]
+                blobs[key] = previous_data[key]
+            elif kind == 'image':
+                try:
+                    image = pygame.image.load(source)
+                except Exception as e:
+                    print(f"Erro ao decodificar {source}: {e}")
+                    continue
+                entry['width'], entry['height'] = image.get_size()
+                entry['format'] = PIXEL_FORMAT
+                blobs[key] = pygame.image.tobytes(image, PIXEL_FORMAT)
+            else:
+                with open(source, 'rb') as f:
+                    blobs[key] = f.read()
+            entries[key] = entry
+
+    # O índice guarda offsets absolutos, que dependem do tamanho do próprio
+    # índice; recalcula até estabilizar (normalmente duas passadas)
+    index_size = 0
+    while True:
+        offset = HEADER.size + index_size
+        for key, entry in entries.items():
+            offset = _align(offset)
+            entry['offset'] = offset
+            entry['size'] = len(blobs[key])
+            offset += entry['size']
+        index = json.dumps(entries).encode('utf-8')
+        if len(index) == index_size:
+            break
+        index_size = len(index)
+
+    with open(out_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(index)))
+        f.write(index)
+        for key, entry in entries.items():
+            f.write(b'\0' * (entry['offset'] - f.tell()))
+            f.write(blobs[key])
+    return out_path
+
+class AssetPack:
+    """Pacote de assets mapeado em memória.
+
+    Cada entrada é validada contra o arquivo de origem antes do uso: se o
+    tamanho e o mtime batem, a entrada vale; se não, o hash do conteúdo
+    decide. Entradas desatualizadas retornam None e o chamador volta a
+    carregar do disco.
+    """
+    def __init__(self, filename: str, assets_dir: str):
+        self.filename = filename
+        self.assets_dir = assets_dir
+        self.index = read_index(filename)
+        if self.index is None:
+            raise ValueError(f"{filename} não é um pacote de assets válido")
+        with open(filename, 'rb') as f:
+            self.mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        self.validated: Dict[str, bool] = {}
+
+    def is_valid(self, key: str) -> bool:
+        """Confere se a entrada ainda corresponde ao arquivo de origem."""
+        if key not in self.validated:
+            entry = self.index.get(key)
+            valid = False
+            if entry:
+                source = os.path.join(self.assets_dir, entry['source'])
+                try:
+                    stat = _source_stat(source)
+                    valid = (stat['source_size'] == entry['source_size'] and
+                             (stat['source_mtime'] == entry['source_mtime'] or
+                              _file_hash(source) == entry['hash']))
+                except OSError:
+                    valid = False
+            self.validated[key] = valid
+        return self.validated[key]
+
+    def _data(self, entry: Dict) -> memoryview:
+        return memoryview(self.mapped)[entry['offset']:entry['offset'] + entry['size']]
+
+    def get_image(self, name: str) -> Optional[pygame.Surface]:
+        """Cria a superfície direto sobre os bytes mapeados, sem decodificar."""
+        key = f"image/{name}"
+        if not self.is_valid(key):
+            return None
+        entry = self.index[key]
+        return pygame.image.frombuffer(self._data(entry), (entry['width'], entry['height']),
+                                       entry['format'])
+
+    def get_font_data(self, name: str) -> Optional[memoryview]:
+        """Bytes crus de uma fonte, para pygame.font.Font(io.BytesIO(...), size)."""
+        key = f"font/{name}"
+        if not self.is_valid(key):
+            return None
+        return self._data(self.index[key])
+
+    def close(self):
+        self.mapped.close()
+
+if __name__ == '__main__':
+    assets_dir = sys.argv[1] if len(sys.argv) > 1 else 'assets'
+    out_path = sys.argv[2] if len(sys.argv) > 2 else None
+    pygame.init()
+    print(f"{assets_dir} -> {build_pack(assets_dir, out_path)}")
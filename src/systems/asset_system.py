@@ -1,28 +1,299 @@
 import pygame
 import os
+import io
+import json
+import time
+import queue
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from src.systems.asset_pack import AssetPack, PACK_FILENAME
+from src.systems.residency import ResidencyManager, surface_bytes, sound_bytes, file_bytes
+
+# Sprites carregados por caminho (Item/Entity) compartilhados entre instâncias.
+# As referências são fracas: o sprite sai da memória junto com o último dono.
+_shared_sprites = weakref.WeakValueDictionary()
+_shared_fonts = {}
+
+def load_shared_sprite(path):
+    """Carrega um sprite uma única vez por caminho e o compartilha.
+
+    Imagens de assets/images vêm do AssetSystem ativo (AssetSystem.shared),
+    onde o pré-carregamento da cena já as deixou decodificadas.
+    """
+    assets = AssetSystem.shared
+    name = assets.image_name(path) if assets else None
+    if name:
+        return assets.load_image(name)
+    sprite = _shared_sprites.get(path)
+    if sprite is None:
+        sprite = pygame.image.load(path).convert_alpha()
+        _shared_sprites[path] = sprite
+    return sprite
+
+def load_shared_font(name, size):
+    """Fonte de assets/fonts (ou a padrão do pygame com name None), compartilhada.
+
+    Com um AssetSystem ativo a fonte vem do cache dele, preenchido pelo
+    pré-carregamento da cena (fontes listadas no manifesto).
+    """
+    if AssetSystem.shared:
+        return AssetSystem.shared.load_font(name, size)
+    font = _shared_fonts.get((name, size))
+    if font is None:
+        path = os.path.join('assets', 'fonts', name) if name else None
+        font = _shared_fonts[(name, size)] = pygame.font.Font(path, size)
+    return font
+
+def font_key(name, size):
+    return f"{name or 'default'}_{size}"
+
+def default_font_path():
+    return os.path.join(os.path.dirname(pygame.font.__file__), pygame.font.get_default_font())
 
 class AssetSystem:
-    def __init__(self):
+    # Instância usada por load_shared_sprite/load_shared_font; definida pelo Game
+    shared = None
+    
+    def __init__(self, memory_budget=64 * 1024 * 1024):
         self.images = {}
         self.sounds = {}
         self.fonts = {}
         self.base_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'assets')
-    
-    def load_image(self, name):
-        if name not in self.images:
-            path = os.path.join(self.base_path, 'images', name)
-            self.images[name] = pygame.image.load(path).convert_alpha()
-        return self.images[name]
-    
-    def load_sound(self, name):
-        if name not in self.sounds:
+        self.manifest = {}
+        self.pack = None
+        self.residency = ResidencyManager(memory_budget, on_evict=self._on_evict)
+        self.load_pack()
+
+    def load_pack(self, path=None):
+        """Mapeia o pacote pré-decodificado, se existir (python -m src.systems.asset_pack)."""
+        path = path or os.path.join(self.base_path, PACK_FILENAME)
+        if not os.path.exists(path):
+            return False
+        try:
+            self.pack = AssetPack(path, self.base_path)
+        except Exception as e:
+            print(f"Erro ao abrir pacote de assets {path}: {e}")
+            self.pack = None
+        return self.pack is not None
+
+    def _cache_for(self, kind):
+        return {'image': self.images, 'sound': self.sounds, 'font': self.fonts}[kind]
+
+    def _on_evict(self, key):
+        kind, name = key
+        self._cache_for(kind).pop(name, None)
+
+    def _lookup(self, kind, name, owner):
+        """Retorna o asset em cache (registrando o uso) ou None."""
+        asset = self._cache_for(kind).get(name)
+        if asset is not None:
+            self.residency.touch((kind, name))
+            if owner is not None:
+                self.residency.acquire(owner, (kind, name))
+        return asset
+
+    def store(self, kind, name, asset, size, owner=None):
+        """Guarda um asset carregado e registra seu tamanho na residência."""
+        self._cache_for(kind)[name] = asset
+        self.residency.add((kind, name), size, owner)
+        return asset
+
+    def load_image(self, name, owner=None):
+        image = self._lookup('image', name, owner)
+        if image is None:
+            image = self.pack.get_image(name) if self.pack else None
+            if image is None:
+                path = os.path.join(self.base_path, 'images', name)
+                image = pygame.image.load(path).convert_alpha()
+            self.store('image', name, image, surface_bytes(image), owner)
+        return image
+
+    def image_name(self, path):
+        """Nome da imagem relativo a assets/images, ou None se o caminho estiver fora."""
+        images_dir = os.path.join(self.base_path, 'images')
+        relative = os.path.relpath(os.path.abspath(path), images_dir)
+        if relative.startswith(os.pardir):
+            return None
+        return relative.replace(os.sep, '/')
+
+    def load_sound(self, name, owner=None):
+        sound = self._lookup('sound', name, owner)
+        if sound is None:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
             path = os.path.join(self.base_path, 'sounds', name)
-            self.sounds[name] = pygame.mixer.Sound(path)
-        return self.sounds[name]
-    
-    def load_font(self, name, size):
-        key = f"{name}_{size}"
-        if key not in self.fonts:
-            path = os.path.join(self.base_path, 'fonts', name)
-            self.fonts[key] = pygame.font.Font(path, size)
-        return self.fonts[key]
+            sound = pygame.mixer.Sound(path)
+            self.store('sound', name, sound, sound_bytes(sound), owner)
+        return sound
+
+    def load_font(self, name, size, owner=None):
+        """Fonte de assets/fonts; name None é a fonte padrão do pygame."""
+        key = font_key(name, size)
+        font = self._lookup('font', key, owner)
+        if font is None:
+            data = self.pack.get_font_data(name) if self.pack and name else None
+            if name is None:
+                font = pygame.font.Font(None, size)
+                font_size = file_bytes(default_font_path())
+            elif data is not None:
+                font = pygame.font.Font(io.BytesIO(data), size)
+                font_size = len(data)
+            else:
+                path = os.path.join(self.base_path, 'fonts', name)
+                font = pygame.font.Font(path, size)
+                font_size = file_bytes(path)
+            self.store('font', key, font, font_size, owner)
+        return font
+
+    def release(self, owner):
+        """Libera as referências de uma cena/mapa; o orçamento decide o que sai."""
+        self.residency.release(owner)
+
+    def get_stats(self):
+        """Estatísticas de residência, incluindo os sprites compartilhados."""
+        stats = self.residency.get_stats()
+        sprites = list(_shared_sprites.values())
+        stats['shared_sprites'] = len(sprites)
+        stats['shared_sprite_bytes'] = sum(surface_bytes(sprite) for sprite in sprites)
+        return stats
+
+    def load_manifest(self, path=None):
+        """Carrega o manifesto de assets por cena/mapa."""
+        path = path or os.path.join(self.base_path, 'data', 'asset_manifest.json')
+        with open(path, 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        return self.manifest
+
+    def preload(self, scene, max_workers=4):
+        """Inicia o pré-carregamento assíncrono dos assets de uma cena.
+
+        Os assets ficam referenciados pela cena até release(scene).
+        """
+        if not self.manifest:
+            self.load_manifest()
+        preloader = AssetPreloader(self, max_workers, owner=scene)
+        preloader.start(self.manifest.get(scene, {}))
+        return preloader
+
+class AssetPreloader:
+    """Pré-carrega assets de um manifesto.
+
+    A leitura e a decodificação dos arquivos rodam em um pool de threads; a
+    finalização que precisa do thread principal (convert_alpha, criação de
+    Sound/Font) acontece em step(), em lotes limitados por um orçamento de
+    tempo, para que uma tela de carregamento continue respondendo.
+    """
+    def __init__(self, asset_system, max_workers=4, owner=None):
+        self.asset_system = asset_system
+        self.owner = owner
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='asset-preload')
+        self.decoded = queue.Queue()
+        self.total = 0
+        self.finished = 0
+        self.errors = []
+
+    def start(self, manifest_entry):
+        """Agenda a decodificação de todos os assets ainda não carregados."""
+        base_path = self.asset_system.base_path
+        pack = self.asset_system.pack
+        residency = self.asset_system.residency
+        jobs = []
+        for name in manifest_entry.get('images', []):
+            if name in self.asset_system.images:
+                residency.acquire(self.owner, ('image', name))
+            else:
+                if pack and pack.is_valid(f"image/{name}"):
+                    jobs.append(('packed_image', name, None, None))
+                else:
+                    jobs.append(('image', name, os.path.join(base_path, 'images', name), None))
+        for name in manifest_entry.get('sounds', []):
+            if name in self.asset_system.sounds:
+                residency.acquire(self.owner, ('sound', name))
+            else:
+                jobs.append(('sound', name, os.path.join(base_path, 'sounds', name), None))
+        for name, size in manifest_entry.get('fonts', []):
+            if font_key(name, size) in self.asset_system.fonts:
+                residency.acquire(self.owner, ('font', font_key(name, size)))
+            else:
+                # A fonte padrão do pygame (name None) também não tem arquivo a decodificar
+                if name is None or (pack and pack.is_valid(f"font/{name}")):
+                    jobs.append(('packed_font', name, None, size))
+                else:
+                    jobs.append(('font', name, os.path.join(base_path, 'fonts', name), size))
+
+        self.total = len(jobs)
+        for job in jobs:
+            # Assets do pacote já estão decodificados: só falta criar o objeto
+            if job[0].startswith('packed_'):
+                self.decoded.put((job[0], job[1], job[3], None, None))
+                continue
+            future = self.executor.submit(self._decode, *job)
+            future.add_done_callback(self._on_decoded)
+
+    def _on_decoded(self, future):
+        # Jobs cancelados por cancel() não têm resultado
+        if not future.cancelled():
+            self.decoded.put(future.result())
+
+    def _decode(self, kind, name, path, size):
+        """Executado no pool: lê e decodifica o arquivo sem tocar no display."""
+        try:
+            if kind == 'image':
+                return kind, name, size, pygame.image.load(path), None
+            with open(path, 'rb') as f:
+                return kind, name, size, f.read(), None
+        except Exception as e:
+            return kind, name, size, None, e
+
+    def step(self, budget_ms=4.0):
+        """Finaliza assets decodificados até esgotar o orçamento. Retorna True ao terminar."""
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        while self.finished < self.total and time.perf_counter() < deadline:
+            try:
+                kind, name, size, payload, error = self.decoded.get_nowait()
+            except queue.Empty:
+                break
+            self.finished += 1
+            if error is not None:
+                self.errors.append((name, error))
+                print(f"Erro ao pré-carregar {name}: {error}")
+                continue
+
+            assets = self.asset_system
+            try:
+                if kind == 'packed_image':
+                    assets.load_image(name, self.owner)
+                elif kind == 'packed_font':
+                    assets.load_font(name, size, self.owner)
+                elif kind == 'image':
+                    image = payload.convert_alpha()
+                    assets.store('image', name, image, surface_bytes(image), self.owner)
+                elif kind == 'sound':
+                    if not pygame.mixer.get_init():
+                        pygame.mixer.init()
+                    sound = pygame.mixer.Sound(file=io.BytesIO(payload))
+                    assets.store('sound', name, sound, sound_bytes(sound), self.owner)
+                else:
+                    font = pygame.font.Font(io.BytesIO(payload), size)
+                    assets.store('font', f"{name}_{size}", font, len(payload), self.owner)
+            except Exception as e:
+                self.errors.append((name, e))
+                print(f"Erro ao finalizar {name}: {e}")
+
+        if self.done:
+            self.executor.shutdown(wait=False)
+        return self.done
+
+    def cancel(self):
+        """Descarta o que ainda não foi decodificado e encerra o pool de threads."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def done(self):
+        return self.finished >= self.total
+
+    def progress(self):
+        """Fração dos assets já finalizados (0.0 a 1.0)."""
+        if self.total == 0:
+            return 1.0
+        return self.finished / self.total
@@ -0,0 +1,289 @@
+"""
+Simulador de balanceamento: duelos sem interface entre o jogador e os monstros.
+
+Cada configuração (nível do jogador x equipamentos x tipo de monstro) roda
+N duelos com as regras do jogo (Combat.execute_turn, Entity.take_damage,
+Player.level_up e os stats dos equipamentos de items.json). Os duelos são
+divididos em lotes com semente própria e distribuídos em um pool de
+processos, então o resultado é o mesmo para qualquer número de processos e
+o tempo cai com o número de núcleos.
+
+O relatório (CSV ou JSON, pela extensão do arquivo) traz, por configuração,
+a taxa de vitória, a distribuição do tempo para matar (time-to-kill), a
+experiência/ouro por minuto de combate e os stats dos equipamentos que não
+chegam ao combate (ignored_stats). O dano das armas entra como força
+(Equipment.STAT_TARGETS).
+
+Uso:
+    python -m src.systems.balance_simulator [--levels 1 5 10] [--duels 1000]
+        [--weapons wooden_sword iron_sword] [--armor none chainmail]
+        [--workers 4] [--output balance.csv]
+"""
+
+import os
+import csv
+import glob
+import json
+import time
+import random
+import argparse
+import itertools
+import multiprocessing
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from src.data.registry import DataRegistry
+from src.entities.monster import Monster, monster_data_from_map
+from src.entities.player import Player
+from src.entities.stats import is_stat
+from src.items.equipment import Equipment
+from src.systems.combat_system import Combat
+
+# Duelos que passam disso terminam empatados (contam como derrota)
+MAX_TURNS = 1000
+
+class SimulatedPlayer(Player):
+    """Jogador do simulador: acumula a experiência sem subir de nível no meio dos duelos."""
+    def __init__(self):
+        super().__init__(0, 0, 32, 32)
+        self.earned_exp = 0
+        self.ignored_stats = set()  # Stats dos equipamentos sem efeito no jogador
+
+    def gain_exp(self, amount: int):
+        self.earned_exp += amount
+
+def load_monster_types(maps_dir: str = os.path.join('assets', 'maps')) -> Dict[str, Dict]:
+    """Definições de monstros de todos os mapas, por id."""
+    monsters = {}
+    for path in sorted(glob.glob(os.path.join(maps_dir, '*.json'))):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('monsters', [])
+        except Exception as e:
+            print(f"Erro ao carregar monstros de {path}: {e}")
+            continue
+        for entry in entries:
+            monsters[entry['id']] = monster_data_from_map(entry)
+    return monsters
+
+# Estado de cada processo do pool, criado uma vez em _init_worker
+_registry: Optional[DataRegistry] = None
+_monster_types: Dict[str, Dict] = {}
+_players: Dict[tuple, SimulatedPlayer] = {}
+_monsters: Dict[str, Monster] = {}
+
+def _init_worker(data_dir: Optional[str], monster_types: Dict[str, Dict]):
+    global _registry, _monster_types
+    _registry = DataRegistry(data_dir, cache_dir=None)
+    _monster_types = monster_types
+    _players.clear()
+    _monsters.clear()
+
+def _get_player(level: int, loadout: Tuple[str, ...]) -> SimulatedPlayer:
+    """Jogador no nível e com os equipamentos pedidos (reaproveitado entre lotes)."""
+    key = (level, loadout)
+    player = _players.get(key)
+    if player is None:
+        player = SimulatedPlayer()
+        for _ in range(level - 1):
+            player.level_up()
+        for item_id in loadout:
+            item = _registry.create_item(item_id)
+            player.equip_item(item.slot, item)
+            player.ignored_stats.update(
+                stat for stat in item.stats
+                if not is_stat(player, Equipment.STAT_TARGETS.get(stat, stat)))
+        _players[key] = player
+    return player
+
+def _get_monster(monster_id: str) -> Monster:
+    monster = _monsters.get(monster_id)
+    if monster is None:
+        monster = _monsters[monster_id] = Monster(0, 0, 32, 32, _monster_types[monster_id])
+    return monster
+
+def run_duels(task: tuple) -> tuple:
+    """Roda um lote de duelos de uma configuração. Retorna (configuração, estatísticas)."""
+    level, loadout, monster_id, seed, duels = task
+    random.seed(seed)
+    player = _get_player(level, loadout)
+    monster = _get_monster(monster_id)
+    wins = 0
+    turns_total = 0
+    kill_turns: Counter = Counter()
+    player.earned_exp = 0
+    player.gold = 0
+
+    for _ in range(duels):
+        player.health = player.max_health
+        monster.health = monster.max_health
+        # O jogador ataca primeiro; os papéis alternam a cada turno
+        combat = Combat(player, monster)
+        turns = 0
+        while not combat.is_finished() and turns < MAX_TURNS:
+            combat.execute_turn()
+            turns += 1
+        turns_total += turns
+        if not monster.is_alive():
+            wins += 1
+            kill_turns[turns] += 1
+
+    stats = {
+        'duels': duels,
+        'wins': wins,
+        'turns': turns_total,
+        'kill_turns': dict(kill_turns),
+        'exp': player.earned_exp,
+        'gold': player.gold,
+        'ignored_stats': sorted(player.ignored_stats),
+    }
+    return (level, loadout, monster_id), stats
+
+def _percentile(histogram: Counter, fraction: float) -> float:
+    """Percentil de uma distribuição guardada como valor -> ocorrências."""
+    total = sum(histogram.values())
+    if not total:
+        return 0.0
+    target = fraction * total
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= target:
+            return float(value)
+    return float(max(histogram))
+
+class BalanceSimulator:
+    """Divide as configurações em lotes, roda no pool e agrega os resultados."""
+    def __init__(self, levels: List[int], loadouts: List[Tuple[str, ...]], monsters: List[str],
+                 duels: int = 1000, batch_size: int = 500, seed: int = 0,
+                 workers: Optional[int] = None, data_dir: Optional[str] = None,
+                 monster_types: Optional[Dict[str, Dict]] = None):
+        self.levels = levels
+        self.loadouts = loadouts
+        self.monsters = monsters
+        self.duels = duels
+        self.batch_size = batch_size
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.data_dir = data_dir
+        self.monster_types = monster_types if monster_types is not None else load_monster_types()
+        self.turn_duration = Combat(None, None).turn_duration
+        self.elapsed = 0.0
+
+    def tasks(self) -> List[tuple]:
+        """Lotes de duelos; a semente depende só da posição do lote, não do processo."""
+        tasks = []
+        configs = itertools.product(self.levels, self.loadouts, self.monsters)
+        for config_index, (level, loadout, monster_id) in enumerate(configs):
+            for start in range(0, self.duels, self.batch_size):
+                seed = (self.seed * 1_000_003 + config_index) * 1_000_003 + start
+                tasks.append((level, loadout, monster_id, seed,
+                              min(self.batch_size, self.duels - start)))
+        return tasks
+
+    def run(self) -> List[Dict]:
+        """Roda todos os duelos e retorna uma linha de relatório por configuração."""
+        start = time.perf_counter()
+        totals: Dict[tuple, Dict] = {}
+        initargs = (self.data_dir, self.monster_types)
+        if self.workers == 1:
+            _init_worker(*initargs)
+            results = map(run_duels, self.tasks())
+            self._merge(totals, results)
+        else:
+            with multiprocessing.Pool(self.workers, _init_worker, initargs) as pool:
+                self._merge(totals, pool.imap_unordered(run_duels, self.tasks()))
+        self.elapsed = time.perf_counter() - start
+        return [self._report_row(config, totals[config])
+                for config in itertools.product(self.levels, self.loadouts, self.monsters)]
+
+    def _merge(self, totals: Dict[tuple, Dict], results):
+        for config, stats in results:
+            total = totals.setdefault(config, {'duels': 0, 'wins': 0, 'turns': 0,
+                                               'kill_turns': Counter(), 'exp': 0, 'gold': 0,
+                                               'ignored_stats': set()})
+            for key in ('duels', 'wins', 'turns', 'exp', 'gold'):
+                total[key] += stats[key]
+            total['kill_turns'].update(stats['kill_turns'])
+            total['ignored_stats'].update(stats['ignored_stats'])
+
+    def _report_row(self, config: tuple, total: Dict) -> Dict:
+        level, loadout, monster_id = config
+        kill_turns = total['kill_turns']
+        wins = total['wins']
+        minutes = total['turns'] * self.turn_duration / 60
+        mean_turns = sum(turns * count for turns, count in kill_turns.items()) / wins if wins else 0.0
+        return {
+            'level': level,
+            'loadout': '+'.join(loadout) or 'none',
+            'monster': monster_id,
+            'duels': total['duels'],
+            'win_rate': wins / total['duels'],
+            # Tempo para matar, em segundos, só dos duelos vencidos
+            'ttk_mean': mean_turns * self.turn_duration,
+            'ttk_p10': _percentile(kill_turns, 0.1) * self.turn_duration,
+            'ttk_p50': _percentile(kill_turns, 0.5) * self.turn_duration,
+            'ttk_p90': _percentile(kill_turns, 0.9) * self.turn_duration,
+            'exp_per_minute': total['exp'] / minutes if minutes else 0.0,
+            'gold_per_minute': total['gold'] / minutes if minutes else 0.0,
+            # Stats dos equipamentos que não alteram o jogador (não entram no duelo)
+            'ignored_stats': '+'.join(sorted(total['ignored_stats'])),
+            'ttk_histogram': {str(turns * self.turn_duration): count
+                              for turns, count in sorted(kill_turns.items())},
+        }
+
+def write_report(rows: List[Dict], path: str):
+    """Grava o relatório em JSON ou CSV (sem o histograma), pela extensão."""
+    if path.endswith('.json'):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+        return
+    fields = [field for field in rows[0] if field != 'ttk_histogram'] if rows else []
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+def _item_choices(ids: List[str]) -> List[Optional[str]]:
+    return [None if item_id == 'none' else item_id for item_id in ids]
+
+def main():
+    monster_types = load_monster_types()
+    items = DataRegistry(cache_dir=None).items
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--levels', type=int, nargs='+', default=list(range(1, 11)))
+    parser.add_argument('--weapons', nargs='+',
+                        default=['none'] + [i for i, e in items.items() if e.get('slot') == 'weapon'])
+    parser.add_argument('--armor', nargs='+',
+                        default=['none'] + [i for i, e in items.items() if e.get('slot') == 'armor'])
+    parser.add_argument('--accessories', nargs='+', default=['none'])
+    parser.add_argument('--monsters', nargs='+', default=sorted(monster_types))
+    parser.add_argument('--duels', type=int, default=1000, help="duelos por configuração")
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default='balance_report.csv')
+    args = parser.parse_args()
+
+    for item_id in args.weapons + args.armor + args.accessories:
+        if item_id != 'none' and item_id not in items:
+            parser.error(f"item desconhecido: {item_id}")
+    for monster_id in args.monsters:
+        if monster_id not in monster_types:
+            parser.error(f"monstro desconhecido: {monster_id}")
+
+    loadouts = [tuple(item_id for item_id in combo if item_id)
+                for combo in itertools.product(_item_choices(args.weapons),
+                                               _item_choices(args.armor),
+                                               _item_choices(args.accessories))]
+    simulator = BalanceSimulator(args.levels, loadouts, args.monsters, args.duels,
+                                 args.batch_size, args.seed, args.workers,
+                                 monster_types=monster_types)
+    rows = simulator.run()
+    write_report(rows, args.output)
+    total = sum(row['duels'] for row in rows)
+    print(f"{total} duelos em {simulator.elapsed:.1f} s com {simulator.workers} processos "
+          f"({total / simulator.elapsed:,.0f} duelos/s) -> {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,39 @@
-from typing import Dict, List, Optional
+import heapq
+from typing import Dict, List, Optional, Tuple
 import pygame
 import random
+import numpy as np
 from src.entities.entity import Entity
 from src.entities.monster import Monster
 from src.entities.player import Player
 
+def combat_key(a: Entity, b: Entity) -> Tuple[int, int]:
+    """Chave do par de entidades, igual nas duas ordens."""
+    return (id(a), id(b)) if id(a) < id(b) else (id(b), id(a))
+
 class CombatSystem:
-    def __init__(self):
-        self.active_combats: List[Combat] = []
+    """Combates ativos indexados pelo par de entidades e agendados por prazo.
+
+    Cada combate tem o instante do próximo turno em um heap; a cada update
+    todos os turnos vencidos são resolvidos juntos em uma passada numpy
+    (rolagem de dano, defesa, mortes) e o resultado é aplicado às entidades
+    de uma vez. Turnos do mesmo tick são simultâneos: um atacante morto
+    nesse tick ainda acerta o seu golpe.
+    """
+    def __init__(self, seed: Optional[int] = None):
+        self.combats: Dict[Tuple[int, int], Combat] = {}
+        # (prazo do turno, ordem de criação, combate); combates encerrados são descartados ao sair
+        self.deadlines: List[Tuple[float, int, Combat]] = []
+        self.time = 0.0
+        self.sequence = 0
+        self.rng = np.random.default_rng(seed)
+        
+    @property
+    def active_combats(self) -> List['Combat']:
+        return list(self.combats.values())
+        
+    def get_combat(self, a: Entity, b: Entity) -> Optional['Combat']:
+        return self.combats.get(combat_key(a, b))
         
     def start_combat(self, attacker: Entity, defender: Entity) -> Optional['Combat']:
         """Inicia um combate entre duas entidades."""
@@ -15,25 +41,108 @@ class CombatSystem:
             return None
             
         # Verifica se já existe um combate entre essas entidades
-        for combat in self.active_combats:
-            if (combat.attacker == attacker and combat.defender == defender) or \
-               (combat.attacker == defender and combat.defender == attacker):
-                return combat
+        key = combat_key(attacker, defender)
+        combat = self.combats.get(key)
+        if combat and not combat.is_finished():
+            return combat
                 
-        # Cria um novo combate
+        # Cria um novo combate; o primeiro turno acontece depois de turn_duration
         combat = Combat(attacker, defender)
-        self.active_combats.append(combat)
+        self.combats[key] = combat
+        self._schedule(combat, self.time + combat.turn_duration)
         return combat
         
+    def _schedule(self, combat: 'Combat', deadline: float):
+        combat.deadline = deadline
+        self.sequence += 1
+        heapq.heappush(self.deadlines, (deadline, self.sequence, combat))
+        
+    def _finish(self, combat: 'Combat'):
+        combat.finished = True
+        key = combat_key(combat.attacker, combat.defender)
+        if self.combats.get(key) is combat:
+            del self.combats[key]
+        
     def update(self, delta_time: float):
-        """Atualiza todos os combates ativos."""
-        # Remove combates finalizados
-        self.active_combats = [combat for combat in self.active_combats 
-                             if not combat.is_finished()]
-                             
-        # Atualiza os combates restantes
-        for combat in self.active_combats:
-            combat.update(delta_time)
+        """Resolve juntos todos os turnos cujo prazo venceu."""
+        self.time += delta_time
+        due = []
+        while self.deadlines and self.deadlines[0][0] <= self.time:
+            deadline, _, combat = heapq.heappop(self.deadlines)
+            if combat.is_finished():
+                self._finish(combat)
+            else:
+                due.append(combat)
+        if due:
+            self.resolve_turns(due)
+            
+    def resolve_turns(self, combats: List['Combat']):
+        """Executa um turno de cada combate em uma única passada vetorizada."""
+        count = len(combats)
+        attackers = [combat.attacker for combat in combats]
+        defenders = [combat.defender for combat in combats]
+        
+        # Dano base: inteiro entre 80% e 120% da força, menos a defesa (mínimo 1)
+        strength = np.fromiter((attacker.strength for attacker in attackers), float, count)
+        low = (strength * 0.8).astype(np.int64)
+        high = (strength * 1.2).astype(np.int64)
+        rolls = self.rng.integers(low, high + 1)
+        defense = np.fromiter((defender.defense for defender in defenders), np.int64, count)
+        damage = np.maximum(1, rolls - defense)
+        
+        # Um mesmo defensor pode apanhar de vários combates no tick: agrupa por defensor
+        slots: Dict[int, int] = {}
+        targets: List[Entity] = []
+        index = np.empty(count, dtype=np.intp)
+        for i, defender in enumerate(defenders):
+            slot = slots.get(id(defender))
+            if slot is None:
+                slot = slots[id(defender)] = len(targets)
+                targets.append(defender)
+            index[i] = slot
+        health = np.fromiter((target.health for target in targets), np.int64, len(targets))
+        
+        # Vida de cada defensor antes de cada golpe, na ordem dos combates
+        order = np.argsort(index, kind='stable')
+        sorted_index = index[order]
+        sorted_damage = damage[order]
+        taken = np.cumsum(sorted_damage)
+        group_start = np.ones(count, dtype=bool)
+        group_start[1:] = sorted_index[1:] != sorted_index[:-1]
+        before_group = np.maximum.accumulate(np.where(group_start, taken - sorted_damage, 0))
+        before = health[sorted_index] - (taken - sorted_damage - before_group)
+        # O golpe que leva a vida de positiva a zero é o que mata
+        killing = np.zeros(count, dtype=bool)
+        killing[order] = (before > 0) & (before <= sorted_damage)
+        remaining = np.maximum(0, health - np.bincount(index, weights=damage,
+                                                       minlength=len(targets)).astype(np.int64))
+        
+        # Aplica o resultado em lote: vida de cada defensor uma vez e depois as mortes
+        custom = set()
+        for slot, target in enumerate(targets):
+            if type(target).take_damage is not Entity.take_damage:
+                # Entidades com dano próprio (ex.: obstáculos) recebem os golpes um a um
+                custom.add(slot)
+            elif target.health > 0:
+                target.health = int(remaining[slot])
+        for i in np.flatnonzero(killing):
+            if index[i] not in custom:
+                defenders[i].die()
+                combats[i].handle_death()
+        for i in range(count):
+            if index[i] in custom:
+                combat = combats[i]
+                if combat.defender.take_damage(int(rolls[i]), combat.attacker) and \
+                   not combat.defender.is_alive():
+                    combat.handle_death()
+                    
+        # Troca os papéis e agenda o próximo turno dos combates que continuam
+        for combat in combats:
+            if combat.is_finished():
+                self._finish(combat)
+            else:
+                combat.attacker, combat.defender = combat.defender, combat.attacker
+                self._schedule(combat, combat.deadline + combat.turn_duration)
             
     def draw(self, screen: pygame.Surface):
         """Desenha a interface de combate."""
@@ -46,6 +155,7 @@ class Combat:
         self.defender = defender
         self.turn_timer = 0
         self.turn_duration = 1.0  # 1 segundo por turno
+        self.deadline = 0.0  # Instante do próximo turno no CombatSystem
         self.finished = False
         
     def update(self, delta_time: float):
@@ -0,0 +1,132 @@
+"""
+Compilação dos diálogos (dialogs.json) em grafos de nós.
+
+Aceita os dois formatos usados nos dados:
+    {"initial": "welcome", "nodes": {"welcome": {...}, ...}}
+    {"start": "welcome" ou {nó}, "welcome": {...}, ...}
+
+As referências "next" viram ponteiros para os nós e as ações das opções
+(string "start_quest:id" ou lista "actions") são normalizadas em tuplas
+(tipo, argumento). Referências quebradas e ações desconhecidas são
+reportadas na carga, não quando o jogador escolhe a opção.
+"""
+
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# Tipos de ação aceitos; give_quest é o nome antigo de start_quest
+ACTION_ALIASES = {'give_quest': 'start_quest'}
+ACTION_TYPES = ('start_quest', 'complete_quest', 'give_item')
+
+class DialogOption:
+    __slots__ = ('text', 'next', 'next_id', 'actions')
+
+    def __init__(self, text: str, next_id: Optional[str], actions: Tuple[Tuple[str, str], ...]):
+        self.text = text
+        self.next_id = next_id
+        self.next: Optional['DialogNode'] = None  # Resolvido depois que todos os nós existem
+        self.actions = actions
+
+class DialogNode:
+    __slots__ = ('id', 'text', 'options')
+
+    def __init__(self, node_id: str, text: str, options: List[DialogOption]):
+        self.id = node_id
+        self.text = text
+        self.options = options
+
+class DialogGraph:
+    __slots__ = ('id', 'nodes', 'initial')
+
+    def __init__(self, dialog_id: str, nodes: Dict[str, DialogNode], initial: DialogNode):
+        self.id = dialog_id
+        self.nodes = nodes
+        self.initial = initial
+
+def _parse_action(value, where: str, errors: List[str]) -> Optional[Tuple[str, str]]:
+    """Normaliza "tipo:arg" ou {"type": ..., "quest_id"/"item_id": ...} em (tipo, arg)."""
+    if isinstance(value, str):
+        action_type, _, argument = value.partition(':')
+    elif isinstance(value, Mapping):
+        action_type = value.get('type', '')
+        argument = value.get('quest_id', value.get('item_id', ''))
+    else:
+        errors.append(f"{where}: ação inválida {value!r}")
+        return None
+    action_type = ACTION_ALIASES.get(action_type, action_type)
+    if action_type not in ACTION_TYPES:
+        errors.append(f"{where}: ação desconhecida '{action_type}'")
+        return None
+    if not argument:
+        errors.append(f"{where}: ação '{action_type}' sem argumento")
+        return None
+    return (action_type, argument)
+
+def _node_entries(data: Mapping) -> Tuple[Optional[str], Dict[str, Mapping]]:
+    """Id do nó inicial e os nós, nos dois formatos aceitos."""
+    if 'nodes' in data:
+        return data.get('initial'), dict(data['nodes'])
+    nodes = {key: node for key, node in data.items() if key != 'start'}
+    start = data.get('start')
+    if isinstance(start, Mapping):
+        # Nó inicial escrito no próprio campo "start"
+        nodes['start'] = start
+        return 'start', nodes
+    return start, nodes
+
+def compile_dialog(dialog_id: str, data: Mapping, errors: List[str]) -> Optional[DialogGraph]:
+    """Compila um diálogo. Retorna None (e adiciona a errors) se houver erros."""
+    where = f"dialogs.{dialog_id}"
+    if not isinstance(data, Mapping):
+        errors.append(f"{where}: diálogo deveria ser um objeto")
+        return None
+    initial_id, entries = _node_entries(data)
+    count = len(errors)
+
+    nodes: Dict[str, DialogNode] = {}
+    for node_id, entry in entries.items():
+        node_where = f"{where}.{node_id}"
+        if not isinstance(entry, Mapping) or not isinstance(entry.get('text'), str):
+            errors.append(f"{node_where}: campo 'text' ausente")
+            continue
+        options = []
+        for i, option in enumerate(entry.get('options', ())):
+            option_where = f"{node_where}.options[{i}]"
+            if not isinstance(option, Mapping) or not isinstance(option.get('text'), str):
+                errors.append(f"{option_where}: campo 'text' ausente")
+                continue
+            raw_actions = list(option.get('actions', ()))
+            if 'action' in option:
+                raw_actions.insert(0, option['action'])
+            actions = tuple(action for action in
+                            (_parse_action(value, option_where, errors) for value in raw_actions)
+                            if action)
+            options.append(DialogOption(option['text'], option.get('next'), actions))
+        nodes[node_id] = DialogNode(node_id, entry['text'], options)
+
+    # Resolve as referências entre nós
+    for node in nodes.values():
+        for i, option in enumerate(node.options):
+            if option.next_id is None:
+                continue
+            option.next = nodes.get(option.next_id)
+            if option.next is None:
+                errors.append(f"{where}.{node.id}.options[{i}]: nó '{option.next_id}' não existe")
+
+    if initial_id is None:
+        errors.append(f"{where}: sem nó inicial ('initial' ou 'start')")
+    elif initial_id not in nodes:
+        errors.append(f"{where}: nó inicial '{initial_id}' não existe")
+
+    if len(errors) > count:
+        return None
+    return DialogGraph(dialog_id, nodes, nodes[initial_id])
+
+def compile_dialogs(dialogs: Mapping, errors: Optional[List[str]] = None) -> Dict[str, DialogGraph]:
+    """Compila todos os diálogos válidos, indexados por id."""
+    errors = [] if errors is None else errors
+    graphs = {}
+    for dialog_id, data in dialogs.items():
+        graph = compile_dialog(dialog_id, data, errors)
+        if graph:
+            graphs[dialog_id] = graph
+    return graphs
@@ -1,28 +1,31 @@
 import json
-import os
 import pygame
 from typing import Dict, Optional, List, Callable
+from src.systems.dialog_graph import DialogGraph, DialogNode, compile_dialogs
+from src.systems.asset_system import load_shared_font
+from src.ui.panel import RetainedPanel
+from src.ui.text_layout import TextLayoutCache
 
 class DialogSystem:
-    def __init__(self, dialog_file: Optional[str] = None, quest_system = None):
+    def __init__(self, dialog_file: Optional[str] = None, quest_system = None,
+                 dialogs: Optional[Dict] = None):
         self.dialogs = {}
-        if dialog_file:
+        if dialogs is not None:
+            self.dialogs = dialogs
+        elif dialog_file:
             self.dialogs = self._load_dialogs(dialog_file)
-        self.current_dialog = None
-        self.current_node = None
+        # Diálogos compilados: nós com as referências "next" já resolvidas
+        self.graphs: Dict[str, DialogGraph] = self._compile(self.dialogs)
+        self.current_dialog_id = None
+        self.current_dialog: Optional[DialogGraph] = None
+        self.current_node: Optional[DialogNode] = None
         self.selected_option = 0
         self.quest_system = quest_system
         self.visible = False
         
-        # Carrega as fontes
-        font_path = os.path.join("assets", "fonts", "PixeloidSans.ttf")
-        try:
-            self.font = pygame.font.Font(font_path, 32)
-            self.option_font = pygame.font.Font(font_path, 24)
-        except:
-            print("Erro ao carregar fonte personalizada. Usando fonte padrão.")
-            self.font = pygame.font.Font(None, 32)
-            self.option_font = pygame.font.Font(None, 24)
+        # As fontes só são carregadas no primeiro diálogo (ver _load_fonts)
+        self.font = None
+        self.option_font = None
         
         # UI properties
         self.text_color = (255, 255, 255)
@@ -31,7 +34,12 @@ class DialogSystem:
         self.padding = 20
         self.line_spacing = 10
         self.max_width = 800
-        self.max_lines = 4
+        self.font_name = 'OldLondon.ttf'
+        self.panel_height = 200
+        self.panel_width = 0
+        self.panel = RetainedPanel(self._build_panel)
+        # Linhas quebradas e renderizadas de cada texto, reaproveitadas entre nós
+        self.layout = TextLayoutCache()
         
     def _load_dialogs(self, filepath: str) -> Dict:
         """Carrega diálogos do arquivo JSON."""
@@ -42,52 +50,91 @@ class DialogSystem:
             print(f"Erro ao carregar diálogos: {e}")
             return {}
             
+    def _compile(self, dialogs: Dict) -> Dict[str, DialogGraph]:
+        """Compila os diálogos, descartando (e reportando) os que têm referências quebradas."""
+        errors: List[str] = []
+        graphs = compile_dialogs(dialogs, errors)
+        for error in errors:
+            print(f"Erro nos diálogos: {error}")
+        return graphs
+        
     def start_dialog(self, dialog_id: str, npc=None, player=None) -> bool:
         """Inicia um diálogo."""
-        if dialog_id not in self.dialogs:
+        if dialog_id not in self.graphs:
             return False
             
-        self.current_dialog = self.dialogs[dialog_id]
-        self.current_node = self.current_dialog.get('start', None)
+        self.current_dialog_id = dialog_id
+        self.current_dialog = self.graphs[dialog_id]
+        self.current_node = self.current_dialog.initial
         self.selected_option = 0
         self.visible = True
+        self.panel.invalidate()
         return True
         
     def end_dialog(self):
         """Encerra o diálogo atual."""
+        self.current_dialog_id = None
         self.current_dialog = None
         self.current_node = None
         self.selected_option = 0
         self.visible = False
+        self.panel.invalidate()
         
+    def apply_dialog_data(self, dialogs: Dict, changed: List[str], removed: List[str]):
+        """Troca os diálogos por uma versão recarregada, mantendo o diálogo aberto."""
+        self.dialogs = dialogs
+        self.graphs = self._compile(dialogs)
+        # Textos alterados não voltam a ser usados; evita que o cache cresça a cada recarga
+        self.layout.clear()
+        self.panel.invalidate()
+        dialog_id = self.current_dialog_id
+        if dialog_id is None or (dialog_id not in changed and dialog_id not in removed):
+            if dialog_id is not None and dialog_id in self.graphs:
+                # Diálogo inalterado: aponta para o grafo recompilado
+                self.current_dialog = self.graphs[dialog_id]
+                self.current_node = self.current_dialog.nodes[self.current_node.id]
+            return
+        if dialog_id in removed or dialog_id not in self.graphs:
+            self.end_dialog()
+            return
+            
+        # Reposiciona no nó de mesmo id dentro do diálogo novo
+        self.current_dialog = self.graphs[dialog_id]
+        node = self.current_dialog.nodes.get(self.current_node.id)
+        if node:
+            self.current_node = node
+            self.selected_option = min(self.selected_option, max(0, len(node.options) - 1))
+        else:
+            self.end_dialog()
+            
     def select_option(self, option_index: int):
         """Seleciona uma opção de diálogo."""
-        if not self.current_node or 'options' not in self.current_node:
+        if not self.current_node:
             return
             
-        options = self.current_node['options']
+        options = self.current_node.options
         if 0 <= option_index < len(options):
             option = options[option_index]
-            next_node = option.get('next', None)
             
             # Executa ações associadas à opção
-            if 'actions' in option:
-                for action in option['actions']:
-                    self._execute_action(action)
+            for action_type, argument in option.actions:
+                self._execute_action(action_type, argument)
                     
-            # Vai para o próximo nó
-            if next_node:
-                self.current_node = self.current_dialog[next_node]
+            # Vai para o próximo nó (já resolvido na compilação)
+            if option.next:
+                self.current_node = option.next
+                self.selected_option = 0
+                self.panel.invalidate()
             else:
                 self.end_dialog()
                 
-    def _execute_action(self, action: Dict):
+    def _execute_action(self, action_type: str, argument: str):
         """Executa uma ação do diálogo."""
-        action_type = action.get('type', '')
-        
-        if action_type == 'give_quest' and self.quest_system:
-            quest_id = action.get('quest_id', '')
-            self.quest_system.start_quest(quest_id)
+        if action_type == 'start_quest' and self.quest_system:
+            self.quest_system.start_quest(argument)
+            
+        elif action_type == 'complete_quest' and self.quest_system:
+            self.quest_system.complete_quest(argument)
             
         elif action_type == 'give_item':
             # Implementar sistema de inventário
@@ -100,44 +147,94 @@ class DialogSystem:
             
         # Processa input
         keys = pygame.key.get_pressed()
+        previous_option = self.selected_option
         
         if keys[pygame.K_UP]:
             self.selected_option = max(0, self.selected_option - 1)
         elif keys[pygame.K_DOWN]:
-            if self.current_node and 'options' in self.current_node:
+            if self.current_node and self.current_node.options:
                 self.selected_option = min(
-                    len(self.current_node['options']) - 1,
+                    len(self.current_node.options) - 1,
                     self.selected_option + 1
                 )
                 
         elif keys[pygame.K_RETURN]:
-            if self.current_node and 'options' in self.current_node:
+            if self.current_node and self.current_node.options:
                 self.select_option(self.selected_option)
                 
         elif keys[pygame.K_ESCAPE]:
             self.end_dialog()
             
+        if self.selected_option != previous_option:
+            self.panel.invalidate()
+            
     def draw(self, screen: pygame.Surface):
         """Desenha a interface de diálogo."""
         if not self.visible or not self.current_node:
             return
             
-        # Desenha o fundo do diálogo
-        dialog_surface = pygame.Surface((screen.get_width(), 200))
-        dialog_surface.set_alpha(200)
-        dialog_surface.fill((0, 0, 0))
-        screen.blit(dialog_surface, (0, screen.get_height() - 200))
+        if screen.get_width() != self.panel_width:
+            self.panel_width = screen.get_width()
+            self.panel.invalidate()
+            
+        # A altura do painel depende do número de linhas do nó atual
+        surface = self.panel.get_surface()
+        if surface is not None:
+            screen.blit(surface, (0, screen.get_height() - surface.get_height()))
+        
+    def _load_fonts(self):
+        """Carrega as fontes do diálogo na primeira vez que são necessárias.
+
+        As fontes estão no manifesto de assets das zonas, então normalmente já
+        foram pré-carregadas e vêm do cache do AssetSystem.
+        """
+        try:
+            self.font = load_shared_font(self.font_name, 32)
+            self.option_font = load_shared_font(self.font_name, 24)
+        except Exception:
+            print("Erro ao carregar fonte personalizada. Usando fonte padrão.")
+            self.font = load_shared_font(None, 32)
+            self.option_font = load_shared_font(None, 24)
+            
+    def _build_panel(self) -> pygame.Surface:
+        """Compõe o nó atual do diálogo em uma superfície em cache."""
+        if self.font is None:
+            self._load_fonts()
+        antialias = self.panel.antialias
+        width = min(self.max_width, self.panel_width - 2 * self.padding)
+            
+        # Linhas já quebradas e renderizadas (no cache a partir da segunda vez)
+        text_lines = []
+        option_lines = []
+        if self.current_node:
+            # Todas as linhas do texto: o painel cresce para caber o nó inteiro
+            text_lines = self.layout.render_wrapped(self.current_node.text, self.font, width,
+                                                    self.text_color, antialias)
+            for i, option in enumerate(self.current_node.options):
+                color = self.selected_color if i == self.selected_option else self.text_color
+                option_lines.append(self.layout.render_wrapped(option.text, self.option_font,
+                                                               width - 20, color, antialias))
+                
+        # Desenha o fundo do diálogo, crescendo se o texto não couber na altura padrão
+        content_height = (sum(line.get_height() for line in text_lines) + self.line_spacing +
+                          sum(line.get_height() for lines in option_lines for line in lines) +
+                          self.line_spacing * len(option_lines))
+        height = max(self.panel_height, content_height + 2 * self.padding)
+        dialog_surface = pygame.Surface((self.panel_width, height), pygame.SRCALPHA)
+        dialog_surface.fill(self.background_color)
         
         # Desenha o texto principal
-        text = self.current_node.get('text', '')
-        text_surface = self.font.render(text, True, self.text_color)
-        screen.blit(text_surface, (self.padding, screen.get_height() - 180))
+        y = self.padding
+        for line in text_lines:
+            dialog_surface.blit(line, (self.padding, y))
+            y += line.get_height()
+        y += self.line_spacing
         
         # Desenha as opções
-        if 'options' in self.current_node:
-            y = screen.get_height() - 140
-            for i, option in enumerate(self.current_node['options']):
-                color = self.selected_color if i == self.selected_option else self.text_color
-                option_surface = self.option_font.render(option['text'], True, color)
-                screen.blit(option_surface, (self.padding + 20, y))
-                y += 30
+        for lines in option_lines:
+            for line in lines:
+                dialog_surface.blit(line, (self.padding + 20, y))
+                y += line.get_height()
+            y += self.line_spacing
+                
+        return dialog_surface
@@ -0,0 +1,58 @@
+from typing import Callable, Dict, List, Optional, Type
+
+class GameEvent:
+    """Evento de jogo. name é o tipo usado nos dados (ex.: "event": "kill" em quests.json)."""
+    name = 'event'
+    __slots__ = ('target', 'amount', 'source')
+
+    def __init__(self, target: Optional[str], amount: int = 1, source=None):
+        self.target = target  # Id do alvo (monstro, item, NPC, obstáculo)
+        self.amount = amount
+        self.source = source  # Objeto que gerou o evento, se houver
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.target!r}, {self.amount})"
+
+class MonsterKilled(GameEvent):
+    name = 'kill'
+    __slots__ = ()
+
+class ItemCollected(GameEvent):
+    name = 'collect'
+    __slots__ = ()
+
+class NpcTalked(GameEvent):
+    name = 'talk'
+    __slots__ = ()
+
+class ObstacleBroken(GameEvent):
+    name = 'break'
+    __slots__ = ()
+
+class PlayerLeveledUp(GameEvent):
+    """Jogador subiu de nível; source é o jogador (o nível novo está em source.level)."""
+    name = 'level_up'
+    __slots__ = ()
+
+# Tipos de evento que objetivos de quest podem usar, pelo nome dos arquivos de dados
+EVENT_TYPES: Dict[str, Type[GameEvent]] = {
+    event_type.name: event_type
+    for event_type in (MonsterKilled, ItemCollected, NpcTalked, ObstacleBroken)
+}
+
+class EventBus:
+    """Entrega cada evento, na hora, só aos inscritos no seu tipo."""
+    def __init__(self):
+        self.subscribers: Dict[Type[GameEvent], List[Callable[[GameEvent], None]]] = {}
+
+    def subscribe(self, event_type: Type[GameEvent], callback: Callable[[GameEvent], None]):
+        self.subscribers.setdefault(event_type, []).append(callback)
+
+    def unsubscribe(self, event_type: Type[GameEvent], callback: Callable[[GameEvent], None]):
+        callbacks = self.subscribers.get(event_type)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+
+    def emit(self, event: GameEvent):
+        for callback in self.subscribers.get(type(event), ()):
+            callback(event)
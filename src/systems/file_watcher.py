@@ -0,0 +1,131 @@
+import os
+import time
+import errno
+import struct
+import ctypes
+import ctypes.util
+from typing import Dict, Optional, Set, Tuple
+
+# Constantes de <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+# Só eventos de arquivo já completo (escrita fechada ou renomeado para o lugar)
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO
+
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+def _load_inotify():
+    """Retorna a libc com inotify, ou None se não estiver disponível (ex.: fora do Linux)."""
+    library = ctypes.util.find_library('c')
+    if not library:
+        return None
+    try:
+        libc = ctypes.CDLL(library, use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+class FileWatcher:
+    """Detecta arquivos alterados em diretórios observados.
+
+    Usa inotify (via ctypes) quando disponível; caso contrário compara
+    tamanho e mtime dos arquivos a cada poll_interval segundos. poll() não
+    bloqueia e deve ser chamado uma vez por frame.
+    """
+    def __init__(self, directories=(), poll_interval: float = 0.5, use_inotify: bool = True):
+        self.poll_interval = poll_interval
+        self.directories: Set[str] = set()
+        self.watches: Dict[int, str] = {}
+        self.stats: Dict[str, Tuple[int, int]] = {}
+        self.last_poll = 0.0
+        self.fd: Optional[int] = None
+        self.libc = _load_inotify() if use_inotify else None
+        if self.libc:
+            fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                self.fd = fd
+            else:
+                print(f"inotify indisponível ({os.strerror(ctypes.get_errno())}), usando polling")
+        for directory in directories:
+            self.add_directory(directory)
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self.fd is not None
+
+    def add_directory(self, directory: str):
+        directory = os.path.abspath(directory)
+        if directory in self.directories:
+            return
+        self.directories.add(directory)
+        if self.fd is not None:
+            wd = self.libc.inotify_add_watch(self.fd, directory.encode(), WATCH_MASK)
+            if wd >= 0:
+                self.watches[wd] = directory
+                return
+            print(f"Erro ao observar {directory}: {os.strerror(ctypes.get_errno())}")
+        self._scan(directory, report_new=False)
+
+    def poll(self) -> Set[str]:
+        """Retorna os caminhos absolutos dos arquivos alterados desde a última chamada."""
+        changed = self._read_events() if self.fd is not None else set()
+
+        # Diretórios sem watch (ou sem inotify) são verificados por polling
+        polled = self.directories - set(self.watches.values())
+        now = time.monotonic()
+        if polled and now - self.last_poll >= self.poll_interval:
+            self.last_poll = now
+            for directory in polled:
+                changed |= self._scan(directory)
+        return changed
+
+    def _read_events(self) -> Set[str]:
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+                offset += length
+                if name and wd in self.watches:
+                    changed.add(os.path.join(self.watches[wd], name))
+        return changed
+
+    def _scan(self, directory: str, report_new: bool = True) -> Set[str]:
+        changed = set()
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return changed
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            previous = self.stats.get(path)
+            self.stats[path] = signature
+            if previous is not None and previous != signature:
+                changed.add(path)
+            elif previous is None and report_new:
+                changed.add(path)
+        return changed
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
@@ -0,0 +1,153 @@
+from typing import Optional, Set, Tuple
+import pygame
+
+# Transformações de coordenadas para os 8 octantes do shadowcasting
+OCTANTS = [
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1)
+]
+
+UNEXPLORED_COLOR = (0, 0, 0, 255)
+EXPLORED_COLOR = (0, 0, 0, 160)
+VISIBLE_COLOR = (0, 0, 0, 0)
+
+class FieldOfView:
+    """Campo de visão e névoa de guerra por shadowcasting recursivo.
+
+    Usa a camada 'collision' do mapa como paredes opacas. O cálculo só roda
+    quando o jogador muda de tile; o resultado também serve como teste de
+    linha de visão para os monstros (o shadowcasting é praticamente simétrico:
+    se o tile do monstro é visível para o jogador, o jogador é visível para ele).
+    """
+    def __init__(self, game_map, radius: int = 8):
+        self.map = game_map
+        self.width = game_map.width
+        self.height = game_map.height
+        self.tile_size = game_map.tile_size
+        self.radius = radius
+
+        self.origin: Optional[Tuple[int, int]] = None
+        self.visible_tiles: Set[int] = set()
+        # Máscara de tiles explorados: 1 bit por tile
+        self.explored = bytearray((self.width * self.height + 7) // 8)
+
+        # Névoa em resolução de tiles (1 pixel por tile), atualizada incrementalmente
+        self.fog_surface: Optional[pygame.Surface] = None
+        self.dirty_tiles: Set[int] = set()
+        self.scaled_fog: Optional[pygame.Surface] = None
+
+    def update(self, world_x: float, world_y: float) -> bool:
+        """Recalcula a visão se a posição caiu em outro tile. Retorna True se recalculou."""
+        tile = (int(world_x // self.tile_size), int(world_y // self.tile_size))
+        if tile == self.origin:
+            return False
+        self.compute(*tile)
+        return True
+
+    def compute(self, origin_x: int, origin_y: int):
+        """Calcula os tiles visíveis a partir de um tile de origem."""
+        self.origin = (origin_x, origin_y)
+        visible: Set[int] = set()
+        if 0 <= origin_x < self.width and 0 <= origin_y < self.height:
+            visible.add(origin_y * self.width + origin_x)
+        for xx, xy, yx, yy in OCTANTS:
+            self._cast_light(origin_x, origin_y, 1, 1.0, 0.0, xx, xy, yx, yy, visible)
+
+        # Só os tiles que mudaram de estado precisam ser repintados na névoa
+        self.dirty_tiles |= visible ^ self.visible_tiles
+        for index in visible:
+            self.explored[index >> 3] |= 1 << (index & 7)
+        self.visible_tiles = visible
+
+    def _cast_light(self, cx: int, cy: int, row: int, start: float, end: float,
+                    xx: int, xy: int, yx: int, yy: int, visible: Set[int]):
+        """Varre um octante, recursando a cada parede que projeta sombra."""
+        if start < end:
+            return
+
+        radius_squared = self.radius * self.radius
+        new_start = start
+        for j in range(row, self.radius + 1):
+            dx = -j - 1
+            dy = -j
+            blocked = False
+            while dx <= 0:
+                dx += 1
+                x = cx + dx * xx + dy * xy
+                y = cy + dx * yx + dy * yy
+                left_slope = (dx - 0.5) / (dy + 0.5)
+                right_slope = (dx + 0.5) / (dy - 0.5)
+                if start < right_slope:
+                    continue
+                if end > left_slope:
+                    break
+
+                if dx * dx + dy * dy < radius_squared and 0 <= x < self.width and 0 <= y < self.height:
+                    visible.add(y * self.width + x)
+
+                if blocked:
+                    if self.map.is_solid(x, y):
+                        new_start = right_slope
+                        continue
+                    blocked = False
+                    start = new_start
+                elif self.map.is_solid(x, y) and j < self.radius:
+                    blocked = True
+                    self._cast_light(cx, cy, j + 1, start, left_slope, xx, xy, yx, yy, visible)
+                    new_start = right_slope
+            if blocked:
+                break
+
+    def is_visible(self, tile_x: int, tile_y: int) -> bool:
+        """Verifica se um tile está visível no momento."""
+        return tile_y * self.width + tile_x in self.visible_tiles
+
+    def is_visible_at(self, world_x: float, world_y: float) -> bool:
+        """Verifica se uma posição do mundo (em pixels) está visível."""
+        tile_x = int(world_x // self.tile_size)
+        tile_y = int(world_y // self.tile_size)
+        if not (0 <= tile_x < self.width and 0 <= tile_y < self.height):
+            return False
+        return self.is_visible(tile_x, tile_y)
+
+    def is_explored(self, tile_x: int, tile_y: int) -> bool:
+        """Verifica se um tile já foi visto alguma vez."""
+        index = tile_y * self.width + tile_x
+        return bool(self.explored[index >> 3] & (1 << (index & 7)))
+
+    def _update_fog_surface(self):
+        """Repinta apenas os tiles da névoa que mudaram desde o último frame."""
+        if self.fog_surface is None:
+            self.fog_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            self.fog_surface.fill(UNEXPLORED_COLOR)
+
+        for index in self.dirty_tiles:
+            if index in self.visible_tiles:
+                color = VISIBLE_COLOR
+            elif self.explored[index >> 3] & (1 << (index & 7)):
+                color = EXPLORED_COLOR
+            else:
+                color = UNEXPLORED_COLOR
+            self.fog_surface.set_at((index % self.width, index // self.width), color)
+        self.dirty_tiles.clear()
+
+    def draw(self, screen: pygame.Surface, camera_x: int, camera_y: int):
+        """Desenha a névoa de guerra sobre a área visível da câmera."""
+        if self.dirty_tiles or self.fog_surface is None:
+            self._update_fog_surface()
+
+        start_x = max(0, camera_x // self.tile_size)
+        start_y = max(0, camera_y // self.tile_size)
+        end_x = min(self.width, (camera_x + screen.get_width()) // self.tile_size + 1)
+        end_y = min(self.height, (camera_y + screen.get_height()) // self.tile_size + 1)
+        if start_x >= end_x or start_y >= end_y:
+            return
+
+        # Amplia só o recorte visível da névoa (vizinho mais próximo = tiles nítidos)
+        region = self.fog_surface.subsurface((start_x, start_y, end_x - start_x, end_y - start_y))
+        size = ((end_x - start_x) * self.tile_size, (end_y - start_y) * self.tile_size)
+        if self.scaled_fog is None or self.scaled_fog.get_size() != size:
+            self.scaled_fog = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.transform.scale(region, size, self.scaled_fog)
+        screen.blit(self.scaled_fog, (start_x * self.tile_size - camera_x,
+                                      start_y * self.tile_size - camera_y))
@@ -1,8 +1,11 @@
+import heapq
 import pygame
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from src.items.item import Item
 from src.items.equipment import Equipment
 from src.items.consumable import Consumable
+from src.ui.panel import RetainedPanel
+from src.systems.asset_system import load_shared_font
 
 class InventorySlot:
     def __init__(self, item: Optional[Item] = None, quantity: int = 0):
@@ -40,6 +43,49 @@ class InventorySlot:
             self.item = None
         return removed
 
+class InventoryChange:
+    """Resumo de uma alteração do inventário, enviado aos ouvintes."""
+    def __init__(self, added: Optional[Dict[str, int]] = None,
+                 removed: Optional[Dict[str, int]] = None, gold: int = 0):
+        self.added = added or {}
+        self.removed = removed or {}
+        self.gold = gold
+        
+    def __bool__(self):
+        return bool(self.added or self.removed or self.gold)
+        
+    def __repr__(self):
+        return f"InventoryChange(added={self.added}, removed={self.removed}, gold={self.gold})"
+
+class InventoryTransaction:
+    """Lote de adições, remoções e ouro aplicado de uma vez pelo inventário.
+    
+    Uso:
+        transaction = InventoryTransaction()
+        transaction.remove('health_potion', 2).add(sword).add_gold(-50)
+        inventory.commit(transaction)
+        
+    As remoções são aplicadas antes das adições, então os slots liberados
+    podem receber os itens novos (como numa troca com o mercador).
+    """
+    def __init__(self, adds: Iterable[Tuple[Item, int]] = (),
+                 removes: Iterable[Tuple[str, int]] = (), gold: int = 0):
+        self.adds: List[Tuple[Item, int]] = list(adds)
+        self.removes: List[Tuple[str, int]] = list(removes)
+        self.gold = gold
+        
+    def add(self, item: Item, amount: int = 1) -> 'InventoryTransaction':
+        self.adds.append((item, amount))
+        return self
+        
+    def remove(self, item_id: str, amount: int = 1) -> 'InventoryTransaction':
+        self.removes.append((item_id, amount))
+        return self
+        
+    def add_gold(self, amount: int) -> 'InventoryTransaction':
+        self.gold += amount
+        return self
+
 class InventorySystem:
     def __init__(self, size: int = 20):
         self.size = size
@@ -52,6 +98,8 @@ class InventorySystem:
         self.slot_size = 40
         self.padding = 10
         self.columns = 5
+        self._fonts: Dict[int, pygame.font.Font] = {}
+        self.panel = RetainedPanel(self._build_panel)
         
         # Equipment slots
         self.equipment_slots: Dict[str, InventorySlot] = {
@@ -60,55 +108,305 @@ class InventorySystem:
             'accessory': InventorySlot()
         }
         
+        # Índices sobre self.slots, mantidos pelos métodos do inventário:
+        # id -> slots ocupados, id -> slots com espaço para empilhar,
+        # id -> quantidade total e heap com os slots vazios. Cada conjunto
+        # por id tem um heap de mínimo ao lado para percorrer os slots em
+        # ordem; entradas que saíram do conjunto são descartadas ao aparecer
+        # no topo (remoção preguiçosa)
+        self.item_slots: Dict[str, Set[int]] = {}
+        self.open_stacks: Dict[str, Set[int]] = {}
+        self.item_slot_heaps: Dict[str, List[int]] = {}
+        self.open_stack_heaps: Dict[str, List[int]] = {}
+        self.item_totals: Dict[str, int] = {}
+        self.free_slots: List[int] = []
+        self.rebuild_index()
+        
+        self.listeners: List[Callable[[InventoryChange], None]] = []
+        
+    def listen(self, callback: Callable[[InventoryChange], None]):
+        """Chama callback(change) depois de cada alteração de itens ou ouro."""
+        self.listeners.append(callback)
+        
+    def _notify(self, change: InventoryChange):
+        self.panel.invalidate()
+        if change:
+            for callback in self.listeners:
+                callback(change)
+        
+    def rebuild_index(self):
+        """Recalcula os índices a partir dos slots (após alterá-los diretamente)."""
+        self.item_slots.clear()
+        self.open_stacks.clear()
+        self.item_slot_heaps.clear()
+        self.open_stack_heaps.clear()
+        self.item_totals.clear()
+        self.free_slots = []
+        for index, slot in enumerate(self.slots):
+            if slot.is_empty():
+                self.free_slots.append(index)
+            else:
+                self._index_slot(index)
+        heapq.heapify(self.free_slots)
+        
+    @staticmethod
+    def _add_to_index(sets: Dict[str, Set[int]], heaps: Dict[str, List[int]],
+                      item_id: str, index: int):
+        members = sets.setdefault(item_id, set())
+        if index in members:
+            return
+        members.add(index)
+        heap = heaps.setdefault(item_id, [])
+        heapq.heappush(heap, index)
+        # Slots que saem e voltam deixam duplicatas; compacta quando o heap
+        # fica bem maior que o conjunto (uma lista ordenada já é um heap)
+        if len(heap) > 2 * len(members) + 8:
+            heap[:] = sorted(members)
+            
+    @staticmethod
+    def _discard_from_index(sets: Dict[str, Set[int]], heaps: Dict[str, List[int]],
+                            item_id: str, index: int):
+        members = sets.get(item_id)
+        if members is None:
+            return
+        members.discard(index)
+        if not members:
+            del sets[item_id]
+            del heaps[item_id]
+            
+    @staticmethod
+    def _first_index(sets: Dict[str, Set[int]], heaps: Dict[str, List[int]],
+                     item_id: str) -> Optional[int]:
+        """Lowest index in sets[item_id], popping stale heap entries on the way."""
+        members = sets.get(item_id)
+        if not members:
+            return None
+        heap = heaps[item_id]
+        while heap[0] not in members:
+            heapq.heappop(heap)
+        return heap[0]
+        
+    @staticmethod
+    def _ascending(sets: Dict[str, Set[int]], heaps: Dict[str, List[int]],
+                   item_id: str) -> Iterator[int]:
+        """Yield the indices in sets[item_id] in ascending order without touching the heap.
+        
+        Walks the heap as a tree, expanding children only as entries are
+        consumed, so taking the first k indices costs O(k log k).
+        """
+        members = sets.get(item_id)
+        if not members:
+            return
+        heap = heaps[item_id]
+        frontier = [(heap[0], 0)]
+        last = None
+        while frontier:
+            index, position = heapq.heappop(frontier)
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+            # Duplicatas saem em sequência
+            if index != last and index in members:
+                last = index
+                yield index
+        
+    def _index_slot(self, index: int):
+        """Registra o conteúdo atual de um slot ocupado nos índices."""
+        slot = self.slots[index]
+        item_id = slot.item.id
+        self._add_to_index(self.item_slots, self.item_slot_heaps, item_id, index)
+        self.item_totals[item_id] = self.item_totals.get(item_id, 0) + slot.quantity
+        if slot.quantity < slot.item.max_stack:
+            self._add_to_index(self.open_stacks, self.open_stack_heaps, item_id, index)
+            
+    def _unindex_slot(self, index: int):
+        """Remove dos índices o conteúdo atual de um slot ocupado."""
+        slot = self.slots[index]
+        item_id = slot.item.id
+        self._discard_from_index(self.item_slots, self.item_slot_heaps, item_id, index)
+        total = self.item_totals[item_id] - slot.quantity
+        if total:
+            self.item_totals[item_id] = total
+        else:
+            del self.item_totals[item_id]
+        self._discard_from_index(self.open_stacks, self.open_stack_heaps, item_id, index)
+                
+    def _add_to_slot(self, index: int, item: Item, amount: int) -> int:
+        """Adiciona ao slot mantendo os índices. Retorna o que não coube."""
+        slot = self.slots[index]
+        if not slot.is_empty():
+            self._unindex_slot(index)
+        remaining = slot.add(item, amount)
+        self._index_slot(index)
+        return remaining
+        
+    def _remove_from_slot(self, index: int, amount: int) -> int:
+        """Remove do slot mantendo os índices. Retorna quanto foi removido."""
+        slot = self.slots[index]
+        if slot.is_empty():
+            return 0
+        self._unindex_slot(index)
+        removed = slot.remove(amount)
+        if slot.is_empty():
+            heapq.heappush(self.free_slots, index)
+        else:
+            self._index_slot(index)
+        return removed
+        
     def add_item(self, item: Item, amount: int = 1) -> bool:
         """Add items to inventory. Returns True if all items were added."""
+        remaining = self._add_item(item, amount)
+        if remaining < amount:
+            self._notify(InventoryChange(added={item.id: amount - remaining}))
+        return remaining == 0
+        
+    def _add_item(self, item: Item, amount: int) -> int:
+        """Place items (existing stacks first, then empty slots). Returns what didn't fit."""
         remaining = amount
         
-        # First try to stack with existing items
-        for slot in self.slots:
-            if not slot.is_empty() and slot.item.id == item.id:
-                remaining = slot.add(item, remaining)
-                if remaining == 0:
-                    return True
-                    
-        # Then try empty slots
-        for slot in self.slots:
-            if slot.is_empty():
-                remaining = slot.add(item, remaining)
-                if remaining == 0:
-                    return True
-                    
-        return remaining == 0
+        # First try to stack with existing items, lowest index first. A stack
+        # that fills up leaves open_stacks, so the next lookup moves on
+        while remaining > 0:
+            index = self._first_index(self.open_stacks, self.open_stack_heaps, item.id)
+            if index is None:
+                break
+            remaining = self._add_to_slot(index, item, remaining)
+                
+        # Then try empty slots, lowest index first
+        while remaining > 0 and self.free_slots:
+            remaining = self._add_to_slot(heapq.heappop(self.free_slots), item, remaining)
+            
+        return remaining
         
     def remove_item(self, item_id: str, amount: int = 1) -> int:
         """Remove items from inventory. Returns number of items actually removed."""
+        removed = self._remove_item(item_id, amount)
+        if removed:
+            self._notify(InventoryChange(removed={item_id: removed}))
+        return removed
+        
+    def _remove_item(self, item_id: str, amount: int) -> int:
         remaining = amount
-        for slot in self.slots:
-            if not slot.is_empty() and slot.item.id == item_id:
-                removed = slot.remove(remaining)
-                remaining -= removed
-                if remaining == 0:
-                    break
+        while remaining > 0:
+            index = self._first_index(self.item_slots, self.item_slot_heaps, item_id)
+            if index is None:
+                break
+            remaining -= self._remove_from_slot(index, remaining)
         return amount - remaining
         
+    def can_commit(self, transaction: InventoryTransaction) -> bool:
+        """Check whether the whole transaction fits, without changing anything."""
+        return self._plan(transaction) is not None
+        
+    def commit(self, transaction: InventoryTransaction) -> bool:
+        """Apply a transaction atomically.
+        
+        Returns False and leaves the inventory untouched if any removal
+        lacks items, the gold would go negative or the adds don't fit.
+        Listeners receive a single InventoryChange for the whole batch.
+        """
+        change = self._plan(transaction)
+        if change is None:
+            return False
+            
+        for item_id, amount in change.removed.items():
+            self._remove_item(item_id, amount)
+        for item, amount in transaction.adds:
+            if amount > 0:
+                self._add_item(item, amount)
+        self.gold += change.gold
+        self._notify(change)
+        return True
+        
+    def _plan(self, transaction: InventoryTransaction) -> Optional[InventoryChange]:
+        """Simulate the transaction on the indices. Returns its change, or None if it fails."""
+        change = InventoryChange(gold=transaction.gold)
+        if self.gold + transaction.gold < 0:
+            return None
+            
+        for item_id, amount in transaction.removes:
+            if amount > 0:
+                change.removed[item_id] = change.removed.get(item_id, 0) + amount
+        for item_id, amount in change.removed.items():
+            if self.item_totals.get(item_id, 0) < amount:
+                return None
+                
+        # Quantities of the slots touched by the plan; absent = unchanged.
+        # owners records which item id will fill each freed or empty slot.
+        planned: Dict[int, int] = {}
+        owners: Dict[int, str] = {}
+        freed: List[int] = []
+        for item_id, amount in change.removed.items():
+            for index in self._ascending(self.item_slots, self.item_slot_heaps, item_id):
+                taken = min(amount, self.slots[index].quantity)
+                planned[index] = self.slots[index].quantity - taken
+                if planned[index] == 0:
+                    freed.append(index)
+                amount -= taken
+                if amount == 0:
+                    break
+                    
+        # Free slots are borrowed from the heap while planning and returned after
+        heapq.heapify(freed)
+        borrowed: List[int] = []
+        try:
+            for item, amount in transaction.adds:
+                if amount <= 0:
+                    continue
+                max_stack = item.max_stack
+                # Open stacks come from the heap; the slots already touched by
+                # the plan (partial removals, slots filled earlier) are few
+                touched = sorted(index for index in planned
+                                 if owners.get(index) == item.id or
+                                 (index not in owners and self.slots[index].item.id == item.id))
+                stacks = heapq.merge(
+                    self._ascending(self.open_stacks, self.open_stack_heaps, item.id), touched)
+                remaining = amount
+                last = None
+                for index in stacks:
+                    if index == last:
+                        continue
+                    last = index
+                    quantity = planned.get(index, self.slots[index].quantity)
+                    if quantity == 0 or owners.get(index, item.id) != item.id:
+                        continue
+                    added = min(remaining, max_stack - quantity)
+                    planned[index] = quantity + added
+                    remaining -= added
+                    if remaining == 0:
+                        break
+                while remaining > 0:
+                    if freed and (not self.free_slots or freed[0] < self.free_slots[0]):
+                        index = heapq.heappop(freed)
+                    elif self.free_slots:
+                        index = heapq.heappop(self.free_slots)
+                        borrowed.append(index)
+                    else:
+                        return None
+                    added = min(remaining, max_stack)
+                    planned[index] = added
+                    owners[index] = item.id
+                    remaining -= added
+                change.added[item.id] = change.added.get(item.id, 0) + amount
+        finally:
+            for index in borrowed:
+                heapq.heappush(self.free_slots, index)
+        return change
+        
     def get_item(self, item_id: str) -> Optional[Item]:
         """Get an item from inventory without removing it."""
-        for slot in self.slots:
-            if not slot.is_empty() and slot.item.id == item_id:
-                return slot.item
-        return None
+        index = self._first_index(self.item_slots, self.item_slot_heaps, item_id)
+        if index is None:
+            return None
+        return self.slots[index].item
         
     def get_item_count(self, item_id: str) -> int:
         """Get the total count of an item in inventory."""
-        total = 0
-        for slot in self.slots:
-            if not slot.is_empty() and slot.item.id == item_id:
-                total += slot.quantity
-        return total
+        return self.item_totals.get(item_id, 0)
         
     def has_space(self) -> bool:
         """Check if inventory has any empty slots."""
-        return any(slot.is_empty() for slot in self.slots)
+        return bool(self.free_slots)
         
     def is_full(self) -> bool:
         """Check if inventory is full."""
@@ -116,9 +414,11 @@ class InventorySystem:
         
     def clear(self):
         """Clear all items from inventory."""
+        self.panel.invalidate()
         for slot in self.slots:
             slot.item = None
             slot.quantity = 0
+        self.rebuild_index()
             
     def equip_item(self, slot_index: int) -> bool:
         """Equip an item from inventory."""
@@ -145,7 +445,8 @@ class InventorySystem:
         # Equip new item
         equipment_slot.item = equipment
         equipment_slot.quantity = 1
-        slot.remove(1)
+        self._remove_from_slot(slot_index, 1)
+        self.panel.invalidate()
         
         return True
         
@@ -167,6 +468,7 @@ class InventorySystem:
         if self.add_item(item):
             equipment_slot.item = None
             equipment_slot.quantity = 0
+            self.panel.invalidate()
             return True
             
         return False
@@ -181,8 +483,10 @@ class InventorySystem:
             return False
             
         # Use the item
+        item_id = slot.item.id
         if slot.item.use(target):
-            slot.remove(1)
+            self._remove_from_slot(slot_index, 1)
+            self._notify(InventoryChange(removed={item_id: 1}))
             return True
             
         return False
@@ -192,60 +496,89 @@ class InventorySystem:
         if not self.visible:
             return
             
-        # Calculate inventory grid
+        x, y = self._grid_origin(screen)
+        self.panel.draw(screen, (x, y - self._label_height()))
+        
+    def _get_font(self, size: int) -> pygame.font.Font:
+        """Return a cached default font of the given size."""
+        if size not in self._fonts:
+            self._fonts[size] = load_shared_font(None, size)
+        return self._fonts[size]
+        
+    def _grid_size(self) -> tuple:
+        """Return the width and height of the slot grid."""
         rows = (self.size + self.columns - 1) // self.columns
         total_width = self.columns * (self.slot_size + self.padding) + self.padding
         total_height = rows * (self.slot_size + self.padding) + self.padding
+        return total_width, total_height
+        
+    def _grid_origin(self, screen: pygame.Surface) -> tuple:
+        """Return the top-left corner of the slot grid on screen."""
+        total_width, total_height = self._grid_size()
+        return ((screen.get_width() - total_width) // 2,
+                (screen.get_height() - total_height) // 2)
+                
+    def _label_height(self) -> int:
+        """Height reserved above the grid for equipment slot labels."""
+        return self._get_font(20).get_height() + 2
+        
+    def _build_panel(self) -> pygame.Surface:
+        """Compose the whole inventory interface into one cached surface."""
+        total_width, total_height = self._grid_size()
+        label_font = self._get_font(20)
+        top = self._label_height()
+        
+        gold_text = self._get_font(24).render(f"Gold: {self.gold}", self.panel.antialias, (255, 215, 0))
+        equip_width = max([self.slot_size] +
+                          [label_font.size(slot_type)[0] for slot_type in self.equipment_slots])
+        width = total_width + self.padding + equip_width
+        height = top + total_height + self.padding + gold_text.get_height()
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
         
         # Draw background
-        x = (screen.get_width() - total_width) // 2
-        y = (screen.get_height() - total_height) // 2
-        pygame.draw.rect(screen, (50, 50, 50), (x, y, total_width, total_height))
+        pygame.draw.rect(panel, (50, 50, 50), (0, top, total_width, total_height))
         
         # Draw slots
         for i, slot in enumerate(self.slots):
-            slot_x = x + self.padding + (i % self.columns) * (self.slot_size + self.padding)
-            slot_y = y + self.padding + (i // self.columns) * (self.slot_size + self.padding)
+            slot_x = self.padding + (i % self.columns) * (self.slot_size + self.padding)
+            slot_y = top + self.padding + (i // self.columns) * (self.slot_size + self.padding)
             
             # Draw slot background
             color = (100, 100, 100) if i == self.selected_slot else (70, 70, 70)
-            pygame.draw.rect(screen, color, (slot_x, slot_y, self.slot_size, self.slot_size))
+            pygame.draw.rect(panel, color, (slot_x, slot_y, self.slot_size, self.slot_size))
             
             # Draw item if present
             if not slot.is_empty():
                 # Draw item sprite
                 if slot.item.sprite:
-                    screen.blit(slot.item.sprite, (slot_x, slot_y))
+                    panel.blit(slot.item.sprite, (slot_x, slot_y))
                     
                 # Draw quantity
                 if slot.quantity > 1:
-                    font = pygame.font.Font(None, 20)
-                    text = font.render(str(slot.quantity), True, (255, 255, 255))
-                    screen.blit(text, (slot_x + self.slot_size - text.get_width() - 2,
-                                     slot_y + self.slot_size - text.get_height() - 2))
+                    text = label_font.render(str(slot.quantity), self.panel.antialias, (255, 255, 255))
+                    panel.blit(text, (slot_x + self.slot_size - text.get_width() - 2,
+                                      slot_y + self.slot_size - text.get_height() - 2))
                                      
         # Draw equipment slots
-        equip_x = x + total_width + self.padding
-        equip_y = y
+        equip_x = total_width + self.padding
+        equip_y = top
         for slot_type, slot in self.equipment_slots.items():
-            pygame.draw.rect(screen, (70, 70, 70), 
+            pygame.draw.rect(panel, (70, 70, 70), 
                            (equip_x, equip_y, self.slot_size, self.slot_size))
             
             if not slot.is_empty():
                 if slot.item.sprite:
-                    screen.blit(slot.item.sprite, (equip_x, equip_y))
+                    panel.blit(slot.item.sprite, (equip_x, equip_y))
                     
             # Draw slot type label
-            font = pygame.font.Font(None, 20)
-            text = font.render(slot_type, True, (255, 255, 255))
-            screen.blit(text, (equip_x, equip_y - text.get_height() - 2))
+            text = label_font.render(slot_type, self.panel.antialias, (255, 255, 255))
+            panel.blit(text, (equip_x, equip_y - text.get_height() - 2))
             
             equip_y += self.slot_size + self.padding
             
         # Draw gold amount
-        font = pygame.font.Font(None, 24)
-        text = font.render(f"Gold: {self.gold}", True, (255, 215, 0))
-        screen.blit(text, (x + self.padding, y + total_height + self.padding))
+        panel.blit(gold_text, (self.padding, top + total_height + self.padding))
+        return panel
         
     def handle_click(self, pos: tuple) -> bool:
         """Handle mouse click in inventory. Returns True if click was handled."""
@@ -265,7 +598,9 @@ class InventorySystem:
             
             if (slot_x <= pos[0] <= slot_x + self.slot_size and 
                 slot_y <= pos[1] <= slot_y + self.slot_size):
-                self.selected_slot = i
+                if self.selected_slot != i:
+                    self.selected_slot = i
+                    self.panel.invalidate()
                 return True
                 
         return False
@@ -281,10 +616,12 @@ class InventorySystem:
     def add_gold(self, amount: int):
         """Add gold to inventory."""
         self.gold += amount
+        self._notify(InventoryChange(gold=amount))
         
     def remove_gold(self, amount: int) -> bool:
         """Remove gold from inventory. Returns True if successful."""
         if self.gold >= amount:
             self.gold -= amount
+            self._notify(InventoryChange(gold=-amount))
             return True
         return False
@@ -0,0 +1,145 @@
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+import pygame
+
+class Light:
+    def __init__(self, x: float, y: float, radius: int, color: Tuple[int, int, int]):
+        self.x = x              # Centro em pixels do mundo
+        self.y = y
+        self.radius = radius    # Raio em pixels
+        self.color = tuple(color)
+
+class LightSpriteCache:
+    """Cache LRU de sprites de luz radiais pré-renderizados."""
+    def __init__(self, max_sprites: int = 32, steps: int = 24):
+        self.max_sprites = max_sprites
+        self.steps = steps
+        self.sprites: OrderedDict = OrderedDict()
+
+    def get(self, radius: int, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Retorna o sprite de gradiente para um raio e cor."""
+        key = (radius, color)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+
+        sprite = self._render_gradient(radius, color)
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_sprites:
+            self.sprites.popitem(last=False)
+        return sprite
+
+    def _render_gradient(self, radius: int, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Desenha círculos concêntricos do mais fraco (borda) ao mais forte (centro)."""
+        sprite = pygame.Surface((radius * 2, radius * 2))
+        sprite.fill((0, 0, 0))
+        for step in range(self.steps):
+            t = step / self.steps                  # 0 na borda, ~1 no centro
+            intensity = t * t
+            step_radius = max(1, int(radius * (1 - t)))
+            step_color = tuple(int(c * intensity) for c in color)
+            pygame.draw.circle(sprite, step_color, (radius, radius), step_radius)
+        return sprite
+
+class LightingSystem:
+    """Iluminação com light maps estáticos por chunk e luzes dinâmicas em sprite.
+
+    As luzes estáticas do mapa (tochas) são assadas uma única vez em light
+    maps por chunk. A cada frame o buffer de luz recebe uma cópia dos chunks
+    visíveis e um blit aditivo por luz dinâmica, e então multiplica a cena.
+    O trabalho em Python cresce com o número de luzes, não com os pixels.
+    """
+    def __init__(self, game_map, ambient: Tuple[int, int, int] = (40, 40, 55),
+                 chunk_tiles: int = 16):
+        self.tile_size = game_map.tile_size
+        self.map_width = game_map.width * self.tile_size
+        self.map_height = game_map.height * self.tile_size
+        self.ambient = ambient
+        self.chunk_size = chunk_tiles * self.tile_size
+        self.sprite_cache = LightSpriteCache()
+
+        self.static_lights: List[Light] = [
+            Light((data['x'] + 0.5) * self.tile_size,
+                  (data['y'] + 0.5) * self.tile_size,
+                  int(data.get('radius', 4) * self.tile_size),
+                  tuple(data.get('color', (255, 200, 150))))
+            for data in getattr(game_map, 'lights', [])
+        ]
+        self.dynamic_lights: List[Light] = []
+        self.chunks: Dict[Tuple[int, int], pygame.Surface] = {}
+        self.light_buffer: Optional[pygame.Surface] = None
+        self.bake()
+
+    def _chunk_range(self, left: float, top: float, right: float, bottom: float):
+        """Retorna os índices de chunks que cobrem um retângulo em pixels."""
+        chunks_x = (self.map_width + self.chunk_size - 1) // self.chunk_size
+        chunks_y = (self.map_height + self.chunk_size - 1) // self.chunk_size
+        start_x = max(0, int(left) // self.chunk_size)
+        start_y = max(0, int(top) // self.chunk_size)
+        end_x = min(chunks_x, int(right) // self.chunk_size + 1)
+        end_y = min(chunks_y, int(bottom) // self.chunk_size + 1)
+        return range(start_x, end_x), range(start_y, end_y)
+
+    def bake(self):
+        """Assa as luzes estáticas nos light maps de cada chunk."""
+        # Indexa as luzes pelos chunks que elas tocam
+        lights_by_chunk: Dict[Tuple[int, int], List[Light]] = {}
+        for light in self.static_lights:
+            xs, ys = self._chunk_range(light.x - light.radius, light.y - light.radius,
+                                       light.x + light.radius, light.y + light.radius)
+            for cy in ys:
+                for cx in xs:
+                    lights_by_chunk.setdefault((cx, cy), []).append(light)
+
+        self.chunks = {}
+        xs, ys = self._chunk_range(0, 0, self.map_width - 1, self.map_height - 1)
+        for cy in ys:
+            for cx in xs:
+                chunk = pygame.Surface((self.chunk_size, self.chunk_size))
+                chunk.fill(self.ambient)
+                origin_x = cx * self.chunk_size
+                origin_y = cy * self.chunk_size
+                for light in lights_by_chunk.get((cx, cy), []):
+                    sprite = self.sprite_cache.get(light.radius, light.color)
+                    chunk.blit(sprite, (light.x - light.radius - origin_x,
+                                        light.y - light.radius - origin_y),
+                               special_flags=pygame.BLEND_ADD)
+                self.chunks[(cx, cy)] = chunk
+
+    def add_light(self, x: float, y: float, radius: int,
+                  color: Tuple[int, int, int] = (255, 200, 150)) -> Light:
+        """Adiciona uma luz dinâmica (tocha do jogador, magias...)."""
+        light = Light(x, y, radius, color)
+        self.dynamic_lights.append(light)
+        return light
+
+    def remove_light(self, light: Light):
+        """Remove uma luz dinâmica."""
+        if light in self.dynamic_lights:
+            self.dynamic_lights.remove(light)
+
+    def draw(self, screen: pygame.Surface, camera_x: int, camera_y: int):
+        """Aplica a iluminação sobre a cena já desenhada."""
+        size = screen.get_size()
+        if self.light_buffer is None or self.light_buffer.get_size() != size:
+            self.light_buffer = pygame.Surface(size).convert(screen)
+        buffer = self.light_buffer
+        buffer.fill(self.ambient)
+
+        # Copia os light maps estáticos visíveis
+        xs, ys = self._chunk_range(camera_x, camera_y,
+                                   camera_x + size[0], camera_y + size[1])
+        for cy in ys:
+            for cx in xs:
+                buffer.blit(self.chunks[(cx, cy)],
+                            (cx * self.chunk_size - camera_x, cy * self.chunk_size - camera_y))
+
+        # Soma as luzes dinâmicas
+        for light in self.dynamic_lights:
+            sprite = self.sprite_cache.get(light.radius, light.color)
+            buffer.blit(sprite, (light.x - light.radius - camera_x,
+                                 light.y - light.radius - camera_y),
+                        special_flags=pygame.BLEND_ADD)
+
+        screen.blit(buffer, (0, 0), special_flags=pygame.BLEND_MULT)
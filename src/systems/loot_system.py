@@ -0,0 +1,242 @@
+"""
+Tabelas de loot (assets/data/loot_tables.json).
+
+Cada tabela é compilada uma vez em uma tabela de alias (método de Vose):
+sortear uma entrada ponderada custa O(1), independente do número de
+entradas. Várias rolagens são feitas em lote com numpy, então N mortes
+da mesma tabela custam um único sorteio vetorizado; uma rolagem isolada
+usa o random do Python, que não tem o custo fixo das chamadas numpy.
+
+Formato de uma tabela:
+    {
+        "rolls": 1 ou [min, max],          sorteios ponderados por rolagem
+        "guaranteed": [{"item": id, "count": n ou [min, max]}],
+        "chances": [{"item": id, "chance": 0.25, "count": ...}],
+        "entries": [
+            {"item": id, "weight": 10, "count": ...},
+            {"table": outra_tabela, "weight": 5},
+            {"nothing": true, "weight": 50}
+        ]
+    }
+"""
+
+import random
+from collections import Counter
+from typing import Callable, Dict, List, Mapping, Optional
+import numpy as np
+
+class AliasTable:
+    """Amostragem ponderada em O(1) pelo método de alias de Vose."""
+    def __init__(self, weights):
+        count = len(weights)
+        total = float(sum(weights))
+        scaled = [weight * count / total for weight in weights]
+        prob = [0.0] * count
+        alias = [0] * count
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Sobras (erro de ponto flutuante) ficam com probabilidade 1
+        for i in large + small:
+            prob[i] = 1.0
+        self.prob_list = prob
+        self.alias_list = alias
+        self.prob = np.array(prob)
+        self.alias = np.array(alias, dtype=np.intp)
+
+    def sample_one(self, rng: random.Random) -> int:
+        """Sorteia um único índice sem passar pelo numpy (mais barato para uma rolagem)."""
+        column = rng.randrange(len(self.prob_list))
+        return column if rng.random() < self.prob_list[column] else self.alias_list[column]
+
+    def sample(self, count: int, rng: np.random.Generator) -> np.ndarray:
+        """Sorteia count índices de uma vez."""
+        columns = rng.integers(0, len(self.prob), size=count)
+        accept = rng.random(count) < self.prob[columns]
+        return np.where(accept, columns, self.alias[columns])
+
+def _count_range(count) -> tuple:
+    if isinstance(count, (list, tuple)):
+        return int(count[0]), int(count[1])
+    return int(count), int(count)
+
+def _draw_total(count_range: tuple, times: int, rng: np.random.Generator) -> int:
+    """Soma de times quantidades sorteadas no intervalo [min, max]."""
+    low, high = count_range
+    if times <= 0:
+        return 0
+    if low == high:
+        return low * times
+    return int(rng.integers(low, high + 1, size=times).sum())
+
+class LootTable:
+    """Tabela compilada: alias das entradas ponderadas e listas de drops fixos."""
+    def __init__(self, table_id: str, data: Mapping):
+        self.id = table_id
+        self.rolls = _count_range(data.get('rolls', 1))
+        self.guaranteed = [(entry['item'], _count_range(entry.get('count', 1)))
+                           for entry in data.get('guaranteed', ())]
+        self.chances = [(entry['item'], float(entry['chance']), _count_range(entry.get('count', 1)))
+                        for entry in data.get('chances', ())]
+        # (tipo, alvo, quantidade) por entrada; tipo é 'item', 'table' ou None
+        self.entries = []
+        weights = []
+        for entry in data.get('entries', ()):
+            if 'item' in entry:
+                self.entries.append(('item', entry['item'], _count_range(entry.get('count', 1))))
+            elif 'table' in entry:
+                self.entries.append(('table', entry['table'], _count_range(entry.get('count', 1))))
+            else:
+                self.entries.append((None, None, (0, 0)))
+            weights.append(entry['weight'])
+        self.alias = AliasTable(weights) if weights else None
+
+    def references(self) -> List[str]:
+        return [target for kind, target, _ in self.entries if kind == 'table']
+
+class LootSystem:
+    """Sorteia drops das tabelas de loot e agrupa as mortes de cada frame.
+
+    queue(table_id) registra um drop pendente (ex.: um monstro morreu);
+    flush(), chamado uma vez por frame, rola cada tabela uma única vez para
+    todas as mortes pendentes e entrega o total aos ouvintes.
+    """
+    def __init__(self, tables: Optional[Mapping] = None, item_ids=None, seed: Optional[int] = None):
+        self.rng = np.random.default_rng(seed)
+        self.random = random.Random(seed)
+        self.tables: Dict[str, LootTable] = {}
+        self.pending: Counter = Counter()
+        self.listeners: List[Callable[[Dict[str, int]], None]] = []
+        self.errors: List[str] = []
+        if tables:
+            self.load(tables, item_ids)
+
+    def load(self, tables: Mapping, item_ids=None):
+        """Compila as tabelas, descartando as que referenciam itens/tabelas inexistentes ou em ciclo."""
+        self.errors = []
+        compiled = {table_id: LootTable(table_id, data) for table_id, data in tables.items()}
+        if item_ids is not None:
+            for table in list(compiled.values()):
+                items = ([item for item, _ in table.guaranteed] +
+                         [item for item, _, _ in table.chances] +
+                         [target for kind, target, _ in table.entries if kind == 'item'])
+                unknown = [item for item in items if item not in item_ids]
+                if unknown:
+                    self.errors.append(f"loot_tables.{table.id}: itens desconhecidos {unknown}")
+                    del compiled[table.id]
+
+        # Referências a tabelas: descarta as que apontam para tabelas inválidas
+        # ou que formam ciclos (busca em profundidade com três estados)
+        state: Dict[str, int] = {}  # 1 = visitando, 2 = válida, 3 = inválida
+
+        def visit(table_id: str) -> bool:
+            if state.get(table_id) == 1:
+                self.errors.append(f"loot_tables.{table_id}: referência circular")
+                state[table_id] = 3
+                return False
+            if table_id in state:
+                return state[table_id] == 2
+            if table_id not in compiled:
+                return False
+            state[table_id] = 1
+            valid = True
+            for reference in compiled[table_id].references():
+                if not visit(reference):
+                    if reference not in compiled:
+                        self.errors.append(f"loot_tables.{table_id}: tabela desconhecida '{reference}'")
+                    valid = False
+            if state[table_id] == 1:
+                state[table_id] = 2 if valid else 3
+            return state[table_id] == 2
+
+        self.tables = {table_id: table for table_id, table in compiled.items() if visit(table_id)}
+        for error in self.errors:
+            print(f"Erro nas tabelas de loot: {error}")
+
+    def has_table(self, table_id: Optional[str]) -> bool:
+        return table_id in self.tables
+
+    def roll(self, table_id: str, times: int = 1) -> Dict[str, int]:
+        """Rola a tabela times vezes de uma vez. Retorna item_id -> quantidade total."""
+        drops: Counter = Counter()
+        self._roll_into(drops, table_id, times)
+        return dict(drops)
+
+    def _roll_into(self, drops: Counter, table_id: str, times: int):
+        table = self.tables.get(table_id)
+        if table is None or times <= 0:
+            return
+        if times == 1:
+            self._roll_once(drops, table)
+            return
+        rng = self.rng
+
+        for item_id, count_range in table.guaranteed:
+            drops[item_id] += _draw_total(count_range, times, rng)
+
+        # Chances independentes: quantas das times rolagens acertaram
+        for item_id, chance, count_range in table.chances:
+            hits = int(rng.binomial(times, min(1.0, chance)))
+            drops[item_id] += _draw_total(count_range, hits, rng)
+
+        if table.alias is not None:
+            picks = _draw_total(table.rolls, times, rng)
+            if picks:
+                hits = np.bincount(table.alias.sample(picks, rng), minlength=len(table.entries))
+                for index in np.flatnonzero(hits):
+                    kind, target, count_range = table.entries[index]
+                    amount = int(hits[index])
+                    if kind == 'item':
+                        drops[target] += _draw_total(count_range, amount, rng)
+                    elif kind == 'table':
+                        self._roll_into(drops, target, _draw_total(count_range, amount, rng))
+
+        for item_id in [item_id for item_id, amount in drops.items() if amount <= 0]:
+            del drops[item_id]
+
+    def _roll_once(self, drops: Counter, table: LootTable):
+        """Uma rolagem com o random do Python: sem o custo fixo das chamadas numpy."""
+        rng = self.random
+        for item_id, (low, high) in table.guaranteed:
+            if high > 0:
+                drops[item_id] += rng.randint(low, high)
+        for item_id, chance, (low, high) in table.chances:
+            if high > 0 and rng.random() < chance:
+                drops[item_id] += rng.randint(low, high)
+        if table.alias is not None:
+            for _ in range(rng.randint(*table.rolls)):
+                kind, target, (low, high) = table.entries[table.alias.sample_one(rng)]
+                amount = rng.randint(low, high)
+                if kind == 'item' and amount:
+                    drops[target] += amount
+                elif kind == 'table':
+                    self._roll_into(drops, target, amount)
+
+    def queue(self, table_id: Optional[str], times: int = 1):
+        """Agenda um drop da tabela para o próximo flush()."""
+        if table_id in self.tables:
+            self.pending[table_id] += times
+
+    def listen(self, callback: Callable[[Dict[str, int]], None]):
+        """Chama callback(drops) a cada flush() que gerar itens."""
+        self.listeners.append(callback)
+
+    def flush(self) -> Dict[str, int]:
+        """Rola todos os drops pendentes (um sorteio por tabela) e notifica os ouvintes."""
+        if not self.pending:
+            return {}
+        drops: Counter = Counter()
+        for table_id, times in self.pending.items():
+            self._roll_into(drops, table_id, times)
+        self.pending.clear()
+        drops = dict(drops)
+        if drops:
+            for callback in self.listeners:
+                callback(drops)
+        return drops
@@ -1,6 +1,9 @@
 import pygame
 import json
 import os
+import numpy as np
+from src.map.binary_map import MAP_EXTENSION, load_binary_map, pad_layer, write_binary_map
+from src.entities.monster import monster_data_from_map
 
 class Tile:
     def __init__(self, tile_id, image, solid=False):
@@ -8,6 +11,21 @@ class Tile:
         self.image = image
         self.solid = solid
 
+def load_tileset(filename, tile_size=32):
+    """Carrega os tiles (id -> Tile) de um arquivo JSON.
+
+    Cada tile tem uma cor sólida ("color") até o jogo ter imagens próprias;
+    o id 0 é sempre vazio.
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    tiles = {}
+    for tile_id, entry in data.items():
+        image = pygame.Surface((tile_size, tile_size))
+        image.fill(entry['color'])
+        tiles[int(tile_id)] = Tile(int(tile_id), image, entry.get('solid', False))
+    return tiles
+
 class Map:
     def __init__(self, width, height, tile_size=32):
         self.width = width
@@ -22,22 +40,55 @@ class Map:
         self.npcs = []
         self.items = []
         self.spawn_points = {}
+        self.lights = []
+        self.metadata = {}  # Demais dados do arquivo (nome, npcs, monstros, itens...)
+        self.chunk_size = 16
+        self.chunk_surfaces = {}
     
     def load_from_file(self, filename):
+        if filename.endswith(MAP_EXTENSION):
+            self.load_from_binary(filename)
+            return
+            
         with open(filename, 'r') as f:
             data = json.load(f)
             self.width = data['width']
             self.height = data['height']
-            self.layers = data['layers']
+            self.tile_size = data.get('tile_size', self.tile_size)
+            # Camadas mais curtas que o mapa declarado são completadas com
+            # tile vazio, como na compilação para .rpgmap
+            self.layers = {name: pad_layer(name, values, self.width, self.height)
+                           for name, values in data['layers'].items()}
             self.spawn_points = data['spawn_points']
+            self.lights = data.get('lights', [])
+            self.metadata = {key: value for key, value in data.items()
+                             if key not in ('width', 'height', 'layers', 'spawn_points')}
+    
+    def load_from_binary(self, filename):
+        """Carrega um mapa compilado; as camadas são views NumPy sobre o arquivo."""
+        header, layers, metadata = load_binary_map(filename)
+        self.width = header['width']
+        self.height = header['height']
+        self.tile_size = header['tile_size']
+        self.layers = layers
+        self.spawn_points = header['spawn_points']
+        self.lights = metadata.get('lights', [])
+        self.metadata = metadata
     
     def save_to_file(self, filename):
         data = {
             'width': self.width,
             'height': self.height,
-            'layers': self.layers,
-            'spawn_points': self.spawn_points
+            'tile_size': self.tile_size,
+            'layers': {name: layer.tolist() if hasattr(layer, 'tolist') else layer
+                       for name, layer in self.layers.items()},
+            'spawn_points': self.spawn_points,
+            'lights': self.lights
         }
+        if filename.endswith(MAP_EXTENSION):
+            write_binary_map(data, filename)
+            return
+            
         with open(filename, 'w') as f:
             json.dump(data, f)
     
@@ -52,10 +103,112 @@ class Map:
             return self.tiles.get(tile_id)
         return None
     
+    def draw(self, screen, camera_x, camera_y):
+        """Desenha o mapa na tela (mesma interface do GameMap)."""
+        if self.chunk_surfaces:
+            chunk_px = self.chunk_size * self.tile_size
+            for cy in range(max(0, camera_y // chunk_px), (camera_y + screen.get_height()) // chunk_px + 1):
+                for cx in range(max(0, camera_x // chunk_px), (camera_x + screen.get_width()) // chunk_px + 1):
+                    surface = self.chunk_surfaces.get((cx, cy))
+                    if surface:
+                        screen.blit(surface, (cx * chunk_px - camera_x, cy * chunk_px - camera_y))
+            return
+            
+        start_x = max(0, camera_x // self.tile_size)
+        start_y = max(0, camera_y // self.tile_size)
+        end_x = min(self.width, (camera_x + screen.get_width()) // self.tile_size + 1)
+        end_y = min(self.height, (camera_y + screen.get_height()) // self.tile_size + 1)
+        for layer in ('ground', 'objects'):
+            for y in range(start_y, end_y):
+                for x in range(start_x, end_x):
+                    tile = self.get_tile(layer, x, y)
+                    if tile:
+                        screen.blit(tile.image, (x * self.tile_size - camera_x,
+                                                 y * self.tile_size - camera_y))
+    
     def set_tile(self, layer, x, y, tile_id):
         if 0 <= x < self.width and 0 <= y < self.height:
             self.layers[layer][y][x] = tile_id
     
+    def bake_chunks(self, chunk_size=16):
+        """Pré-compõe as camadas de chão e objetos em superfícies por chunk."""
+        self.chunk_size = chunk_size
+        self.chunk_surfaces = {}
+        if not self.tiles:
+            return
+            
+        for cy in range(0, self.height, chunk_size):
+            for cx in range(0, self.width, chunk_size):
+                self.bake_chunk(cx // chunk_size, cy // chunk_size)
+    
+    def bake_chunk(self, chunk_x, chunk_y):
+        """Recompõe a superfície de um único chunk."""
+        chunk_size = self.chunk_size
+        chunk_px = chunk_size * self.tile_size
+        cx, cy = chunk_x * chunk_size, chunk_y * chunk_size
+        surface = pygame.Surface((chunk_px, chunk_px), pygame.SRCALPHA)
+        for layer in ('ground', 'objects'):
+            rows = self.layers[layer]
+            for y in range(cy, min(self.height, cy + chunk_size)):
+                for x in range(cx, min(self.width, cx + chunk_size)):
+                    tile = self.tiles.get(rows[y][x])
+                    if tile:
+                        surface.blit(tile.image, ((x - cx) * self.tile_size,
+                                                  (y - cy) * self.tile_size))
+        self.chunk_surfaces[(chunk_x, chunk_y)] = surface
+    
+    def reload_from_file(self, filename):
+        """Recarrega o mapa do arquivo e recompõe só os chunks que mudaram.
+        
+        Retorna o conjunto de chunks (cx, cy) alterados.
+        """
+        new_map = Map(0, 0, self.tile_size)
+        new_map.load_from_file(filename)
+        
+        if (new_map.width, new_map.height) != (self.width, self.height):
+            dirty = None  # Dimensões diferentes: tudo precisa ser recomposto
+        else:
+            dirty = set()
+            for name, new_rows in new_map.layers.items():
+                old_rows = self.layers.get(name)
+                if old_rows is None:
+                    dirty = None
+                    break
+                if isinstance(old_rows, np.ndarray) and isinstance(new_rows, np.ndarray):
+                    # Mapas compilados: comparação vetorizada das camadas
+                    ys, xs = np.nonzero(old_rows != new_rows)
+                    dirty.update(zip((xs // self.chunk_size).tolist(),
+                                     (ys // self.chunk_size).tolist()))
+                    continue
+                for y in range(max(len(old_rows), len(new_rows))):
+                    old_row = list(old_rows[y]) if y < len(old_rows) else []
+                    new_row = list(new_rows[y]) if y < len(new_rows) else []
+                    if old_row == new_row:
+                        continue
+                    for x in range(max(len(old_row), len(new_row))):
+                        old_value = old_row[x] if x < len(old_row) else None
+                        new_value = new_row[x] if x < len(new_row) else None
+                        if old_value != new_value:
+                            dirty.add((x // self.chunk_size, y // self.chunk_size))
+        
+        self.width = new_map.width
+        self.height = new_map.height
+        self.layers = new_map.layers
+        self.spawn_points = new_map.spawn_points
+        self.lights = new_map.lights
+        self.metadata = new_map.metadata
+        
+        if dirty is None:
+            if self.chunk_surfaces:
+                self.bake_chunks(self.chunk_size)
+            return {(cx, cy)
+                    for cy in range((self.height + self.chunk_size - 1) // self.chunk_size)
+                    for cx in range((self.width + self.chunk_size - 1) // self.chunk_size)}
+        if self.chunk_surfaces and self.tiles:
+            for chunk_x, chunk_y in dirty:
+                self.bake_chunk(chunk_x, chunk_y)
+        return dirty
+    
     def add_npc(self, npc):
         self.npcs.append(npc)
     
@@ -65,20 +218,125 @@ class Map:
     def get_spawn_point(self, name):
         return self.spawn_points.get(name)
 
+def monster_prototypes(game_map):
+    """Dados (monster_data) de cada tipo de monstro listado no mapa, por id."""
+    return {entry['id']: monster_data_from_map(entry)
+            for entry in game_map.metadata.get('monsters', [])}
+
 class MapSystem:
-    def __init__(self, asset_system):
+    def __init__(self, asset_system, maps_dir=None, prefetcher=None, tileset=None):
         self.asset_system = asset_system
         self.current_map = None
+        self.current_map_name = None
         self.maps = {}
+        self.monster_prototypes = {}  # Mapa -> {id do monstro: monster_data}
         self.tile_size = 32
         self.camera_x = 0
         self.camera_y = 0
+        self.maps_dir = maps_dir or os.path.join('assets', 'maps')
+        self.prefetcher = prefetcher  # MapPrefetcher opcional
+        self.tileset = tileset or (prefetcher.tileset if prefetcher else {})
+        self.asset_preloader = None
     
     def load_map(self, map_name):
-        if map_name in self.maps:
-            self.current_map = self.maps[map_name]
-            return True
-        return False
+        # Mapa pré-carregado em segundo plano: a transição é instantânea
+        if map_name not in self.maps and self.prefetcher:
+            prepared = self.prefetcher.take(map_name)
+            if prepared:
+                self.maps[map_name] = prepared.map
+                self.monster_prototypes[map_name] = prepared.monster_prototypes
+                
+        # Último recurso: carregamento síncrono
+        if map_name not in self.maps:
+            path = self.map_path(map_name)
+            if not os.path.exists(path):
+                return False
+            new_map = Map(0, 0, self.tile_size)
+            new_map.load_from_file(path)
+            new_map.tiles = dict(self.tileset)
+            new_map.bake_chunks()
+            self.maps[map_name] = new_map
+            self.monster_prototypes[map_name] = monster_prototypes(new_map)
+            
+        # Os assets do mapa anterior deixam de ser referenciados; o orçamento
+        # de residência decide quando saem da memória
+        if self.asset_system and map_name != self.current_map_name:
+            if self.current_map_name:
+                self.asset_system.release(self.current_map_name)
+            # Um pré-carregamento pela metade do mapa anterior não serve mais
+            self.stop_preloader()
+            if not self.asset_system.manifest:
+                try:
+                    self.asset_system.load_manifest()
+                except Exception as e:
+                    print(f"Erro ao carregar manifesto de assets: {e}")
+            if map_name in self.asset_system.manifest:
+                self.asset_preloader = self.asset_system.preload(map_name)
+                
+        self.current_map = self.maps[map_name]
+        self.current_map_name = map_name
+        return True
+    
+    def travel(self, exit_name):
+        """Atravessa uma saída do mapa atual. Retorna o spawn point de chegada."""
+        if not self.prefetcher:
+            return None
+        for zone_exit in self.prefetcher.zone_graph.exits.get(self.current_map_name, []):
+            if zone_exit.name == exit_name and self.load_map(zone_exit.target):
+                return self.current_map.get_spawn_point(zone_exit.arrival)
+        return None
+    
+    def exit_at(self, tile_x, tile_y):
+        """Nome da saída da zona atual no tile, ou None."""
+        if not self.prefetcher or not self.current_map:
+            return None
+        for zone_exit in self.prefetcher.zone_graph.exits.get(self.current_map_name, []):
+            point = self.current_map.get_spawn_point(zone_exit.name)
+            if point and (point['x'], point['y']) == (tile_x, tile_y):
+                return zone_exit.name
+        return None
+    
+    def update_prefetch(self, player_x, player_y):
+        """Pré-carrega os mapas vizinhos quando o jogador se aproxima de uma saída."""
+        if self.prefetcher and self.current_map:
+            self.prefetcher.update(self.current_map_name, self.current_map,
+                                   int(player_x // self.tile_size),
+                                   int(player_y // self.tile_size),
+                                   exclude=self.maps)
+    
+    def map_path(self, map_name):
+        """Arquivo de onde o mapa é carregado (o do grafo de zonas, se houver)."""
+        filename = f"{map_name}.json"
+        if self.prefetcher:
+            filename = self.prefetcher.zone_graph.map_files.get(map_name, filename)
+        return os.path.join(self.maps_dir, filename)
+    
+    def map_reloaded(self, game_map):
+        """Atualiza os protótipos de monstros de um mapa recarregado. Retorna o nome dele."""
+        for map_name, loaded in self.maps.items():
+            if loaded is game_map:
+                self.monster_prototypes[map_name] = monster_prototypes(game_map)
+                return map_name
+        return None
+    
+    def get_monster_prototypes(self, map_name=None):
+        """Protótipos de monstros de um mapa carregado (por padrão, o atual)."""
+        return self.monster_prototypes.get(map_name or self.current_map_name, {})
+    
+    def update(self, budget_ms=2.0):
+        """Finaliza, dentro do orçamento do frame, os assets pré-carregados do mapa atual."""
+        if self.asset_preloader and self.asset_preloader.step(budget_ms):
+            self.asset_preloader = None
+    
+    def stop_preloader(self):
+        if self.asset_preloader:
+            self.asset_preloader.cancel()
+            self.asset_preloader = None
+    
+    def close(self):
+        self.stop_preloader()
+        if self.prefetcher:
+            self.prefetcher.shutdown()
     
     def create_map(self, map_name, width, height):
         new_map = Map(width, height, self.tile_size)
@@ -109,6 +367,37 @@ class MapSystem:
         end_x = min(self.current_map.width, (self.camera_x + screen.get_width()) // self.tile_size + 1)
         end_y = min(self.current_map.height, (self.camera_y + screen.get_height()) // self.tile_size + 1)
         
+        # Chunks pré-compostos substituem o desenho tile a tile
+        if self.current_map.chunk_surfaces:
+            self.render_chunks(screen)
+        else:
+            self.render_tiles(screen, start_x, start_y, end_x, end_y)
+        
+        # Render NPCs
+        for npc in self.current_map.npcs:
+            screen_x, screen_y = self.world_to_screen(npc.x, npc.y)
+            if 0 <= screen_x < screen.get_width() and 0 <= screen_y < screen.get_height():
+                npc.render(screen, screen_x, screen_y)
+        
+        # Render items
+        for item in self.current_map.items:
+            screen_x, screen_y = self.world_to_screen(item.x, item.y)
+            if 0 <= screen_x < screen.get_width() and 0 <= screen_y < screen.get_height():
+                item.render(screen, screen_x, screen_y)
+    
+    def render_chunks(self, screen):
+        chunk_px = self.current_map.chunk_size * self.tile_size
+        start_x = max(0, self.camera_x // chunk_px)
+        start_y = max(0, self.camera_y // chunk_px)
+        end_x = (self.camera_x + screen.get_width()) // chunk_px + 1
+        end_y = (self.camera_y + screen.get_height()) // chunk_px + 1
+        for cy in range(start_y, end_y):
+            for cx in range(start_x, end_x):
+                surface = self.current_map.chunk_surfaces.get((cx, cy))
+                if surface:
+                    screen.blit(surface, self.world_to_screen(cx * chunk_px, cy * chunk_px))
+    
+    def render_tiles(self, screen, start_x, start_y, end_x, end_y):
         # Render ground layer
         for y in range(start_y, end_y):
             for x in range(start_x, end_x):
@@ -124,15 +413,3 @@ class MapSystem:
                 if tile:
                     screen_x, screen_y = self.world_to_screen(x * self.tile_size, y * self.tile_size)
                     screen.blit(tile.image, (screen_x, screen_y))
-        
-        # Render NPCs
-        for npc in self.current_map.npcs:
-            screen_x, screen_y = self.world_to_screen(npc.x, npc.y)
-            if 0 <= screen_x < screen.get_width() and 0 <= screen_y < screen.get_height():
-                npc.render(screen, screen_x, screen_y)
-        
-        # Render items
-        for item in self.current_map.items:
-            screen_x, screen_y = self.world_to_screen(item.x, item.y)
-            if 0 <= screen_x < screen.get_width() and 0 <= screen_y < screen.get_height():
-                item.render(screen, screen_x, screen_y)
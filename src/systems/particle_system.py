@@ -52,8 +52,9 @@ class Particle:
                     self.y - camera_y - self.size // 2))
 
 class ParticleSystem:
-    def __init__(self):
+    def __init__(self, max_particles: Optional[int] = None):
         self.particles: List[Particle] = []
+        self.max_particles = max_particles  # None = sem limite
         
     def create_particle(self, x: float, y: float, 
                        velocity: Optional[Tuple[float, float]] = None,
@@ -62,6 +63,9 @@ class ParticleSystem:
                        lifetime: Optional[float] = None,
                        gravity: float = 0):
         """Cria uma nova partícula."""
+        if self.max_particles is not None and len(self.particles) >= self.max_particles:
+            return
+            
         # Valores padrão
         if velocity is None:
             angle = random.uniform(0, 2 * math.pi)
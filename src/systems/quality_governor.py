@@ -0,0 +1,133 @@
+from typing import Callable, Deque, Dict, List, Optional
+from collections import deque
+import json
+import time
+
+class QualityLevel:
+    def __init__(self, name: str, particle_cap: Optional[int], ai_interval: float,
+                 render_scale: float, text_antialias: bool):
+        self.name = name
+        self.particle_cap = particle_cap      # Limite de partículas (None = sem limite)
+        self.ai_interval = ai_interval        # Segundos entre decisões de IA dos monstros
+        self.render_scale = render_scale      # Multiplicador da escala interna de renderização
+        self.text_antialias = text_antialias  # Antialiasing do texto da UI
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'particle_cap': self.particle_cap,
+            'ai_interval': self.ai_interval,
+            'render_scale': self.render_scale,
+            'text_antialias': self.text_antialias
+        }
+
+# Do mais caro para o mais barato
+DEFAULT_LEVELS = [
+    QualityLevel('high', None, 0.0, 1.0, True),
+    QualityLevel('medium', 1500, 0.1, 1.0, True),
+    QualityLevel('low', 600, 0.2, 0.75, False),
+    QualityLevel('minimum', 200, 0.33, 0.5, False)
+]
+
+class QualityGovernor:
+    """Ajusta a qualidade gráfica para manter o frame rate alvo.
+
+    Observa um percentil dos tempos de frame em janelas fixas. Quando a janela
+    estoura o orçamento, desce um nível de qualidade; só volta a subir depois
+    de várias janelas seguidas com folga (histerese), evitando oscilação.
+    """
+    def __init__(self, target_fps: int, apply_level: Callable[[QualityLevel], None],
+                 levels: Optional[List[QualityLevel]] = None,
+                 window: int = 120, percentile: float = 95,
+                 downgrade_ratio: float = 1.1, upgrade_ratio: float = 0.7,
+                 upgrade_windows: int = 3, log_path: Optional[str] = None):
+        self.target_fps = target_fps
+        self.apply_level = apply_level
+        self.levels = levels or DEFAULT_LEVELS
+        self.level_index = 0
+        self.window = window
+        self.percentile = percentile
+        self.downgrade_ratio = downgrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.upgrade_windows = upgrade_windows
+        self.log_path = log_path
+        self.enabled = True
+
+        self.frame_times: Deque[float] = deque(maxlen=window)
+        self.headroom_windows = 0
+        self.decisions: List[Dict] = []
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.levels[self.level_index]
+
+    @property
+    def frame_budget(self) -> float:
+        """Tempo disponível por frame em segundos."""
+        return 1.0 / self.target_fps
+
+    def record_frame(self, frame_time: float):
+        """Registra o tempo de trabalho de um frame, em segundos."""
+        if not self.enabled:
+            return
+
+        self.frame_times.append(frame_time)
+        if len(self.frame_times) >= self.window:
+            self.evaluate()
+
+    def get_percentile(self) -> float:
+        """Retorna o percentil configurado dos tempos de frame da janela."""
+        if not self.frame_times:
+            return 0.0
+        ordered = sorted(self.frame_times)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return ordered[index]
+
+    def evaluate(self):
+        """Avalia a janela atual e troca de nível se necessário."""
+        frame_time = self.get_percentile()
+        self.frame_times.clear()
+
+        if frame_time > self.frame_budget * self.downgrade_ratio:
+            self.headroom_windows = 0
+            if self.level_index < len(self.levels) - 1:
+                self.set_level(self.level_index + 1, 'down', frame_time)
+        elif frame_time < self.frame_budget * self.upgrade_ratio:
+            self.headroom_windows += 1
+            if self.headroom_windows >= self.upgrade_windows and self.level_index > 0:
+                self.headroom_windows = 0
+                self.set_level(self.level_index - 1, 'up', frame_time)
+        else:
+            self.headroom_windows = 0
+
+    def set_level(self, level_index: int, reason: str = 'manual', frame_time: float = 0.0):
+        """Aplica um nível de qualidade e registra a decisão."""
+        previous = self.level
+        self.level_index = level_index
+        self.apply_level(self.level)
+        self.log_decision(reason, previous, self.level, frame_time)
+
+    def log_decision(self, reason: str, previous: QualityLevel, current: QualityLevel,
+                     frame_time: float):
+        """Registra uma decisão do governador para análise posterior."""
+        decision = {
+            'time': time.time(),
+            'reason': reason,
+            'from': previous.name,
+            'to': current.name,
+            f'p{int(self.percentile)}_ms': round(frame_time * 1000, 3),
+            'budget_ms': round(self.frame_budget * 1000, 3),
+            'settings': current.to_dict()
+        }
+        self.decisions.append(decision)
+
+        # Só com log_path: as trocas são registradas sem poluir o console
+        if self.log_path:
+            print(f"Qualidade: {previous.name} -> {current.name} "
+                  f"(p{int(self.percentile)} {frame_time * 1000:.1f}ms, "
+                  f"orçamento {self.frame_budget * 1000:.1f}ms)")
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(decision) + '\n')
+            except OSError as e:
+                print(f"Erro ao gravar log de qualidade: {e}")
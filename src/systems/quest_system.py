@@ -1,7 +1,11 @@
 import json
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 from enum import Enum
 import pygame
+from src.ui.panel import RetainedPanel
+from src.systems.asset_system import load_shared_font
+from src.systems.event_bus import EVENT_TYPES, EventBus, GameEvent, PlayerLeveledUp
+from src.quests.quest_graph import QuestGraph
 
 class QuestStatus(Enum):
     NOT_STARTED = "not_started"
@@ -10,11 +14,16 @@ class QuestStatus(Enum):
     FAILED = "failed"
 
 class QuestObjective:
-    def __init__(self, description: str, target_amount: int = 1):
+    def __init__(self, description: str, target_amount: int = 1,
+                 event: Optional[str] = None, target: Optional[str] = None):
         self.description = description
         self.target_amount = target_amount
         self.current_amount = 0
         self.completed = False
+        # Game event that advances this objective (e.g. "kill") and the id it
+        # must refer to; no target means any id. No event means manual updates.
+        self.event = event
+        self.target = target
         
     def update(self, amount: int = 1) -> bool:
         """Update progress towards objective. Returns True if newly completed."""
@@ -38,13 +47,16 @@ class Quest:
         self.description = description
         self.objectives: Dict[str, QuestObjective] = {}
         self.rewards: Dict[str, int] = {}
+        self.prerequisites: List[str] = []  # Quest ids that must be completed first
+        self.level_requirement = 1
         self.status = QuestStatus.NOT_STARTED
         self.on_complete: Optional[Callable] = None
         self.on_fail: Optional[Callable] = None
         
-    def add_objective(self, objective_id: str, description: str, target_amount: int = 1):
+    def add_objective(self, objective_id: str, description: str, target_amount: int = 1,
+                      event: Optional[str] = None, target: Optional[str] = None):
         """Add a new objective to the quest."""
-        self.objectives[objective_id] = QuestObjective(description, target_amount)
+        self.objectives[objective_id] = QuestObjective(description, target_amount, event, target)
         
     def add_reward(self, reward_type: str, amount: int):
         """Add a reward for completing the quest."""
@@ -91,47 +103,140 @@ class Quest:
             return 0.0
         return sum(obj.get_progress() for obj in self.objectives.values()) / len(self.objectives)
 
+def quest_from_data(quest_id: str, data: Dict) -> Quest:
+    """Create a Quest from its quests.json entry."""
+    quest = Quest(quest_id, data['title'], data['description'])
+    
+    # Add objectives
+    for obj_id, obj_data in data.get('objectives', {}).items():
+        quest.add_objective(obj_id, obj_data['description'], 
+                         obj_data.get('target_amount', 1),
+                         obj_data.get('event'), obj_data.get('target'))
+        
+    # Add rewards
+    for reward_type, amount in data.get('rewards', {}).items():
+        quest.add_reward(reward_type, amount)
+        
+    quest.prerequisites = list(data.get('prerequisites', []))
+    quest.level_requirement = data.get('level_requirement', 1)
+    return quest
+
 class QuestSystem:
-    def __init__(self, quest_file: Optional[str] = None):
+    def __init__(self, quest_file: Optional[str] = None, quest_data: Optional[Dict] = None,
+                 event_bus: Optional[EventBus] = None):
         self.quests: Dict[str, Quest] = {}
         self.active_quests: List[Quest] = []
         self.completed_quests: List[Quest] = []
+        # (event name, target id) -> unfinished objectives of active quests
+        # listening for it, so an event only touches the objectives it affects
+        self.objective_index: Dict[Tuple[str, Optional[str]], List[Tuple[Quest, str]]] = {}
+        # Prerequisite graph with the set of quests that can be started now
+        self.graph = QuestGraph({})
+        self.player_level = 1
+        self.event_bus = event_bus
+        if event_bus:
+            for event_type in EVENT_TYPES.values():
+                event_bus.subscribe(event_type, self.handle_event)
+            event_bus.subscribe(PlayerLeveledUp, self.on_level_up)
         self.quest_log_visible = False
-        if quest_file:
+        self.log_font: Optional[pygame.font.Font] = None
+        self.log_width = 0
+        self.log_panel = RetainedPanel(self._build_quest_log)
+        if quest_data is not None:
+            self.load_quest_data(quest_data)
+        elif quest_file:
             self._load_quests(quest_file)
         
     def _load_quests(self, filepath: str):
         """Load quest data from JSON file."""
         try:
             with open(filepath, 'r') as f:
-                quest_data = json.load(f)
-                
+                self.load_quest_data(json.load(f))
+        except Exception as e:
+            print(f"Error loading quest file: {e}")
+            
+    def load_quest_data(self, quest_data: Dict):
+        """Create quests from already parsed quest data."""
+        try:
             for quest_id, data in quest_data.items():
-                quest = Quest(quest_id, data['title'], data['description'])
-                
-                # Add objectives
-                for obj_id, obj_data in data.get('objectives', {}).items():
-                    quest.add_objective(obj_id, obj_data['description'], 
-                                     obj_data.get('target_amount', 1))
-                    
-                # Add rewards
-                for reward_type, amount in data.get('rewards', {}).items():
-                    quest.add_reward(reward_type, amount)
-                    
+                quest = quest_from_data(quest_id, data)
                 self.quests[quest_id] = quest
                 
         except Exception as e:
-            print(f"Error loading quest file: {e}")
+            print(f"Error loading quest data: {e}")
+        self._build_graph()
+        
+    def _build_graph(self):
+        """Compile the prerequisite graph, keeping the progress already made."""
+        self.graph = QuestGraph(
+            {quest_id: quest.prerequisites for quest_id, quest in self.quests.items()},
+            {quest_id: quest.level_requirement for quest_id, quest in self.quests.items()},
+            self.player_level,
+            completed=[quest.id for quest in self.quests.values() if quest.status == QuestStatus.COMPLETED],
+            started=[quest.id for quest in self.quests.values()
+                     if quest.status in (QuestStatus.IN_PROGRESS, QuestStatus.FAILED)])
+        self.log_panel.invalidate()
             
+    def apply_quest_data(self, quest_data: Dict, changed: List[str], added: List[str],
+                         removed: List[str]):
+        """Apply reloaded quest data to the live quests, keeping their progress."""
+        for quest_id in added:
+            self.quests[quest_id] = quest_from_data(quest_id, quest_data[quest_id])
+            
+        for quest_id in changed:
+            quest = self.quests.get(quest_id)
+            if quest is None:
+                self.quests[quest_id] = quest_from_data(quest_id, quest_data[quest_id])
+                continue
+            data = quest_data[quest_id]
+            quest.title = data['title']
+            quest.description = data['description']
+            objectives = data.get('objectives', {})
+            self._unindex_quest(quest)
+            for obj_id in list(quest.objectives):
+                if obj_id not in objectives:
+                    del quest.objectives[obj_id]
+            for obj_id, obj_data in objectives.items():
+                objective = quest.objectives.get(obj_id)
+                if objective is None:
+                    quest.add_objective(obj_id, obj_data['description'],
+                                        obj_data.get('target_amount', 1),
+                                        obj_data.get('event'), obj_data.get('target'))
+                    continue
+                objective.description = obj_data['description']
+                objective.event = obj_data.get('event')
+                objective.target = obj_data.get('target')
+                objective.target_amount = obj_data.get('target_amount', 1)
+                objective.current_amount = min(objective.current_amount, objective.target_amount)
+                objective.completed = objective.current_amount >= objective.target_amount
+            quest.rewards = dict(data.get('rewards', {}))
+            quest.prerequisites = list(data.get('prerequisites', []))
+            quest.level_requirement = data.get('level_requirement', 1)
+            if quest.objectives and all(obj.completed for obj in quest.objectives.values()):
+                self.complete_quest(quest_id)
+            elif quest.status == QuestStatus.IN_PROGRESS:
+                self._index_quest(quest)
+                
+        # Quests removidas do arquivo só saem se ainda não foram iniciadas
+        for quest_id in removed:
+            quest = self.quests.get(quest_id)
+            if quest and quest.status == QuestStatus.NOT_STARTED:
+                del self.quests[quest_id]
+                
+        self._build_graph()
+        
     def start_quest(self, quest_id: str) -> bool:
         """Start a quest by its ID."""
         if quest_id not in self.quests:
             return False
             
         quest = self.quests[quest_id]
-        if quest.status == QuestStatus.NOT_STARTED:
+        if quest.status == QuestStatus.NOT_STARTED and self.graph.is_available(quest_id):
             quest.start()
+            self.graph.start(quest_id)
             self.active_quests.append(quest)
+            self._index_quest(quest)
+            self.log_panel.invalidate()
             return True
         return False
         
@@ -143,11 +248,36 @@ class QuestSystem:
         quest = self.quests[quest_id]
         if quest.status == QuestStatus.IN_PROGRESS:
             quest.complete()
-            self.active_quests.remove(quest)
-            self.completed_quests.append(quest)
+            self._on_quest_completed(quest)
             return True
         return False
         
+    def _on_quest_completed(self, quest: Quest):
+        """Move a quest that just completed out of the active list."""
+        if quest in self.active_quests:
+            self.active_quests.remove(quest)
+        self.completed_quests.append(quest)
+        self._unindex_quest(quest)
+        self.graph.complete(quest.id)
+        self.log_panel.invalidate()
+        
+    def is_available(self, quest_id: str) -> bool:
+        """Whether the quest can be started now (prerequisites done, level reached)."""
+        return self.graph.is_available(quest_id)
+        
+    def get_available_quests(self) -> List[Quest]:
+        """Quests that can be started now, in prerequisite order."""
+        return [self.quests[quest_id] for quest_id in self.graph.order
+                if quest_id in self.graph.available]
+        
+    def set_player_level(self, level: int):
+        self.player_level = level
+        if self.graph.set_level(level):
+            self.log_panel.invalidate()
+            
+    def on_level_up(self, event: PlayerLeveledUp):
+        self.set_player_level(event.source.level)
+        
     def fail_quest(self, quest_id: str) -> bool:
         """Fail a quest by its ID."""
         if quest_id not in self.quests:
@@ -157,6 +287,8 @@ class QuestSystem:
         if quest.status == QuestStatus.IN_PROGRESS:
             quest.fail()
             self.active_quests.remove(quest)
+            self._unindex_quest(quest)
+            self.log_panel.invalidate()
             return True
         return False
         
@@ -165,7 +297,49 @@ class QuestSystem:
         if quest_id not in self.quests:
             return False
             
-        return self.quests[quest_id].update_objective(objective_id, amount)
+        self.log_panel.invalidate()
+        quest = self.quests[quest_id]
+        objective = quest.objectives.get(objective_id)
+        completed = quest.update_objective(objective_id, amount)
+        if objective is not None and objective.completed:
+            self._unindex_objective(quest, objective_id)
+        if completed:
+            self._on_quest_completed(quest)
+        return completed
+        
+    def handle_event(self, event: GameEvent):
+        """Advance the objectives listening for this event (exact target or any target)."""
+        for key in ((event.name, event.target), (event.name, None)):
+            entries = self.objective_index.get(key)
+            if not entries:
+                continue
+            for quest, objective_id in list(entries):
+                self.update_objective(quest.id, objective_id, event.amount)
+                
+    def _objective_key(self, objective: QuestObjective) -> Tuple[str, Optional[str]]:
+        return (objective.event, objective.target)
+        
+    def _index_quest(self, quest: Quest):
+        for objective_id, objective in quest.objectives.items():
+            if objective.event and not objective.completed:
+                entries = self.objective_index.setdefault(self._objective_key(objective), [])
+                if (quest, objective_id) not in entries:
+                    entries.append((quest, objective_id))
+                    
+    def _unindex_objective(self, quest: Quest, objective_id: str):
+        objective = quest.objectives[objective_id]
+        if not objective.event:
+            return
+        key = self._objective_key(objective)
+        entries = self.objective_index.get(key)
+        if entries and (quest, objective_id) in entries:
+            entries.remove((quest, objective_id))
+            if not entries:
+                del self.objective_index[key]
+                
+    def _unindex_quest(self, quest: Quest):
+        for objective_id in quest.objectives:
+            self._unindex_objective(quest, objective_id)
         
     def get_quest(self, quest_id: str) -> Optional[Quest]:
         """Get a quest by its ID."""
@@ -192,18 +366,27 @@ class QuestSystem:
         if not self.quest_log_visible:
             return
             
+        padding = 20
+        log_width = min(400, screen.get_width() - 2 * padding)
+        if log_width != self.log_width:
+            self.log_width = log_width
+            self.log_panel.invalidate()
+            
+        # Posiciona o quest log no canto superior direito
+        self.log_panel.draw(screen, (screen.get_width() - log_width - padding, padding))
+        
+    def _build_quest_log(self) -> pygame.Surface:
+        """Compõe o quest log em uma superfície reaproveitada entre frames."""
         # Configurações do quest log
         padding = 20
         line_spacing = 10
-        font = pygame.font.Font(None, 32)
+        if self.log_font is None:
+            self.log_font = load_shared_font(None, 32)
+        font = self.log_font
         text_color = (255, 255, 255)
         title_color = (255, 255, 0)
         background_color = (0, 0, 0, 200)
-        
-        # Calcula dimensões
-        screen_width = screen.get_width()
-        screen_height = screen.get_height()
-        log_width = min(400, screen_width - 2 * padding)
+        log_width = self.log_width
         
         # Prepara o texto
         lines = []
@@ -220,6 +403,14 @@ class QuestSystem:
                             text_color))
             lines.append(("", text_color))  # Espaço entre quests
             
+        # Quests que podem ser iniciadas
+        available = self.get_available_quests()
+        if available:
+            lines.append(("Available Quests:", title_color))
+            for quest in available:
+                lines.append((f"- {quest.title}", text_color))
+            lines.append(("", text_color))
+            
         # Quests completadas
         if self.completed_quests:
             lines.append(("Completed Quests:", title_color))
@@ -237,13 +428,8 @@ class QuestSystem:
         y = padding
         for text, color in lines:
             if text:  # Não renderiza linhas vazias
-                text_surface = font.render(text, True, color)
+                text_surface = font.render(text, self.log_panel.antialias, color)
                 log_surface.blit(text_surface, (padding, y))
             y += font.get_height() + line_spacing
             
-        # Posiciona o quest log no canto superior direito
-        log_x = screen_width - log_width - padding
-        log_y = padding
-        
-        # Desenha na tela
-        screen.blit(log_surface, (log_x, log_y))
+        return log_surface
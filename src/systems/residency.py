@@ -0,0 +1,123 @@
+import os
+import pygame
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
+
+AssetKey = Tuple[str, str]  # (tipo, nome), ex.: ('image', 'player.png')
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """Memória ocupada pelos pixels de uma superfície."""
+    return surface.get_pitch() * surface.get_height()
+
+def sound_bytes(sound) -> int:
+    """Estimativa da memória de um som a partir da duração e do formato do mixer."""
+    init = pygame.mixer.get_init()
+    if not init:
+        return 0
+    frequency, sample_format, channels = init
+    return int(sound.get_length() * frequency * channels * abs(sample_format) // 8)
+
+def file_bytes(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+class ResidentAsset:
+    def __init__(self, key: AssetKey, size: int):
+        self.key = key
+        self.size = size
+        self.owners: Set[Hashable] = set()
+
+class ResidencyManager:
+    """Controla quais assets ficam residentes na memória.
+
+    Cada cena ou mapa (owner) referencia os assets que usa. Quando um owner
+    é liberado, seus assets continuam em cache até o total passar do
+    orçamento; a partir daí os não referenciados saem na ordem do uso mais
+    antigo (LRU). Assets referenciados nunca são despejados, mesmo acima
+    do orçamento.
+    """
+    def __init__(self, budget_bytes: int = 64 * 1024 * 1024,
+                 on_evict: Optional[Callable[[AssetKey], None]] = None):
+        self.budget_bytes = budget_bytes
+        self.on_evict = on_evict
+        self.assets: 'OrderedDict[AssetKey, ResidentAsset]' = OrderedDict()
+        self.owned: Dict[Hashable, Set[AssetKey]] = {}
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    def is_resident(self, key: AssetKey) -> bool:
+        return key in self.assets
+
+    def add(self, key: AssetKey, size: int, owner: Optional[Hashable] = None):
+        """Registra um asset recém-carregado (e opcionalmente seu owner)."""
+        if key not in self.assets:
+            self.misses += 1
+            self.assets[key] = ResidentAsset(key, size)
+            self.resident_bytes += size
+        if owner is not None:
+            self.acquire(owner, key)
+        self.enforce_budget()
+
+    def touch(self, key: AssetKey):
+        """Marca o asset como usado agora."""
+        if key in self.assets:
+            self.hits += 1
+            self.assets.move_to_end(key)
+
+    def acquire(self, owner: Hashable, key: AssetKey):
+        """Adiciona uma referência de owner a um asset residente."""
+        asset = self.assets.get(key)
+        if asset is None or owner is None:
+            return
+        asset.owners.add(owner)
+        self.owned.setdefault(owner, set()).add(key)
+        self.assets.move_to_end(key)
+
+    def release(self, owner: Hashable):
+        """Remove todas as referências de um owner e aplica o orçamento."""
+        for key in self.owned.pop(owner, ()):
+            asset = self.assets.get(key)
+            if asset:
+                asset.owners.discard(owner)
+        self.enforce_budget()
+
+    def enforce_budget(self):
+        """Despeja assets sem referência, do menos recente ao mais recente."""
+        if self.resident_bytes <= self.budget_bytes:
+            return
+        for key in [key for key, asset in self.assets.items() if not asset.owners]:
+            if self.resident_bytes <= self.budget_bytes:
+                break
+            self.evict(key)
+
+    def evict(self, key: AssetKey):
+        asset = self.assets.pop(key)
+        self.resident_bytes -= asset.size
+        self.evictions += 1
+        self.evicted_bytes += asset.size
+        if self.on_evict:
+            self.on_evict(key)
+
+    def get_stats(self) -> Dict:
+        """Estatísticas de residência para logs ou overlay de debug."""
+        referenced = sum(asset.size for asset in self.assets.values() if asset.owners)
+        by_kind: Dict[str, int] = {}
+        for (kind, _), asset in self.assets.items():
+            by_kind[kind] = by_kind.get(kind, 0) + asset.size
+        return {
+            'resident_assets': len(self.assets),
+            'resident_bytes': self.resident_bytes,
+            'referenced_bytes': referenced,
+            'budget_bytes': self.budget_bytes,
+            'bytes_by_kind': by_kind,
+            'owners': {str(owner): len(keys) for owner, keys in self.owned.items()},
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'evicted_bytes': self.evicted_bytes
+        }
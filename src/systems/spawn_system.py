@@ -0,0 +1,237 @@
+"""
+Spawn de monstros a partir dos dados do mapa.
+
+Cada spawn point citado em "spawn_points" de algum monstro do mapa vira
+uma área de spawn com limite de população e tempo de respawn. Os valores
+padrão podem ser trocados por área na chave "spawn_areas" do mapa:
+
+    "spawn_areas": {
+        "monster_spawn_1": {"max_monsters": 3, "respawn_time": 20, "radius": 2},
+        "boss": {"max_monsters": 1, "respawn_time": null}
+    }
+
+respawn_time null faz a área não repovoar. Um spawn sem nenhum tile livre
+na área é tentado de novo a cada RETRY_TIME segundos. Monstros mortos saem da lista
+de entidades e voltam para um pool, de onde são reaproveitados no próximo
+spawn do mesmo tipo.
+"""
+
+import heapq
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+from src.entities.monster import Monster, MonsterTemplate, monster_data_from_map
+from src.systems.event_bus import EventBus, MonsterKilled
+
+DEFAULT_MAX_MONSTERS = 3
+DEFAULT_RESPAWN_TIME = 20.0  # Segundos
+DEFAULT_RADIUS = 2  # Tiles ao redor do spawn point
+RETRY_TIME = 1.0  # Segundos até tentar de novo um spawn sem posição livre
+
+class MonsterPool:
+    """Monstros mortos, por template, prontos para serem revividos."""
+    def __init__(self):
+        self.free: Dict[MonsterTemplate, List[Monster]] = {}
+        self.allocated = 0
+
+    def acquire(self, template: MonsterTemplate, x: float, y: float,
+                width: int = 32, height: int = 32) -> Monster:
+        free = self.free.get(template)
+        if free:
+            monster = free.pop()
+            monster.reset(x, y)
+            return monster
+        self.allocated += 1
+        return Monster(x, y, width, height, template)
+
+    def release(self, monster: Monster):
+        self.free.setdefault(monster.template, []).append(monster)
+
+    def __len__(self) -> int:
+        return sum(len(free) for free in self.free.values())
+
+class SpawnArea:
+    def __init__(self, name: str, x: float, y: float, radius: float,
+                 max_monsters: int, respawn_time: Optional[float]):
+        self.name = name
+        self.x = x  # Centro do spawn point, em pixels
+        self.y = y
+        self.radius = radius  # Em pixels
+        self.max_monsters = max_monsters
+        self.respawn_time = respawn_time
+        self.templates: List[MonsterTemplate] = []
+        self.weights: List[float] = []
+        self.alive: List[Monster] = []
+
+class MonsterSpawner:
+    """Mantém a população das áreas de spawn de um mapa.
+
+    on_spawned(monstros) e on_despawned(monstros) recebem, uma vez por
+    update, os monstros que entraram e saíram do jogo (como os callbacks do
+    StreamingWorld). As mortes chegam pelo EventBus (MonsterKilled).
+
+    blocked(x, y), em pixels, diz se uma posição de spawn é bloqueada no
+    mapa em que o jogo realmente desenha e colide; sem ele vale a camada
+    de colisão do mapa carregado em load_map.
+    """
+    def __init__(self, event_bus: EventBus,
+                 on_spawned: Callable[[List[Monster]], None],
+                 on_despawned: Callable[[List[Monster]], None],
+                 pool: Optional[MonsterPool] = None, seed: Optional[int] = None,
+                 blocked: Optional[Callable[[float, float], bool]] = None):
+        self.event_bus = event_bus
+        self.on_spawned = on_spawned
+        self.on_despawned = on_despawned
+        self.pool = pool or MonsterPool()
+        self.random = random.Random(seed)
+        self.areas: Dict[str, SpawnArea] = {}
+        self.owners: Dict[int, SpawnArea] = {}  # id(monstro) -> área de onde veio
+        self.blocked = blocked
+        self.collision = None
+        self.tile_size = 32
+        self.monster_size = 32
+        self.time = 0.0
+        self.sequence = 0
+        # (instante, ordem, área) dos respawns pendentes
+        self.timers: List[Tuple[float, int, SpawnArea]] = []
+        self.dead: List[Monster] = []
+        event_bus.subscribe(MonsterKilled, self.on_monster_killed)
+
+    def load_map(self, game_map, prototypes: Optional[Dict[str, Dict]] = None):
+        """Cria as áreas de spawn a partir de um Map carregado e povoa todas.
+
+        prototypes (id -> monster_data, como os do MapPrefetcher) evita
+        converter de novo as definições de monstros do mapa.
+        """
+        self.clear()
+        self.tile_size = game_map.tile_size
+        self.collision = game_map.layers.get('collision')
+        overrides = game_map.metadata.get('spawn_areas', {})
+
+        for entry in game_map.metadata.get('monsters', []):
+            data = prototypes.get(entry.get('id')) if prototypes else None
+            template = MonsterTemplate.from_data(data or monster_data_from_map(entry))
+            for name in entry.get('spawn_points', []):
+                area = self.areas.get(name)
+                if area is None:
+                    point = game_map.get_spawn_point(name)
+                    if point is None:
+                        print(f"Erro no mapa: spawn point desconhecido '{name}' "
+                              f"(monstro '{entry.get('id')}')")
+                        continue
+                    area = self.areas[name] = self._create_area(name, point, overrides.get(name, {}))
+                area.templates.append(template)
+                area.weights.append(entry.get('spawn_weight', 1))
+
+        spawned = []
+        for area in self.areas.values():
+            for _ in range(area.max_monsters - len(area.alive)):
+                monster = self._spawn(area)
+                if monster:
+                    spawned.append(monster)
+        if spawned:
+            self.on_spawned(spawned)
+
+    def _create_area(self, name: str, point: Dict, config: Dict) -> SpawnArea:
+        respawn_time = config.get('respawn_time', DEFAULT_RESPAWN_TIME)
+        return SpawnArea(name,
+                         (point['x'] + 0.5) * self.tile_size,
+                         (point['y'] + 0.5) * self.tile_size,
+                         config.get('radius', DEFAULT_RADIUS) * self.tile_size,
+                         config.get('max_monsters', DEFAULT_MAX_MONSTERS),
+                         None if respawn_time is None else float(respawn_time))
+
+    def clear(self):
+        """Remove do jogo todos os monstros das áreas atuais e descarta as áreas."""
+        monsters = [monster for area in self.areas.values() for monster in area.alive]
+        monsters.extend(self.dead)
+        if monsters:
+            self.on_despawned(monsters)
+        for monster in monsters:
+            self.pool.release(monster)
+        self.areas.clear()
+        self.owners.clear()
+        self.timers.clear()
+        self.dead.clear()
+
+    def _is_blocked(self, x: float, y: float) -> bool:
+        if self.blocked:
+            return self.blocked(x, y)
+        if self.collision is None:
+            return False
+        tile_x = int(x // self.tile_size)
+        tile_y = int(y // self.tile_size)
+        if 0 <= tile_y < len(self.collision) and 0 <= tile_x < len(self.collision[tile_y]):
+            return bool(self.collision[tile_y][tile_x])
+        return True
+
+    def _spawn_position(self, area: SpawnArea) -> Optional[Tuple[float, float]]:
+        """Posição passável perto do spawn point, ou None se a área toda é bloqueada."""
+        for _ in range(8):
+            x = area.x + self.random.uniform(-area.radius, area.radius)
+            y = area.y + self.random.uniform(-area.radius, area.radius)
+            if not self._is_blocked(x, y):
+                return x, y
+        # Sorteio sem sucesso: percorre os tiles da área em anéis a partir do ponto
+        for ring in range(int(area.radius // self.tile_size) + 1):
+            for dy in range(-ring, ring + 1):
+                for dx in range(-ring, ring + 1):
+                    if max(abs(dx), abs(dy)) != ring:
+                        continue
+                    x = area.x + dx * self.tile_size
+                    y = area.y + dy * self.tile_size
+                    if not self._is_blocked(x, y):
+                        return x, y
+        return None
+
+    def _schedule(self, area: SpawnArea, delay: float):
+        self.sequence += 1
+        heapq.heappush(self.timers, (self.time + delay, self.sequence, area))
+
+    def _spawn(self, area: SpawnArea) -> Optional[Monster]:
+        """Cria um monstro na área; sem posição livre tenta de novo depois de RETRY_TIME."""
+        position = self._spawn_position(area)
+        if position is None:
+            self._schedule(area, RETRY_TIME)
+            return None
+        template = self.random.choices(area.templates, area.weights)[0]
+        x, y = position
+        # Posição é o canto superior esquerdo; centraliza o monstro no ponto sorteado
+        half = self.monster_size / 2
+        monster = self.pool.acquire(template, x - half, y - half,
+                                    self.monster_size, self.monster_size)
+        area.alive.append(monster)
+        self.owners[id(monster)] = area
+        return monster
+
+    def on_monster_killed(self, event: MonsterKilled):
+        monster = event.source
+        area = self.owners.pop(id(monster), None) if monster is not None else None
+        if area is None:
+            return  # Monstro que não veio de um spawner
+        area.alive.remove(monster)
+        self.dead.append(monster)
+        if area.respawn_time is not None:
+            self._schedule(area, area.respawn_time)
+
+    def update(self, delta_time: float):
+        """Tira os mortos do jogo (de volta ao pool) e faz os respawns vencidos."""
+        self.time += delta_time
+        if self.dead:
+            dead = self.dead
+            self.dead = []
+            self.on_despawned(dead)
+            for monster in dead:
+                self.pool.release(monster)
+
+        spawned = []
+        while self.timers and self.timers[0][0] <= self.time:
+            area = heapq.heappop(self.timers)[2]
+            if len(area.alive) < area.max_monsters:
+                monster = self._spawn(area)
+                if monster:
+                    spawned.append(monster)
+        if spawned:
+            self.on_spawned(spawned)
+
+    def population(self) -> int:
+        return sum(len(area.alive) for area in self.areas.values())
@@ -0,0 +1,52 @@
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+class StartupTracer:
+    """Mede o tempo de cada fase da inicialização até o primeiro frame."""
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.start_time = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.first_frame_time: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Cronometra o bloco como uma fase: `with tracer.phase('mapa'): ...`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def mark_first_frame(self):
+        """Registra o fim do primeiro frame e imprime o relatório, se ativo."""
+        if self.first_frame_time is not None:
+            return
+        self.first_frame_time = time.perf_counter() - self.start_time
+        if self.enabled:
+            self.print_report()
+
+    def get_report(self) -> Dict:
+        traced = sum(duration for _, duration in self.phases)
+        total = self.first_frame_time or (time.perf_counter() - self.start_time)
+        return {
+            'phases': [{'name': name, 'seconds': duration} for name, duration in self.phases],
+            'untraced_seconds': max(0.0, total - traced),
+            'time_to_first_frame': total
+        }
+
+    def print_report(self):
+        report = self.get_report()
+        total = report['time_to_first_frame']
+        print("Inicialização até o primeiro frame:")
+        for phase in report['phases']:
+            share = phase['seconds'] / total if total else 0.0
+            print(f"  {phase['name']:<24} {phase['seconds'] * 1000:8.1f}ms {share:6.1%}")
+        print(f"  {'(fora das fases)':<24} {report['untraced_seconds'] * 1000:8.1f}ms")
+        print(f"  {'total':<24} {total * 1000:8.1f}ms")
+
+    def save(self, filepath: str):
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(self.get_report(), f, indent=2)
@@ -0,0 +1,122 @@
+import os
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+from src.systems.map_system import Map, monster_prototypes
+
+class ZoneExit:
+    def __init__(self, zone: str, name: str, target: str, arrival: str):
+        self.zone = zone        # Zona de origem
+        self.name = name        # Spawn point da saída no mapa de origem
+        self.target = target    # Zona de destino
+        self.arrival = arrival  # Spawn point de chegada no mapa de destino
+
+class ZoneGraph:
+    """Grafo de zonas: quais mapas se conectam e por quais spawn points."""
+    def __init__(self, zone_file: Optional[str] = None):
+        self.map_files: Dict[str, str] = {}
+        self.exits: Dict[str, List[ZoneExit]] = {}
+        if zone_file:
+            self.load(zone_file)
+
+    def load(self, filepath: str):
+        """Carrega o grafo de zonas de um arquivo JSON."""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        for zone, zone_data in data.items():
+            self.map_files[zone] = zone_data['map']
+            self.exits[zone] = [
+                ZoneExit(zone, exit_name, exit_data['to'], exit_data['arrival'])
+                for exit_name, exit_data in zone_data.get('exits', {}).items()
+            ]
+
+        # Valida as ligações uma vez, na carga
+        for zone_exits in self.exits.values():
+            for zone_exit in zone_exits:
+                if zone_exit.target not in self.map_files:
+                    raise ValueError(f"Saída '{zone_exit.name}' de '{zone_exit.zone}' "
+                                     f"leva à zona desconhecida '{zone_exit.target}'")
+
+    def neighbours(self, zone: str) -> List[str]:
+        """Zonas alcançáveis diretamente a partir de uma zona."""
+        return [zone_exit.target for zone_exit in self.exits.get(zone, [])]
+
+    def exits_near(self, zone: str, game_map: Map, tile_x: int, tile_y: int,
+                   radius: int) -> List[ZoneExit]:
+        """Saídas cujo spawn point está a até `radius` tiles da posição."""
+        near = []
+        for zone_exit in self.exits.get(zone, []):
+            point = game_map.get_spawn_point(zone_exit.name)
+            if point and max(abs(point['x'] - tile_x), abs(point['y'] - tile_y)) <= radius:
+                near.append(zone_exit)
+        return near
+
+    def find_exit(self, zone: str, target: str) -> Optional[ZoneExit]:
+        for zone_exit in self.exits.get(zone, []):
+            if zone_exit.target == target:
+                return zone_exit
+        return None
+
+class PreparedZone:
+    def __init__(self, name: str, game_map: Map, monster_prototypes: Dict[str, Dict]):
+        self.name = name
+        self.map = game_map
+        self.monster_prototypes = monster_prototypes
+
+class MapPrefetcher:
+    """Prepara em uma thread os mapas vizinhos enquanto o jogador está perto de uma saída.
+
+    A preparação inclui o parse das camadas, o bake das superfícies por chunk
+    (quando há tileset) e os protótipos de monstros do mapa, de modo que a
+    troca de mapa só precise registrar o resultado pronto.
+    """
+    def __init__(self, zone_graph: ZoneGraph, maps_dir: Optional[str] = None,
+                 tileset: Optional[Dict] = None, prefetch_radius: int = 6):
+        self.zone_graph = zone_graph
+        self.maps_dir = maps_dir or os.path.join('assets', 'maps')
+        self.tileset = tileset or {}
+        self.prefetch_radius = prefetch_radius
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='map-prefetch')
+        self.futures: Dict[str, Future] = {}
+
+    def update(self, zone: str, game_map: Map, tile_x: int, tile_y: int, exclude=()):
+        """Dispara o pré-carregamento das zonas cujas saídas estão próximas."""
+        for zone_exit in self.zone_graph.exits_near(zone, game_map, tile_x, tile_y,
+                                                    self.prefetch_radius):
+            if zone_exit.target not in exclude:
+                self.prefetch(zone_exit.target)
+
+    def prefetch(self, zone: str):
+        """Agenda a preparação de uma zona, se ainda não foi agendada."""
+        if zone not in self.futures and zone in self.zone_graph.map_files:
+            self.futures[zone] = self.executor.submit(self._prepare, zone)
+
+    def _prepare(self, zone: str) -> PreparedZone:
+        """Executado na thread de fundo: carrega e prepara o mapa da zona."""
+        game_map = Map(0, 0)
+        game_map.load_from_file(os.path.join(self.maps_dir, self.zone_graph.map_files[zone]))
+        game_map.tiles = dict(self.tileset)
+        game_map.bake_chunks()
+
+        return PreparedZone(zone, game_map, monster_prototypes(game_map))
+
+    def is_ready(self, zone: str) -> bool:
+        future = self.futures.get(zone)
+        return future is not None and future.done()
+
+    def take(self, zone: str, wait: bool = True) -> Optional[PreparedZone]:
+        """Retira uma zona preparada. Com wait=True espera uma preparação em andamento."""
+        future = self.futures.get(zone)
+        if future is None or (not wait and not future.done()):
+            return None
+
+        del self.futures[zone]
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"Erro ao pré-carregar a zona {zone}: {e}")
+            return None
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,9 +1,11 @@
 import pygame
+from ui.panel import RetainedPanel
+from systems.asset_system import load_shared_font
 
 class HUD:
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.Font(None, 24)
+        self.font = load_shared_font(None, 24)
         self.stats = {
             'hp': 100,
             'max_hp': 100,
@@ -12,40 +14,50 @@ class HUD:
             'xp': 0,
             'level': 1
         }
-    
+        self.panel = RetainedPanel(self.build_panel)
+
     def update_stats(self, stats):
-        self.stats.update(stats)
-    
-    def render_bar(self, x, y, width, height, value, max_value, color):
+        # Só reconstrói o painel quando algum valor realmente mudou
+        if any(self.stats.get(key) != value for key, value in stats.items()):
+            self.stats.update(stats)
+            self.panel.invalidate()
+
+    def render_bar(self, x, y, width, height, value, max_value, color, surface=None):
+        surface = surface or self.screen
+
         # Background
-        pygame.draw.rect(self.screen, (50, 50, 50), (x, y, width, height))
-        
+        pygame.draw.rect(surface, (50, 50, 50), (x, y, width, height))
+
         # Fill bar
         if max_value > 0:
             fill_width = int((value / max_value) * width)
-            pygame.draw.rect(self.screen, color, (x, y, fill_width, height))
-        
+            pygame.draw.rect(surface, color, (x, y, fill_width, height))
+
         # Border
-        pygame.draw.rect(self.screen, (200, 200, 200), (x, y, width, height), 1)
-    
-    def render(self):
+        pygame.draw.rect(surface, (200, 200, 200), (x, y, width, height), 1)
+
+    def build_panel(self):
+        texts = [
+            (f"HP: {self.stats['hp']}/{self.stats['max_hp']}", (220, 10)),
+            (f"MP: {self.stats['mp']}/{self.stats['max_mp']}", (220, 40)),
+            (f"Level: {self.stats['level']}", (10, 70)),
+            (f"XP: {self.stats['xp']}", (100, 70)),
+        ]
+        rendered = [(self.font.render(text, self.panel.antialias, (255, 255, 255)), pos) for text, pos in texts]
+        width = max(pos[0] + surface.get_width() for surface, pos in rendered)
+        height = max(pos[1] + surface.get_height() for surface, pos in rendered)
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+
         # HP Bar
-        self.render_bar(10, 10, 200, 20, self.stats['hp'], self.stats['max_hp'], (255, 0, 0))
-        hp_text = f"HP: {self.stats['hp']}/{self.stats['max_hp']}"
-        hp_surface = self.font.render(hp_text, True, (255, 255, 255))
-        self.screen.blit(hp_surface, (220, 10))
-        
+        self.render_bar(10, 10, 200, 20, self.stats['hp'], self.stats['max_hp'], (255, 0, 0), panel)
+
         # MP Bar
-        self.render_bar(10, 40, 200, 20, self.stats['mp'], self.stats['max_mp'], (0, 0, 255))
-        mp_text = f"MP: {self.stats['mp']}/{self.stats['max_mp']}"
-        mp_surface = self.font.render(mp_text, True, (255, 255, 255))
-        self.screen.blit(mp_surface, (220, 40))
-        
-        # Level and XP
-        level_text = f"Level: {self.stats['level']}"
-        level_surface = self.font.render(level_text, True, (255, 255, 255))
-        self.screen.blit(level_surface, (10, 70))
-        
-        xp_text = f"XP: {self.stats['xp']}"
-        xp_surface = self.font.render(xp_text, True, (255, 255, 255))
-        self.screen.blit(xp_surface, (100, 70))
+        self.render_bar(10, 40, 200, 20, self.stats['mp'], self.stats['max_mp'], (0, 0, 255), panel)
+
+        # Texts: HP, MP, Level and XP
+        for surface, pos in rendered:
+            panel.blit(surface, pos)
+        return panel
+
+    def render(self):
+        self.panel.draw(self.screen, (0, 0))
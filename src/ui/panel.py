@@ -0,0 +1,39 @@
+from typing import Callable, Optional
+import pygame
+
+class RetainedPanel:
+    """Painel de UI em modo retido.
+
+    Mantém uma superfície composta em cache que só é reconstruída quando o
+    painel é invalidado; nos demais frames basta um blit.
+    """
+    def __init__(self, build: Callable[[], Optional[pygame.Surface]]):
+        self._build = build
+        self.surface: Optional[pygame.Surface] = None
+        self.dirty = True
+        self.rebuilds = 0
+        self.antialias = True  # Lido pelas funções de construção ao renderizar texto
+
+    def invalidate(self):
+        """Marca o painel para ser reconstruído no próximo desenho."""
+        self.dirty = True
+
+    def set_antialias(self, enabled: bool):
+        """Liga/desliga o antialiasing do texto, reconstruindo o painel."""
+        if self.antialias != enabled:
+            self.antialias = enabled
+            self.dirty = True
+
+    def get_surface(self) -> Optional[pygame.Surface]:
+        """Retorna a superfície composta, reconstruindo-a se necessário."""
+        if self.dirty:
+            self.surface = self._build()
+            self.dirty = False
+            self.rebuilds += 1
+        return self.surface
+
+    def draw(self, screen: pygame.Surface, pos: tuple):
+        """Desenha o painel em cache na posição indicada."""
+        surface = self.get_surface()
+        if surface is not None:
+            screen.blit(surface, pos)
@@ -0,0 +1,50 @@
+from typing import Dict, List, Tuple
+import pygame
+
+class TextLayoutCache:
+    """Quebra de linha e renderização de texto feitas uma vez e reaproveitadas.
+
+    As linhas quebradas ficam em cache por (texto, fonte, largura) e as
+    superfícies renderizadas por (linha, fonte, cor, antialias), então
+    mostrar de novo um texto já visto custa só os blits.
+    """
+    def __init__(self):
+        self.lines: Dict[Tuple[str, pygame.font.Font, int], List[str]] = {}
+        self.surfaces: Dict[Tuple[str, pygame.font.Font, tuple, bool], pygame.Surface] = {}
+
+    def clear(self):
+        self.lines.clear()
+        self.surfaces.clear()
+
+    def wrap(self, text: str, font: pygame.font.Font, width: int) -> List[str]:
+        """Quebra o texto em linhas que cabem em width pixels."""
+        key = (text, font, width)
+        lines = self.lines.get(key)
+        if lines is None:
+            lines = []
+            for paragraph in text.split('\n'):
+                line = ''
+                for word in paragraph.split():
+                    candidate = f"{line} {word}" if line else word
+                    # Palavra maior que a largura fica sozinha na linha
+                    if line and font.size(candidate)[0] > width:
+                        lines.append(line)
+                        line = word
+                    else:
+                        line = candidate
+                lines.append(line)
+            self.lines[key] = lines
+        return lines
+
+    def render(self, line: str, font: pygame.font.Font, color: tuple, antialias: bool = True) -> pygame.Surface:
+        """Superfície de uma linha de texto, renderizada só na primeira vez."""
+        key = (line, font, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.render(line, antialias, color)
+            self.surfaces[key] = surface
+        return surface
+
+    def render_wrapped(self, text: str, font: pygame.font.Font, width: int,
+                       color: tuple, antialias: bool = True) -> List[pygame.Surface]:
+        return [self.render(line, font, color, antialias) for line in self.wrap(text, font, width)]